@@ -6,7 +6,7 @@ Manages content registry and processing queue for the knowledge base.
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from app.utilities.database import get_redis_client
@@ -32,6 +32,45 @@ class ContentLedgerManager:
             self.redis_client = get_redis_client()
         return self.redis_client
 
+    @staticmethod
+    def _build_content_info(
+        s3_location: str, metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the registry document for a new content item."""
+        content_info = {
+            "status": "active",
+            "last_updated": datetime.now(timezone.utc).isoformat(),
+            "s3_location": s3_location,
+            "vector_count": 0,
+            "processing_status": "pending",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        if metadata:
+            content_info.update(metadata)
+
+        return content_info
+
+    @staticmethod
+    def _build_processing_task(
+        content_type: str, content_name: str, action: str, priority: int
+    ) -> Tuple[str, str, float]:
+        """Build a processing queue entry, returning (task_id, member, score)."""
+        task_id = str(uuid4())
+        task_info = {
+            "task_id": task_id,
+            "content_type": content_type,
+            "content_name": content_name,
+            "action": action,
+            "status": "pending",
+            "priority": priority,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "attempts": 0,
+            "max_attempts": 3,
+        }
+        score = priority * 1000000 + datetime.now(timezone.utc).timestamp()
+        return task_id, json.dumps(task_info), score
+
     async def add_content_to_registry(
         self,
         content_type: str,
@@ -55,18 +94,7 @@ class ContentLedgerManager:
 
         content_key = f"{content_type}:{content_name}"
         registry_key = f"{CONTENT_REGISTRY_KEY}:{content_key}"
-
-        content_info = {
-            "status": "active",
-            "last_updated": datetime.now(timezone.utc).isoformat(),
-            "s3_location": s3_location,
-            "vector_count": 0,
-            "processing_status": "pending",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-        }
-
-        if metadata:
-            content_info.update(metadata)
+        content_info = self._build_content_info(s3_location, metadata)
 
         try:
             # Use Redis JSON to store content info
@@ -108,9 +136,13 @@ class ContentLedgerManager:
         updates["last_updated"] = datetime.now(timezone.utc).isoformat()
 
         try:
-            # Use Redis JSON to update specific fields
+            # Use Redis JSON to update specific fields, sending every field in
+            # one MULTI/EXEC round trip so readers never see a partial update
+            pipe = client.pipeline(transaction=True)
+            json_pipe = pipe.json()
             for field, value in updates.items():
-                await client.json().set(registry_key, f"$.{field}", value)
+                json_pipe.set(registry_key, f"$.{field}", value)
+            await pipe.execute()
             logger.info(f"Updated {content_key} in registry")
             return True
 
@@ -266,23 +298,13 @@ class ContentLedgerManager:
         """
         client = await self._get_redis_client()
 
-        task_id = str(uuid4())
-        task_info = {
-            "task_id": task_id,
-            "content_type": content_type,
-            "content_name": content_name,
-            "action": action,
-            "status": "pending",
-            "priority": priority,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "attempts": 0,
-            "max_attempts": 3,
-        }
+        task_id, task_json, score = self._build_processing_task(
+            content_type, content_name, action, priority
+        )
 
         try:
             # Add to processing queue (sorted by priority and creation time)
-            score = priority * 1000000 + datetime.now(timezone.utc).timestamp()
-            await client.zadd(PROCESSING_QUEUE_KEY, {json.dumps(task_info): score})
+            await client.zadd(PROCESSING_QUEUE_KEY, {task_json: score})
 
             logger.info(
                 f"Added task {task_id} to processing queue: {action} {content_type}/{content_name}"
@@ -389,22 +411,28 @@ class ContentLedgerManager:
             if metadata:
                 ingestion_metadata.update(metadata)
 
-            # Add to registry
-            await self.add_content_to_registry(
-                content_type=content_type,
-                content_name=content_name,
-                s3_location=s3_location,
-                metadata=ingestion_metadata,
+            client = await self._get_redis_client()
+            registry_key = f"{CONTENT_REGISTRY_KEY}:{content_type}:{content_name}"
+            type_index_key = f"{CONTENT_REGISTRY_KEY}:types:{content_type}"
+            content_info = self._build_content_info(s3_location, ingestion_metadata)
+            task_id, task_json, score = self._build_processing_task(
+                content_type,
+                content_name,
+                "process",
+                1,  # Normal priority for ingested content
             )
 
-            # Add to processing queue for further processing
-            await self.add_to_processing_queue(
-                content_type=content_type,
-                content_name=content_name,
-                action="process",
-                priority=1,  # Normal priority for ingested content
-            )
+            # Registry entry, type index and processing queue entry are
+            # written in one MULTI/EXEC round trip
+            pipe = client.pipeline(transaction=True)
+            pipe.json().set(registry_key, "$", content_info)
+            pipe.sadd(type_index_key, content_name)
+            pipe.zadd(PROCESSING_QUEUE_KEY, {task_json: score})
+            await pipe.execute()
 
+            logger.info(
+                f"Added task {task_id} to processing queue: process {content_type}/{content_name}"
+            )
             logger.info(f"Recorded ingestion: {content_type}/{content_name}")
             return True
 
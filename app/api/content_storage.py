@@ -4,25 +4,95 @@ Handles upload, download, listing, and deletion of content from S3.
 """
 
 import asyncio
+import functools
 import logging
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
+from app.utilities.environment import get_env_var
+
 logger = logging.getLogger(__name__)
 
+# Transfer Acceleration must be enabled on the bucket first, so it is opt-in
+S3_USE_ACCELERATE = get_env_var("S3_USE_ACCELERATE", "false").lower() == "true"
+
+# boto's "auto" falls back to path style where virtual hosting breaks (dotted
+# bucket names under TLS, path-style S3-compatible endpoints); set "virtual"
+# to always use bucket subdomains
+S3_ADDRESSING_STYLE = get_env_var("S3_ADDRESSING_STYLE", "auto")
+
+# Shared client settings: a connection pool large enough for the concurrent
+# S3 helpers, and adaptive retries so throttled requests back off
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True,
+    s3={
+        "use_accelerate_endpoint": S3_USE_ACCELERATE,
+        "addressing_style": S3_ADDRESSING_STYLE,
+    },
+)
+
+# Managed upload/download transfers: files over 8 MiB are split into
+# 8 MiB parts moved by up to 16 threads
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+)
+
+# Blocking boto3 calls run on a dedicated pool sized to the connection pool,
+# so S3 transfers are not capped by (or crowd out) the default executor
+_s3_executor: ThreadPoolExecutor | None = None
+
+
+def _get_s3_executor() -> ThreadPoolExecutor:
+    """Get the S3 thread pool, creating it on first use."""
+    global _s3_executor
+    if _s3_executor is None:
+        _s3_executor = ThreadPoolExecutor(
+            max_workers=S3_CLIENT_CONFIG.max_pool_connections,
+            thread_name_prefix="s3",
+        )
+    return _s3_executor
+
+
+async def run_s3_call(func, *args, **kwargs):
+    """Run a blocking boto3 call on the S3 thread pool without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_s3_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+# How long list_content() results are reused before S3 is listed again
+LIST_CACHE_TTL_SECONDS = 60.0
+
+# One manager (and so one boto3 client and connection pool) per bucket
+_storage_managers: Dict[str, "ContentStorageManager"] = {}
+
 
 class ContentStorageManager:
     """Manages content storage operations in S3 for the knowledge base."""
 
     def __init__(self, bucket_name: str = "applied-ai-agent"):
         self.bucket_name = bucket_name
+        # list_content() results keyed by prefix: (expires_at, content_list)
+        self._list_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # Clients for cross-region uploads, created on first use per region
+        self._regional_clients: Dict[str, Any] = {}
         try:
-            self.s3_client = boto3.client("s3")
+            self.s3_client = boto3.client("s3", config=S3_CLIENT_CONFIG)
             # Test connection by checking if bucket exists
             self.s3_client.head_bucket(Bucket=bucket_name)
             logger.info(f"Successfully connected to S3 bucket: {bucket_name}")
@@ -72,7 +142,7 @@ class ContentStorageManager:
 
         try:
             # Upload file
-            await asyncio.to_thread(
+            await run_s3_call(
                 self.s3_client.upload_file,
                 str(file_path),
                 self.bucket_name,
@@ -81,8 +151,10 @@ class ContentStorageManager:
                     "Metadata": {k: str(v) for k, v in upload_metadata.items()},
                     "ContentType": self._get_content_type(file_path),
                 },
+                Config=S3_TRANSFER_CONFIG,
             )
 
+            self._list_cache.clear()
             logger.info(f"Successfully uploaded {content_type}/{content_name} to S3")
             return f"s3://{self.bucket_name}/{s3_key}"
 
@@ -90,13 +162,17 @@ class ContentStorageManager:
             logger.error(f"Failed to upload {content_type}/{content_name}: {e}")
             raise
 
-    async def download_content(self, content_type: str, content_name: str) -> Path:
+    async def download_content(
+        self, content_type: str, content_name: str, dest_dir: Optional[Path] = None
+    ) -> Path:
         """
         Download content from S3 to local temp directory.
 
         Args:
             content_type: Type of content
             content_name: Name of the content
+            dest_dir: Directory to download into (defaults to a new temp
+                directory); the caller is responsible for removing it
 
         Returns:
             Path to downloaded file in temp directory
@@ -104,13 +180,23 @@ class ContentStorageManager:
         s3_key = f"{content_type}/{content_name}"
 
         try:
-            # Create temp directory
-            temp_dir = Path(tempfile.mkdtemp(prefix=f"{content_type}_{content_name}_"))
-            local_path = temp_dir / content_name
+            if dest_dir is None:
+                # Create temp directory
+                temp_dir = Path(
+                    tempfile.mkdtemp(prefix=f"{content_type}_{content_name}_")
+                )
+                local_path = temp_dir / content_name
+            else:
+                local_path = dest_dir / content_name
+                local_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Download file
-            await asyncio.to_thread(
-                self.s3_client.download_file, self.bucket_name, s3_key, str(local_path)
+            await run_s3_call(
+                self.s3_client.download_file,
+                self.bucket_name,
+                s3_key,
+                str(local_path),
+                Config=S3_TRANSFER_CONFIG,
             )
 
             logger.info(f"Successfully downloaded {s3_key} to {local_path}")
@@ -126,6 +212,10 @@ class ContentStorageManager:
         """
         List all content of a specific type or all content.
 
+        Listing issues a HEAD per object, so results are cached for
+        ``LIST_CACHE_TTL_SECONDS`` and dropped whenever this manager writes
+        or deletes content.
+
         Args:
             content_type: Optional content type filter
 
@@ -138,7 +228,11 @@ class ContentStorageManager:
             else:
                 prefix = ""
 
-            response = await asyncio.to_thread(
+            cached = self._list_cache.get(prefix)
+            if cached and time.monotonic() < cached[0]:
+                return list(cached[1])
+
+            response = await run_s3_call(
                 self.s3_client.list_objects_v2, Bucket=self.bucket_name, Prefix=prefix
             )
 
@@ -150,7 +244,7 @@ class ContentStorageManager:
 
                 # Extract metadata
                 try:
-                    head_response = await asyncio.to_thread(
+                    head_response = await run_s3_call(
                         self.s3_client.head_object, Bucket=self.bucket_name, Key=key
                     )
                     metadata = head_response.get("Metadata", {})
@@ -174,7 +268,11 @@ class ContentStorageManager:
                 content_list.append(content_info)
 
             logger.info(f"Listed {len(content_list)} content items")
-            return content_list
+            self._list_cache[prefix] = (
+                time.monotonic() + LIST_CACHE_TTL_SECONDS,
+                content_list,
+            )
+            return list(content_list)
 
         except Exception as e:
             logger.error(f"Failed to list content: {e}")
@@ -194,10 +292,11 @@ class ContentStorageManager:
         s3_key = f"{content_type}/{content_name}"
 
         try:
-            await asyncio.to_thread(
+            await run_s3_call(
                 self.s3_client.delete_object, Bucket=self.bucket_name, Key=s3_key
             )
 
+            self._list_cache.clear()
             logger.info(f"Successfully deleted {s3_key} from S3")
             return True
 
@@ -219,7 +318,7 @@ class ContentStorageManager:
         s3_key = f"{content_type}/{content_name}"
 
         try:
-            await asyncio.to_thread(
+            await run_s3_call(
                 self.s3_client.head_object, Bucket=self.bucket_name, Key=s3_key
             )
             return True
@@ -268,14 +367,10 @@ class ContentStorageManager:
             upload_metadata.update(metadata)
 
         try:
-            # Use different client if different region
-            if region and region != "us-east-1":  # Default region
-                s3_client = boto3.client("s3", region_name=region)
-            else:
-                s3_client = self.s3_client
+            s3_client = self._get_client(region)
 
             # Upload file
-            await asyncio.to_thread(
+            await run_s3_call(
                 s3_client.upload_file,
                 str(local_path),
                 target_bucket,
@@ -284,8 +379,10 @@ class ContentStorageManager:
                     "Metadata": {k: str(v) for k, v in upload_metadata.items()},
                     "ContentType": self._get_content_type(local_path),
                 },
+                Config=S3_TRANSFER_CONFIG,
             )
 
+            self._list_cache.clear()
             logger.info(
                 f"Successfully uploaded {local_path} to s3://{target_bucket}/{s3_key}"
             )
@@ -333,11 +430,7 @@ class ContentStorageManager:
             upload_metadata.update(metadata)
 
         try:
-            # Use different client if different region
-            if region and region != "us-east-1":  # Default region
-                s3_client = boto3.client("s3", region_name=region)
-            else:
-                s3_client = self.s3_client
+            s3_client = self._get_client(region)
 
             uploaded_files = []
 
@@ -349,7 +442,7 @@ class ContentStorageManager:
                     file_s3_key = f"{s3_key}/{relative_path}".replace("\\", "/")
 
                     # Upload individual file
-                    await asyncio.to_thread(
+                    await run_s3_call(
                         s3_client.upload_file,
                         str(file_path),
                         target_bucket,
@@ -358,10 +451,12 @@ class ContentStorageManager:
                             "Metadata": {k: str(v) for k, v in upload_metadata.items()},
                             "ContentType": self._get_content_type(file_path),
                         },
+                        Config=S3_TRANSFER_CONFIG,
                     )
 
                     uploaded_files.append(file_s3_key)
 
+            self._list_cache.clear()
             logger.info(
                 f"Successfully uploaded directory {local_path} to s3://{target_bucket}/{s3_key} ({len(uploaded_files)} files)"
             )
@@ -373,6 +468,17 @@ class ContentStorageManager:
             )
             raise
 
+    def _get_client(self, region: Optional[str] = None):
+        """Get the S3 client for ``region``, reusing one client per region."""
+        # Use different client if different region
+        if not region or region == "us-east-1":  # Default region
+            return self.s3_client
+        if region not in self._regional_clients:
+            self._regional_clients[region] = boto3.client(
+                "s3", region_name=region, config=S3_CLIENT_CONFIG
+            )
+        return self._regional_clients[region]
+
     def _get_content_type(self, file_path: Path) -> str:
         """Determine content type based on file extension."""
         suffix = file_path.suffix.lower()
@@ -397,6 +503,10 @@ def get_content_storage_manager(
     """
     Get content storage manager if configured.
 
+    Managers are cached per bucket so every caller shares one boto3 client
+    and its connection pool instead of building a client (and probing the
+    bucket) on each call.
+
     Args:
         bucket_name: Optional custom bucket name
 
@@ -408,7 +518,10 @@ def get_content_storage_manager(
         from app.api.content_config import content_settings
 
         bucket = bucket_name or content_settings.s3_bucket_name
-        return ContentStorageManager(bucket)
+        manager = _storage_managers.get(bucket)
+        if manager is None:
+            manager = _storage_managers[bucket] = ContentStorageManager(bucket)
+        return manager
     except Exception as e:
         logger.error(f"Failed to initialize ContentStorageManager: {e}")
         return None
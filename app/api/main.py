@@ -25,6 +25,11 @@ from app.agent.tasks import (
 )
 from app.api.auth import callback, content_page, debug_callback_url, home, login, logout
 from app.api.slack_app import get_slack_app
+from app.etl.ingestion_queries import close_pool as close_ingestion_pool
+from app.etl.ledger_manager import (
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
 from app.utilities import keys
 from app.utilities.environment import get_env_var
 from app.utilities.logging_config import (
@@ -333,6 +338,7 @@ async def lifespan(app: FastAPI):
         await register_all_tasks()
 
         setup_telemetry(app)
+        await start_invalidation_listener()
         print("✅ API startup completed successfully")
     except Exception as e:
         print(f"⚠️ Warning: Startup had issues but continuing: {e}")
@@ -341,6 +347,8 @@ async def lifespan(app: FastAPI):
     yield
 
     logger.info("Shutting down FastAPI application...")
+    await stop_invalidation_listener()
+    await close_ingestion_pool()
 
 
 def create_app() -> FastAPI:
@@ -10,18 +10,20 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
+import httpx
 from docket.docket import Docket
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from typing import Optional
 
 from app.etl.ingestion_queries import (
-    filter_content_by_type,
     query_content_for_ingestion,
+    source_date_to_epoch,
 )
 from app.etl.tasks.ingestion import process_blog, process_notebook, process_repository
 from app.etl.tasks.vectorization import process_content_file
 from app.etl.vectorization_queries import get_content_ready_for_vectorization
+from app.utilities.database import get_redis_client
 from app.utilities.environment import get_env_var, is_local_mode
 from app.utilities.s3_utils import get_s3_bucket_name
 
@@ -70,8 +72,6 @@ async def verify_token(
 
     try:
         # Get Auth0 public keys
-        import httpx
-
         async with httpx.AsyncClient() as client:
             jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
             jwks_response = await client.get(jwks_url)
@@ -166,9 +166,6 @@ async def run_async_ingestion_pipeline() -> Dict[str, Any]:
     """
     logger.info("Starting async ETL ingestion pipeline")
 
-    # Query for content that needs ingestion using the DRY function
-    content_to_process = query_content_for_ingestion()
-
     results = {
         "status": "success",
         "ingestion_date": datetime.now(timezone.utc).isoformat(),
@@ -181,61 +178,59 @@ async def run_async_ingestion_pipeline() -> Dict[str, Any]:
     # Process each content type asynchronously using Docket
     # Use a single Docket context for all task queuing to ensure consistency
     async with Docket(name="applied-ai-agent", url=get_redis_url()) as docket:
-        for content_type in ["repo", "blog", "notebook"]:
-            # Filter content by type
-            items_for_type = filter_content_by_type(content_to_process, content_type)
-
-            for item in items_for_type:
-                name = item.get("name", "")
-                content_url = item.get("content_url", "")
+        # Stream content needing ingestion and queue each item as it arrives
+        async for item in query_content_for_ingestion():
+            content_type = item.content_type
+            name = item.name or ""
+            content_url = item.content_url or ""
 
-                ingest_key = f"{content_type}_{name}_{int(datetime.now().timestamp())}"
+            ingest_key = f"{content_type}_{name}_{int(datetime.now().timestamp())}"
 
-                if content_type == "repo":
-                    await docket.add(process_repository, key=ingest_key)(
-                        repo_name=name, github_url=content_url
-                    )
+            if content_type == "repo":
+                await docket.add(process_repository, key=ingest_key)(
+                    repo_name=name, github_url=content_url
+                )
 
-                    results["repos"].append(
-                        {
-                            "name": name,
-                            "github_url": content_url,
-                            "task_key": ingest_key,
-                            "status": "queued",
-                        }
-                    )
-                    results["total_tasks_queued"] += 1
+                results["repos"].append(
+                    {
+                        "name": name,
+                        "github_url": content_url,
+                        "task_key": ingest_key,
+                        "status": "queued",
+                    }
+                )
+                results["total_tasks_queued"] += 1
 
-                elif content_type == "blog":
-                    await docket.add(process_blog, key=ingest_key)(
-                        blog_name=name, blog_url=content_url
-                    )
+            elif content_type == "blog":
+                await docket.add(process_blog, key=ingest_key)(
+                    blog_name=name, blog_url=content_url
+                )
 
-                    results["blogs"].append(
-                        {
-                            "name": name,
-                            "blog_url": content_url,
-                            "task_key": ingest_key,
-                            "status": "queued",
-                        }
-                    )
-                    results["total_tasks_queued"] += 1
+                results["blogs"].append(
+                    {
+                        "name": name,
+                        "blog_url": content_url,
+                        "task_key": ingest_key,
+                        "status": "queued",
+                    }
+                )
+                results["total_tasks_queued"] += 1
 
-                elif content_type == "notebook":
-                    await docket.add(process_notebook, key=ingest_key)(
-                        notebook_name=name, github_url=content_url
-                    )
-                    results["notebooks"].append(
-                        {
-                            "name": name,
-                            "github_url": content_url,
-                            "task_key": ingest_key,
-                            "status": "queued",
-                        }
-                    )
-                    results["total_tasks_queued"] += 1
-                else:
-                    logger.warning(f"{content_type=} not a valid type")
+            elif content_type == "notebook":
+                await docket.add(process_notebook, key=ingest_key)(
+                    notebook_name=name, github_url=content_url
+                )
+                results["notebooks"].append(
+                    {
+                        "name": name,
+                        "github_url": content_url,
+                        "task_key": ingest_key,
+                        "status": "queued",
+                    }
+                )
+                results["total_tasks_queued"] += 1
+            else:
+                logger.warning(f"{content_type=} not a valid type")
 
     logger.info(f"Successfully queued {results['total_tasks_queued']} ingestion tasks")
     return results
@@ -335,11 +330,10 @@ async def create_tracking_record_with_staged_status(
         True if successful, False otherwise
     """
     try:
-        from app.utilities.database import get_redis_client
-
         redis_client = get_redis_client()
         current_date = datetime.now(timezone.utc)
         current_timestamp = int(current_date.timestamp())
+        source_date = current_date.strftime("%Y-%m-%d")
 
         # Create tracking record with staged status
         tracking_record = {
@@ -347,7 +341,8 @@ async def create_tracking_record_with_staged_status(
             "content_type": content_type,
             "content_url": content_url,
             "archive": "false",
-            "source_date": current_date.strftime("%Y-%m-%d"),
+            "source_date": source_date,
+            "source_date_epoch": source_date_to_epoch(source_date),
             "updated_date": current_date.strftime("%Y-%m-%d"),
             "updated_ts": current_timestamp,
             "processing_status": "staged",  # New content ready for processing
@@ -466,8 +461,6 @@ async def run_complete_content_processing(
 
         # Try to update tracking record with failed status
         try:
-            from app.utilities.database import get_redis_client
-
             redis_client = get_redis_client()
             key = f"knowledge_tracking:{content_name}"
             existing_record = await redis_client.json().get(key)
@@ -5,9 +5,17 @@ This package contains all Extract, Transform, Load functionality for data proces
 content management, and database operations.
 """
 
-# Re-export all ETL functionality
-from .tasks import *
+import importlib
+from typing import Any
 
 __all__ = [
-    # All ETL task functions are available via the wildcard import
+    # All ETL task functions are available lazily via app.etl.tasks
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Re-export ETL task functions without importing them up front."""
+    tasks = importlib.import_module("app.etl.tasks")
+    if name in tasks.__all__:
+        return getattr(tasks, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
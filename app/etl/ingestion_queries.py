@@ -6,116 +6,305 @@ and determining what content needs to be processed based on refresh policies.
 """
 
 import logging
+import re
+import time
+from collections import namedtuple
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import AsyncIterator, List, Optional, Sequence
 
-import redis
-from redis.commands.search.query import Query
+from redis.asyncio import ConnectionPool, Redis
+from redis.commands.search.aggregation import AggregateRequest
 
 from app.utilities.environment import get_env_var
 
 logger = logging.getLogger(__name__)
 
 
+# Statuses for content that is already being worked on and must not be re-queued
+IN_FLIGHT_STATUSES = ("processing", "ingest-pending", "vectorize-pending")
+
+# Set forms of the status rules for constant-time membership checks per row
+_SKIP_STATUSES = frozenset(IN_FLIGHT_STATUSES)
+_ALWAYS_STATUSES = frozenset({"staged"})
+
+
+# Tracking fields returned by the ingestion query, in ContentRow order
+CONTENT_FIELDS = (
+    "name",
+    "content_type",
+    "content_url",
+    "processing_status",
+    "source_date",
+    "source_date_epoch",
+    "last_processing_attempt",
+    "retry_count",
+)
+
+# Lightweight row for a tracking record; fields missing from a hit are None
+ContentRow = namedtuple(
+    "ContentRow", CONTENT_FIELDS, defaults=(None,) * len(CONTENT_FIELDS)
+)
+
+
+# Configuration is read once at import; call reload_config() to pick up changes
+_REFRESH_DAYS: int = 7
+_REFRESH_DELTA: timedelta = timedelta(days=_REFRESH_DAYS)
+_REDIS_URL: str = "redis://localhost:6379/0"
+# Rows fetched per FT.CURSOR READ while streaming ingestion candidates
+_BATCH_SIZE: int = 500
+
+
+def reload_config() -> None:
+    """Re-read ingestion settings from the environment."""
+    global _REFRESH_DAYS, _REFRESH_DELTA, _REDIS_URL, _BATCH_SIZE
+    _REFRESH_DAYS = int(get_env_var("CONTENT_REFRESH_THRESHOLD_DAYS", "7"))
+    _REFRESH_DELTA = timedelta(days=_REFRESH_DAYS)
+    _REDIS_URL = get_env_var("REDIS_URL", "redis://localhost:6379/0")
+    _BATCH_SIZE = max(1, int(get_env_var("INGESTION_BATCH_SIZE", "500")))
+
+
+reload_config()
+
+# Shared async connection pool so sweeps don't block the event loop or pay
+# connection setup on every call
+_pool: ConnectionPool | None = None
+_client: Redis | None = None
+
+
+def get_redis_client() -> Redis:
+    """Get the shared async Redis client, creating its pool on first use."""
+    global _pool, _client
+    if _client is None:
+        _pool = ConnectionPool.from_url(
+            _REDIS_URL, max_connections=16, decode_responses=True
+        )
+        _client = Redis(connection_pool=_pool)
+    return _client
+
+
+async def close_pool() -> None:
+    """Disconnect the shared connection pool (called on application shutdown)."""
+    global _pool, _client
+    if _pool is not None:
+        await _pool.disconnect()
+    _pool = None
+    _client = None
+
+
 def get_redis_url() -> str:
     """Get Redis URL from environment."""
-    return get_env_var("REDIS_URL", "redis://localhost:6379/0")
+    return _REDIS_URL
+
+
+# Same shapes datetime.strptime accepts for "%Y-%m-%d"
+_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+
+def source_date_to_epoch(source_date: Optional[str]) -> int:
+    """
+    Convert a ``YYYY-MM-DD`` source date into UTC epoch seconds.
+
+    The result is stored as ``source_date_epoch`` on tracking records so the
+    staleness check can run as a NUMERIC range inside RediSearch. Missing or
+    malformed dates map to 0, which always counts as stale.
+    """
+    if not source_date:
+        return 0
+
+    # A regex plus int() is several times faster than datetime.strptime
+    match = _DATE_RE.fullmatch(source_date) if isinstance(source_date, str) else None
+    if match:
+        year, month, day = map(int, match.groups())
+        try:
+            return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp())
+        except ValueError:
+            # Well-formed but impossible dates such as 2025-02-30
+            pass
+
+    logger.warning(f"Invalid source_date format: {source_date}")
+    return 0
 
 
-def build_ingestion_query() -> Query:
+def refresh_cutoff_epoch() -> float:
+    """
+    Epoch seconds before which content counts as stale.
+
+    Compute this once per sweep and pass it to ``should_process_content``
+    rather than reading the clock for every record.
+    """
+    return time.time() - _REFRESH_DELTA.total_seconds()
+
+
+# Static parts of the ingestion query, built once at import. Punctuation
+# inside TAG values must be escaped in the query syntax.
+_IN_FLIGHT_TAGS = "|".join(s.replace("-", "\\-") for s in IN_FLIGHT_STATUSES)
+_QUERY_PREFIX = (
+    f"@archive:{{false}} -@processing_status:{{{_IN_FLIGHT_TAGS}}} "
+    "(@processing_status:{staged} | @source_date_epoch:"
+)
+_LOAD_FIELDS = tuple(f"@{field}" for field in CONTENT_FIELDS)
+
+
+def build_ingestion_query() -> AggregateRequest:
     """
     Build the Redis search query for content that needs ingestion.
 
     Returns content that is:
     - Not archived (@archive:{false})
+    - Not already in flight (processing, ingest-pending, vectorize-pending)
     - Either staged OR stale (older than CONTENT_REFRESH_THRESHOLD_DAYS)
 
+    The whole predicate is evaluated by RediSearch, so documents that do not
+    need ingestion never leave the server. Results are read through a cursor
+    in pages of ``INGESTION_BATCH_SIZE`` rows (default 500), which caps how
+    many records are held in memory at once.
+
     Returns:
-        Redis Query object for content needing ingestion
+        Redis AggregateRequest for content needing ingestion
     """
-    # For now, keep the simple query that gets all non-archived content
-    # The refresh logic filtering happens in Python
-    return Query("@archive:{false}").return_fields(
-        "name",
-        "content_type",
-        "content_url",
-        "processing_status",
-        "source_date",
-        "last_processing_attempt",
-        "retry_count",
-    )
-
-
-def should_process_content(content_item: Dict[str, Any]) -> bool:
+    # Only the staleness cutoff changes between sweeps
+    cutoff_epoch = int(refresh_cutoff_epoch())
+    query_string = f"{_QUERY_PREFIX}[-inf ({cutoff_epoch}])"
+
+    return AggregateRequest(query_string).load(*_LOAD_FIELDS).cursor(count=_BATCH_SIZE)
+
+
+def _row_to_content(row: Sequence[str]) -> ContentRow:
+    """Build a ContentRow from a flat ``[field, value, ...]`` aggregate row."""
+    return ContentRow(**dict(zip(row[::2], row[1::2])))
+
+
+def should_process_content(
+    content_item: ContentRow, cutoff_epoch: Optional[float] = None
+) -> bool:
     """
     Determine if a content item should be processed based on refresh policies.
 
+    ``build_ingestion_query`` already applies this policy server-side; this is
+    the same rule in Python for callers holding individual records.
+
     Args:
-        content_item: Content item from tracking index
+        content_item: Content row from tracking index
+        cutoff_epoch: Staleness cutoff from ``refresh_cutoff_epoch()``; pass
+            it in when checking many rows so the clock is read once
 
     Returns:
         True if content should be processed
     """
-    processing_status = content_item.get("processing_status", "pending")
+    processing_status = content_item.processing_status or "pending"
 
     # Skip if already processing (but not completed - completed content can be refreshed if stale)
-    if processing_status in ["processing", "ingest-pending", "vectorize-pending"]:
+    if processing_status in _SKIP_STATUSES:
         return False
 
     # Always process staged content
-    if processing_status == "staged":
+    if processing_status in _ALWAYS_STATUSES:
         return True
 
     # Check if content is stale (older than threshold)
-    refresh_threshold_days = int(get_env_var("CONTENT_REFRESH_THRESHOLD_DAYS", "7"))
-
-    source_date_str = content_item.get("source_date")
-    if not source_date_str:
-        # No source date, treat as stale
-        return True
-
-    try:
-        source_date = datetime.strptime(source_date_str, "%Y-%m-%d").replace(
-            tzinfo=timezone.utc
+    if cutoff_epoch is None:
+        cutoff_epoch = refresh_cutoff_epoch()
+
+    source_date_epoch = content_item.source_date_epoch
+    if source_date_epoch is None:
+        # Legacy record written before source_date_epoch existed
+        source_date_epoch = source_date_to_epoch(content_item.source_date)
+
+    # Missing or invalid dates map to epoch 0 and are treated as stale
+    return float(source_date_epoch) < cutoff_epoch
+
+
+# Tracking keys read and written per pipeline round trip during the backfill
+_BACKFILL_BATCH_SIZE = 500
+
+
+async def _backfill_batch(client: Redis, keys: List[str]) -> int:
+    """Set ``source_date_epoch`` on the records in ``keys`` that lack it."""
+    pipe = client.pipeline(transaction=False)
+    json_pipe = pipe.json()
+    for key in keys:
+        json_pipe.get(key, "$.source_date", "$.source_date_epoch")
+    records = await pipe.execute()
+
+    pipe = client.pipeline(transaction=False)
+    json_pipe = pipe.json()
+    pending = 0
+    for key, record in zip(keys, records):
+        # Deleted since the scan, or already carries the epoch
+        if not record or record.get("$.source_date_epoch"):
+            continue
+        source_date = next(iter(record.get("$.source_date") or []), None)
+        # NX so a writer that set the field since the read is not overwritten
+        json_pipe.set(
+            key,
+            "$.source_date_epoch",
+            source_date_to_epoch(source_date),
+            nx=True,
         )
-        cutoff_date = datetime.now(timezone.utc) - timedelta(
-            days=refresh_threshold_days
-        )
-        return source_date < cutoff_date
-    except (ValueError, TypeError):
-        logger.warning(f"Invalid source_date format: {source_date_str}")
-        # Invalid date format, treat as stale
-        return True
+        pending += 1
+
+    if pending:
+        await pipe.execute()
+    return pending
 
 
-def query_content_for_ingestion() -> List[Dict[str, Any]]:
+async def backfill_source_date_epoch() -> int:
     """
-    Query the knowledge tracking index for content that needs ingestion.
+    Add ``source_date_epoch`` to tracking records written before it existed.
+
+    ``build_ingestion_query`` selects stale records by the indexed epoch, so a
+    record without it would never be picked up for refresh again. Run this
+    once after recreating the tracking index; ``scripts/seed.py`` does.
 
     Returns:
-        List of content items that need to be processed
+        Number of records updated
     """
-    try:
-        # Connect to Redis and query content
-        client = redis.Redis.from_url(get_redis_url())
-        query = build_ingestion_query()
+    client = get_redis_client()
+    updated = 0
+    keys: List[str] = []
+    async for key in client.scan_iter(
+        match="knowledge_tracking:*", count=_BACKFILL_BATCH_SIZE
+    ):
+        keys.append(key)
+        if len(keys) >= _BACKFILL_BATCH_SIZE:
+            updated += await _backfill_batch(client, keys)
+            keys = []
+    if keys:
+        updated += await _backfill_batch(client, keys)
+
+    logger.info(f"Backfilled source_date_epoch on {updated} tracking records")
+    return updated
+
+
+async def query_content_for_ingestion() -> AsyncIterator[ContentRow]:
+    """
+    Stream content from the knowledge tracking index that needs ingestion.
 
-        search_results = client.ft("knowledge_tracking").search(query)
-        logger.info(f"Found {len(search_results.docs)} total content items")
+    Runs FT.AGGREGATE WITHCURSOR and follows the cursor with FT.CURSOR READ,
+    so only one page of results is held in memory at a time and callers can
+    start work before the last page arrives.
 
-        # Parse results and apply refresh logic
-        content_to_process = []
+    Yields:
+        Content rows that need to be processed
+    """
+    try:
+        client = get_redis_client()
+        index = client.ft("knowledge_tracking")
 
-        for doc in search_results.docs:
-            content_item = doc.__dict__
+        # The refresh policy is part of the query, so every hit needs processing
+        result = await index.aggregate(build_ingestion_query())
+        total = 0
+        while True:
+            for row in result.rows:
+                total += 1
+                yield _row_to_content(row)
 
-            if should_process_content(content_item):
-                content_to_process.append(content_item)
+            # A cursor id of 0 means the server has no more pages
+            if result.cursor is None or not result.cursor.cid:
+                break
+            result = await index.aggregate(result.cursor)
 
-        logger.info(
-            f"Identified {len(content_to_process)} content items for processing"
-        )
-        return content_to_process
+        logger.info(f"Identified {total} content items for processing")
 
     except Exception as e:
         logger.error(f"Failed to query content for ingestion: {e}")
@@ -123,16 +312,16 @@ def query_content_for_ingestion() -> List[Dict[str, Any]]:
 
 
 def filter_content_by_type(
-    content_items: List[Dict[str, Any]], content_type: str
-) -> List[Dict[str, Any]]:
+    content_items: List[ContentRow], content_type: str
+) -> List[ContentRow]:
     """
     Filter content items by content type.
 
     Args:
-        content_items: List of content items
+        content_items: List of content rows
         content_type: Type to filter by (e.g. 'blog', 'repo', 'notebook')
 
     Returns:
         Filtered list of content items
     """
-    return [item for item in content_items if item.get("content_type") == content_type]
+    return [item for item in content_items if item.content_type == content_type]
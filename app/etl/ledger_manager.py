@@ -2,11 +2,20 @@
 ETL Ledger Manager
 
 This module provides functionality for managing the content ingestion ledger,
-which tracks what content needs to be processed. The ledger is stored as
-native JSON in Redis and supports CRUD operations for repositories, blogs,
-and notebooks.
-
-The ledger structure:
+which tracks what content needs to be processed. Each ledger item is stored as
+its own Redis hash (etl:ledger:<kind>:<name>) and each section keeps a SET of
+member names (etl:ledger:<section>:names), so adding, removing or checking an
+item touches only that item. The ledger supports CRUD operations for
+repositories, blogs, and notebooks; a ledger written by older versions as a
+single JSON document (etl:content_ledger) is migrated to hashes on first use.
+
+get_ledger() results are cached in-process for a few seconds. Every write
+publishes on etl:ledger:invalidate; processes that run the subscriber
+(start_invalidation_listener() on startup, stop_invalidation_listener() on
+shutdown) drop their cache as soon as the ledger changes, and the rest fall
+back to the TTL.
+
+The ledger structure returned by get_ledger():
 {
     "repos": [{"name": "...", "github_url": "..."}],
     "blogs": [{"name": "...", "blog_url": "..."}],
@@ -14,16 +23,143 @@ The ledger structure:
 }
 """
 
+import asyncio
+import contextlib
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Tuple, Union
 
 from app.utilities.database import get_redis_client
 
 logger = logging.getLogger(__name__)
 
-# Redis key for the ETL ledger
+# Redis key of the legacy single-document JSON ledger
 ETL_LEDGER_KEY = "etl:content_ledger"
 
+# Ledger sections and the item kind used in their hash keys
+LEDGER_SECTIONS = ("repos", "blogs", "notebooks")
+_ITEM_KINDS = {"repos": "repo", "blogs": "blog", "notebooks": "notebook"}
+
+# Set once the legacy JSON ledger has been migrated in this process
+_legacy_migrated = False
+
+# Channel announcing ledger writes so other processes drop their cached copy
+LEDGER_INVALIDATE_CHANNEL = "etl:ledger:invalidate"
+
+# How long a cached ledger may be served without hearing about a change
+LEDGER_CACHE_TTL_SECONDS = 5.0
+
+_ledger_cache: Optional[Dict[str, List[Dict[str, str]]]] = None
+_ledger_cache_expires_at = 0.0
+# Created per event loop: an asyncio.Lock binds to the first loop that waits
+# on it and fails if used from another (a second asyncio.run, CLI scripts)
+_ledger_cache_lock: Optional[asyncio.Lock] = None
+_ledger_cache_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+_invalidation_task: Optional[asyncio.Task] = None
+
+
+def _empty_ledger() -> Dict[str, List[Dict[str, str]]]:
+    """Return a fresh, empty ledger structure."""
+    return {"repos": [], "blogs": [], "notebooks": []}
+
+
+def _names_key(section: str) -> str:
+    """Redis SET holding the names present in a ledger section."""
+    return f"etl:ledger:{section}:names"
+
+
+def _item_key(section: str, name: str) -> str:
+    """Redis hash holding a single ledger item."""
+    return f"etl:ledger:{_ITEM_KINDS[section]}:{name}"
+
+
+def _decode(value: Union[bytes, str]) -> str:
+    """Decode a reply value from a client that does not decode responses."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _copy_ledger(
+    ledger: Dict[str, List[Dict[str, str]]],
+) -> Dict[str, List[Dict[str, str]]]:
+    """Copy the section lists so callers can't reorder the cached ledger."""
+    return {section: list(items) for section, items in ledger.items()}
+
+
+def _set_ledger_cache(ledger: Optional[Dict[str, List[Dict[str, str]]]]) -> None:
+    """Replace the cached ledger; None drops it so the next read hits Redis."""
+    global _ledger_cache, _ledger_cache_expires_at
+    _ledger_cache = ledger
+    _ledger_cache_expires_at = (
+        time.monotonic() + LEDGER_CACHE_TTL_SECONDS if ledger is not None else 0.0
+    )
+
+
+async def _listen_for_invalidations(client) -> None:
+    """Drop the cached ledger whenever any process announces a write."""
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(LEDGER_INVALIDATE_CHANNEL)
+        async for message in pubsub.listen():
+            if message.get("type") == "message":
+                _set_ledger_cache(None)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # Without the subscriber the TTL still bounds how stale the cache gets
+        logger.warning(f"Ledger invalidation listener stopped: {e}")
+    finally:
+        await pubsub.reset()
+
+
+def _get_ledger_cache_lock() -> asyncio.Lock:
+    """Return the cache lock for the running event loop."""
+    global _ledger_cache_lock, _ledger_cache_lock_loop
+    loop = asyncio.get_running_loop()
+    if _ledger_cache_lock is None or _ledger_cache_lock_loop is not loop:
+        _ledger_cache_lock = asyncio.Lock()
+        _ledger_cache_lock_loop = loop
+    return _ledger_cache_lock
+
+
+async def start_invalidation_listener(redis_client=None) -> None:
+    """
+    Start the ledger invalidation subscriber on the running event loop.
+
+    Call from application or worker startup and pair with
+    stop_invalidation_listener() on shutdown. Calling it again while the
+    listener is running on this loop is a no-op.
+
+    Args:
+        redis_client: Redis client to subscribe with; a new one is created if
+            omitted
+    """
+    global _invalidation_task
+    if (
+        _invalidation_task is not None
+        and not _invalidation_task.done()
+        and _invalidation_task.get_loop() is asyncio.get_running_loop()
+    ):
+        return
+    client = redis_client or get_redis_client()
+    _invalidation_task = asyncio.create_task(_listen_for_invalidations(client))
+
+
+async def stop_invalidation_listener() -> None:
+    """Cancel the invalidation subscriber and drop the cached ledger."""
+    global _invalidation_task
+    task, _invalidation_task = _invalidation_task, None
+    # A task left behind by an earlier, closed loop can only be dropped
+    if (
+        task is not None
+        and not task.done()
+        and task.get_loop() is asyncio.get_running_loop()
+    ):
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    # Nothing keeps the cache fresh past this point
+    _set_ledger_cache(None)
+
 
 class ETLedgerManager:
     """
@@ -33,37 +169,95 @@ class ETLedgerManager:
     including adding, removing, and retrieving content items for processing.
     """
 
-    def __init__(self) -> None:
-        """Initialize the ETL ledger manager."""
-        self.redis_client = None
+    def __init__(self, redis_client=None) -> None:
+        """
+        Initialize the ETL ledger manager.
 
-    async def _get_redis_client(self):
+        Args:
+            redis_client: Redis client to use; a new one is created if omitted
         """
-        Get Redis client, initializing if needed.
+        self.redis_client = redis_client or get_redis_client()
 
-        Returns:
-            Redis client instance
+    async def _migrate_legacy_ledger(self, client) -> None:
         """
-        if self.redis_client is None:
-            self.redis_client = get_redis_client()
-        return self.redis_client
+        Move a legacy JSON ledger document into per-item hashes.
+
+        Runs once per process. Items are written with SADD + HSET and the
+        JSON document is deleted in the same MULTI/EXEC, so a crash never
+        leaves the ledger half-migrated.
+        """
+        global _legacy_migrated
+        if _legacy_migrated:
+            return
+
+        legacy = await client.json().get(ETL_LEDGER_KEY)
+        if legacy:
+            async with client.pipeline(transaction=True) as pipe:
+                for section in LEDGER_SECTIONS:
+                    for entry in legacy.get(section, []):
+                        pipe.sadd(_names_key(section), entry["name"])
+                        pipe.hset(_item_key(section, entry["name"]), mapping=entry)
+                pipe.delete(ETL_LEDGER_KEY)
+                pipe.publish(LEDGER_INVALIDATE_CHANNEL, "1")
+                await pipe.execute()
+            logger.info("Migrated legacy JSON ledger to per-item hashes")
+
+        _legacy_migrated = True
+
+    @staticmethod
+    async def _scan_names(client, section: str) -> List[str]:
+        """List a section's member names with SSCAN, sorted for a stable order."""
+        # SSCAN may repeat names, so collect them into a set first
+        names = {_decode(n) async for n in client.sscan_iter(_names_key(section))}
+        return sorted(names)
 
     async def get_ledger(self) -> Dict[str, List[Dict[str, str]]]:
         """
-        Get the current content ledger from Redis.
+        Get the current content ledger, served from the in-process cache
+        while it is fresh.
+
+        Names are listed with SSCAN and every item hash is fetched with
+        HGETALL in a single pipeline.
 
         Returns:
             Dictionary with repos, blogs, and notebooks lists
         """
-        client = await self._get_redis_client()
+        client = self.redis_client
 
         try:
-            ledger_data = await client.json().get(ETL_LEDGER_KEY)
-            if ledger_data:
-                return ledger_data
-            else:
-                # Return empty ledger structure
-                return {"repos": [], "blogs": [], "notebooks": []}
+            async with _get_ledger_cache_lock():
+                if (
+                    _ledger_cache is not None
+                    and time.monotonic() < _ledger_cache_expires_at
+                ):
+                    return _copy_ledger(_ledger_cache)
+
+                await self._migrate_legacy_ledger(client)
+
+                # The section scans are independent, so run them concurrently
+                section_names = await asyncio.gather(
+                    *(self._scan_names(client, section) for section in LEDGER_SECTIONS)
+                )
+                names_by_section = dict(zip(LEDGER_SECTIONS, section_names))
+
+                async with client.pipeline(transaction=False) as pipe:
+                    for section, names in names_by_section.items():
+                        for name in names:
+                            pipe.hgetall(_item_key(section, name))
+                    hashes = iter(await pipe.execute())
+
+                ledger_data = _empty_ledger()
+                for section, names in names_by_section.items():
+                    for _ in names:
+                        fields = next(hashes)
+                        # Skip names whose hash has gone missing
+                        if fields:
+                            ledger_data[section].append(
+                                {_decode(k): _decode(v) for k, v in fields.items()}
+                            )
+
+                _set_ledger_cache(ledger_data)
+                return _copy_ledger(ledger_data)
         except Exception as e:
             logger.error(f"Failed to get ledger: {e}")
             raise
@@ -78,39 +272,147 @@ class ETLedgerManager:
         Returns:
             True if successful
         """
-        client = await self._get_redis_client()
+        client = self.redis_client
 
         try:
-            await client.json().set(ETL_LEDGER_KEY, "$", ledger_data)
+            async with client.pipeline(transaction=False) as pipe:
+                for section in LEDGER_SECTIONS:
+                    pipe.smembers(_names_key(section))
+                current_names = await pipe.execute()
+
+            # Replace every section's items and name SET in one transaction
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(ETL_LEDGER_KEY)
+                for section, names in zip(LEDGER_SECTIONS, current_names):
+                    stale_keys = [_item_key(section, _decode(n)) for n in names]
+                    pipe.delete(_names_key(section), *stale_keys)
+                    items = ledger_data.get(section, [])
+                    if items:
+                        pipe.sadd(_names_key(section), *(i["name"] for i in items))
+                    for item in items:
+                        pipe.hset(_item_key(section, item["name"]), mapping=item)
+                pipe.publish(LEDGER_INVALIDATE_CHANNEL, "1")
+                await pipe.execute()
+            _set_ledger_cache(_copy_ledger(ledger_data))
             logger.info("Updated ETL ledger successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to update ledger: {e}")
             raise
 
-    async def add_repo_to_ledger(self, repo_name: str, github_url: str) -> bool:
+    async def _add_entries(self, entries: List[Tuple[str, Dict[str, str]]]) -> bool:
         """
-        Add a repository to the ledger.
+        Add entries to ledger sections unless their names are already known.
+
+        Duplicate detection is a SISMEMBER against the section's name SET.
+        New entries are recorded with SADD + HSET inside one MULTI/EXEC so
+        the SET and the item hashes never disagree.
 
         Args:
-            repo_name: Name of the repository
-            github_url: GitHub URL of the repository
+            entries: (section, entry) pairs; section is "repos", "blogs" or
+                "notebooks" and each entry must contain a "name" key
 
         Returns:
             True if successful
         """
-        ledger = await self.get_ledger()
+        client = self.redis_client
+
+        try:
+            await self._migrate_legacy_ledger(client)
+
+            async with client.pipeline(transaction=False) as pipe:
+                for section, entry in entries:
+                    pipe.sismember(_names_key(section), entry["name"])
+                existing = await pipe.execute()
+
+            to_add = []
+            for (section, entry), is_member in zip(entries, existing):
+                if is_member:
+                    logger.warning(
+                        f"{entry['name']} already exists in ledger {section}"
+                    )
+                else:
+                    to_add.append((section, entry))
+
+            if to_add:
+                async with client.pipeline(transaction=True) as pipe:
+                    for section, entry in to_add:
+                        pipe.sadd(_names_key(section), entry["name"])
+                        pipe.hset(_item_key(section, entry["name"]), mapping=entry)
+                    pipe.publish(LEDGER_INVALIDATE_CHANNEL, "1")
+                    await pipe.execute()
+                _set_ledger_cache(None)
+
+                for section, entry in to_add:
+                    logger.info(f"Added {entry['name']} to ledger {section}")
+
+            return True
+        except Exception as e:
+            logger.error(f"Failed to add entries to ledger: {e}")
+            raise
+
+    async def _add_entry(self, section: str, entry: Dict[str, str]) -> bool:
+        """
+        Add a single entry to a ledger section.
 
-        # Check if repo already exists
-        for repo in ledger["repos"]:
-            if repo["name"] == repo_name:
-                logger.warning(f"Repository {repo_name} already exists in ledger")
+        Args:
+            section: Ledger section ("repos", "blogs" or "notebooks")
+            entry: Item to add; must contain a "name" key
+
+        Returns:
+            True if successful
+        """
+        return await self._add_entries([(section, entry)])
+
+    async def _remove_entry(self, section: str, name: str) -> bool:
+        """
+        Remove an entry's hash and its name SET membership atomically.
+
+        Caches are only invalidated when the entry was actually present, so
+        removing an unknown name costs a single round trip.
+
+        Args:
+            section: Ledger section ("repos", "blogs" or "notebooks")
+            name: Name of the entry to remove
+
+        Returns:
+            True if successful (including when the entry was not present)
+        """
+        client = self.redis_client
+
+        try:
+            await self._migrate_legacy_ledger(client)
+
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.srem(_names_key(section), name)
+                pipe.delete(_item_key(section, name))
+                removed, _ = await pipe.execute()
+
+            if not removed:
+                logger.info(f"{name} not found in ledger {section}")
                 return True
 
-        # Add new repo
-        ledger["repos"].append({"name": repo_name, "github_url": github_url})
+            _set_ledger_cache(None)
+            await client.publish(LEDGER_INVALIDATE_CHANNEL, "1")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to remove {name} from ledger {section}: {e}")
+            raise
 
-        return await self.update_ledger(ledger)
+    async def add_repo_to_ledger(self, repo_name: str, github_url: str) -> bool:
+        """
+        Add a repository to the ledger.
+
+        Args:
+            repo_name: Name of the repository
+            github_url: GitHub URL of the repository
+
+        Returns:
+            True if successful
+        """
+        return await self._add_entry(
+            "repos", {"name": repo_name, "github_url": github_url}
+        )
 
     async def add_blog_to_ledger(self, blog_name: str, blog_url: str) -> bool:
         """
@@ -123,18 +425,7 @@ class ETLedgerManager:
         Returns:
             True if successful
         """
-        ledger = await self.get_ledger()
-
-        # Check if blog already exists
-        for blog in ledger["blogs"]:
-            if blog["name"] == blog_name:
-                logger.warning(f"Blog {blog_name} already exists in ledger")
-                return True
-
-        # Add new blog
-        ledger["blogs"].append({"name": blog_name, "blog_url": blog_url})
-
-        return await self.update_ledger(ledger)
+        return await self._add_entry("blogs", {"name": blog_name, "blog_url": blog_url})
 
     async def add_notebook_to_ledger(self, notebook_name: str, github_url: str) -> bool:
         """
@@ -147,18 +438,9 @@ class ETLedgerManager:
         Returns:
             True if successful
         """
-        ledger = await self.get_ledger()
-
-        # Check if notebook already exists
-        for notebook in ledger["notebooks"]:
-            if notebook["name"] == notebook_name:
-                logger.warning(f"Notebook {notebook_name} already exists in ledger")
-                return True
-
-        # Add new notebook
-        ledger["notebooks"].append({"name": notebook_name, "github_url": github_url})
-
-        return await self.update_ledger(ledger)
+        return await self._add_entry(
+            "notebooks", {"name": notebook_name, "github_url": github_url}
+        )
 
     async def remove_repo_from_ledger(self, repo_name: str) -> bool:
         """
@@ -170,14 +452,7 @@ class ETLedgerManager:
         Returns:
             True if successful
         """
-        ledger = await self.get_ledger()
-
-        # Remove repo if it exists
-        ledger["repos"] = [
-            repo for repo in ledger["repos"] if repo["name"] != repo_name
-        ]
-
-        return await self.update_ledger(ledger)
+        return await self._remove_entry("repos", repo_name)
 
     async def remove_blog_from_ledger(self, blog_name: str) -> bool:
         """
@@ -189,14 +464,7 @@ class ETLedgerManager:
         Returns:
             True if successful
         """
-        ledger = await self.get_ledger()
-
-        # Remove blog if it exists
-        ledger["blogs"] = [
-            blog for blog in ledger["blogs"] if blog["name"] != blog_name
-        ]
-
-        return await self.update_ledger(ledger)
+        return await self._remove_entry("blogs", blog_name)
 
     async def remove_notebook_from_ledger(self, notebook_name: str) -> bool:
         """
@@ -208,16 +476,7 @@ class ETLedgerManager:
         Returns:
             True if successful
         """
-        ledger = await self.get_ledger()
-
-        # Remove notebook if it exists
-        ledger["notebooks"] = [
-            notebook
-            for notebook in ledger["notebooks"]
-            if notebook["name"] != notebook_name
-        ]
-
-        return await self.update_ledger(ledger)
+        return await self._remove_entry("notebooks", notebook_name)
 
     async def seed_ledger_with_sample_content(self) -> bool:
         """
@@ -227,26 +486,35 @@ class ETLedgerManager:
             True if successful
         """
         try:
-            # Add sample blog to the ledger
-            blog_success = await self.add_blog_to_ledger(
-                blog_name="redis-quantization-dimensionality-reduction",
-                blog_url="https://redis.io/blog/redis-quantization-dimensionality-reduction/",
-            )
-
-            # Add sample notebook to the ledger
-            notebook_success = await self.add_notebook_to_ledger(
-                notebook_name="02_hybrid_search",
-                github_url="https://github.com/RedisVentures/redis-retrieval-optimizer/blob/main/notebooks/02_hybrid_search.ipynb",
+            # Add the sample blog and notebook in a single batch; this needs
+            # fewer round trips than gathering two separate add_* calls
+            success = await self._add_entries(
+                [
+                    (
+                        "blogs",
+                        {
+                            "name": "redis-quantization-dimensionality-reduction",
+                            "blog_url": "https://redis.io/blog/redis-quantization-dimensionality-reduction/",
+                        },
+                    ),
+                    (
+                        "notebooks",
+                        {
+                            "name": "02_hybrid_search",
+                            "github_url": "https://github.com/RedisVentures/redis-retrieval-optimizer/blob/main/notebooks/02_hybrid_search.ipynb",
+                        },
+                    ),
+                ]
             )
 
-            if blog_success and notebook_success:
+            if success:
                 logger.info(
                     "Successfully seeded ledger with sample blogs and notebooks"
                 )
             else:
                 logger.error("Failed to seed ledger with sample content")
 
-            return blog_success and notebook_success
+            return success
 
         except Exception as e:
             logger.error(f"Failed to seed ledger: {e}")
@@ -254,5 +522,10 @@ class ETLedgerManager:
 
 
 def get_etl_ledger_manager() -> ETLedgerManager:
-    """Get ETL ledger manager instance."""
-    return ETLedgerManager()
+    """
+    Get an ETL ledger manager with its Redis client resolved up front.
+
+    Returns:
+        ETLedgerManager instance ready for use
+    """
+    return ETLedgerManager(get_redis_client())
@@ -1,31 +1,38 @@
 """
-ETL tasks package for the applied-ai-agent.
+ETL task package for the applied-ai-agent.
 
 This package contains all ETL task modules organized by functionality.
+
+Task functions are loaded lazily (PEP 562) so that importing the package does
+not pull in every task module and its heavyweight dependencies; the module
+defining a task is imported the first time the task is accessed.
 """
 
-# Import all task functions for easy access
-from .content_tasks import (
-    add_content_to_knowledge_base,
-    process_content_pipeline,
-    remove_content_from_knowledge_base,
-    run_artifact_processing_pipeline,
-    run_ingestion_pipeline_background,
-    trigger_artifact_processing_pipeline,
-    trigger_ingestion_pipeline,
-    update_content_in_knowledge_base,
-)
-from .ingestion import (
-    process_blog,
-    process_notebook,
-    process_repository,
-    run_ingestion_pipeline,
-)
-from .vectorization import run_vectorization_pipeline
+import importlib
+from typing import Any, Dict, List
 
 # Note: Task registration has been moved to app.worker.task_registration
 # This module now only contains the task function definitions
 
+# Maps each exported task to the module that defines it
+_LAZY: Dict[str, str] = {
+    # Content management tasks
+    "add_content_to_knowledge_base": "app.etl.tasks.content_tasks",
+    "update_content_in_knowledge_base": "app.etl.tasks.content_tasks",
+    "remove_content_from_knowledge_base": "app.etl.tasks.content_tasks",
+    "process_content_pipeline": "app.etl.tasks.content_tasks",
+    "trigger_ingestion_pipeline": "app.etl.tasks.content_tasks",
+    "run_ingestion_pipeline_background": "app.etl.tasks.content_tasks",
+    "trigger_artifact_processing_pipeline": "app.etl.tasks.content_tasks",
+    "run_artifact_processing_pipeline": "app.etl.tasks.content_tasks",
+    "run_ingestion_pipeline": "app.etl.tasks.ingestion",
+    "run_vectorization_pipeline": "app.etl.tasks.vectorization",
+    # Individual ingestion tasks
+    "process_repository": "app.etl.tasks.ingestion",
+    "process_blog": "app.etl.tasks.ingestion",
+    "process_notebook": "app.etl.tasks.ingestion",
+}
+
 
 __all__ = [
     # Content management tasks
@@ -44,3 +51,17 @@ __all__ = [
     "process_blog",
     "process_notebook",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module defining a task on first access and cache the task."""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -5,26 +5,58 @@ This module contains all tasks related to content management, ingestion, and pro
 """
 
 import asyncio
+import functools
+import io
 import logging
+import multiprocessing
+import os
+import re
+import shutil
 import tempfile
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import lxml.html
 from docket import Docket, Retry
+from lxml import etree
+from markdownify import MarkdownConverter
+from pypdf import PdfReader
 
 from app.api.content_ledger import get_content_ledger_manager
-from app.api.content_storage import get_content_storage_manager
+from app.api.content_storage import (
+    S3_TRANSFER_CONFIG,
+    get_content_storage_manager,
+    run_s3_call,
+)
+from app.utilities.database import get_redis_client
 from app.utilities.environment import get_env_var
 
 logger = logging.getLogger(__name__)
 
 
-# Get REDIS_URL dynamically
+# REDIS_URL does not change while the process runs, so read it once;
+# call get_redis_url.cache_clear() to pick up a new value
+@functools.lru_cache(maxsize=1)
 def get_redis_url() -> str:
     return get_env_var("REDIS_URL", "redis://localhost:6379/0")
 
 
+# Sorted set of ingestion runs that are queued or running, scored by the time
+# their slot lapses. Each run removes its own entry when it finishes; entries
+# past their deadline (a run that never started or a crashed worker) are
+# dropped before counting, so a lost run cannot hold a slot forever.
+INGESTION_INFLIGHT_KEY = "ingestion:inflight"
+INGESTION_INFLIGHT_TTL_SECONDS = 3600
+
+# Default number of files the artifact pipeline transfers at once
+S3_PROCESSING_CONCURRENCY = int(get_env_var("S3_PROCESSING_CONCURRENCY", "16"))
+
+
 async def add_content_to_knowledge_base(
     content_type: str,
     content_name: str,
@@ -267,12 +299,11 @@ async def process_content_pipeline(
             return result
 
         finally:
-            # Clean up local file
-            try:
-                local_path.unlink()
-                local_path.parent.rmdir()
-            except Exception as e:
-                logger.warning(f"Failed to clean up local file {local_path}: {e}")
+            # Clean up the download's temp directory off the event loop;
+            # ignore_errors keeps cleanup idempotent if it is already gone
+            await asyncio.to_thread(
+                shutil.rmtree, local_path.parent, ignore_errors=True
+            )
 
     except Exception as e:
         logger.error(f"Failed to process content {content_type}/{content_name}: {e}")
@@ -307,9 +338,6 @@ async def trigger_ingestion_pipeline(
     Returns:
         Dictionary with task ID and immediate acknowledgment
     """
-    import uuid
-    from datetime import datetime, timezone
-
     # Generate a unique task ID
     task_id = str(uuid.uuid4())
     ingestion_date = datetime.now(timezone.utc).isoformat()
@@ -325,30 +353,42 @@ async def trigger_ingestion_pipeline(
         "message": "Ingestion pipeline queued for background processing",
     }
 
-    # Queue the actual work for background processing
-    # This will be handled by Docket workers - don't await it!
-    import threading
-
-    def run_background_task():
-        """Run the background task in a separate thread to avoid blocking"""
-        loop = None
-        try:
-            # Import here to avoid circular imports
-
-            from app.etl.tasks.ingestion import run_ingestion_pipeline
-
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(run_ingestion_pipeline())
-        except Exception as e:
-            logger.error(f"Background ingestion task failed: {e}")
-        finally:
-            if loop:
-                loop.close()
+    # Claim an in-flight slot so repeated triggers cannot fan out unbounded
+    # pipeline runs against Redis and S3
+    max_inflight = int(get_env_var("MAX_INFLIGHT_INGESTIONS", "2"))
+    client = get_redis_client()
+    now = time.time()
+    pipe = client.pipeline(transaction=True)
+    pipe.zremrangebyscore(INGESTION_INFLIGHT_KEY, "-inf", now)
+    pipe.zadd(INGESTION_INFLIGHT_KEY, {task_id: now + INGESTION_INFLIGHT_TTL_SECONDS})
+    pipe.zcard(INGESTION_INFLIGHT_KEY)
+    *_, inflight = await pipe.execute()
+    if inflight > max_inflight:
+        await client.zrem(INGESTION_INFLIGHT_KEY, task_id)
+        logger.warning(
+            f"Rejected ingestion task {task_id}: {max_inflight} runs already in flight"
+        )
+        acknowledgment["status"] = "rejected"
+        acknowledgment["message"] = (
+            f"{max_inflight} ingestion pipelines are already running; try again later"
+        )
+        return acknowledgment
 
-    # Start background task in a separate thread
-    thread = threading.Thread(target=run_background_task, daemon=True)
-    thread.start()
+    # Use Docket to queue the ingestion task for the worker pool
+    try:
+        async with Docket(name="applied-ai-agent", url=get_redis_url()) as docket:
+            await docket.add(
+                run_ingestion_pipeline_background, key=f"ingestion_{task_id}"
+            )(
+                task_id=task_id,
+                content_types=content_types,
+                force_refresh=force_refresh,
+                max_concurrent=max_concurrent,
+            )
+    except Exception:
+        # The run never started, so give its slot back
+        await client.zrem(INGESTION_INFLIGHT_KEY, task_id)
+        raise
 
     return acknowledgment
 
@@ -374,9 +414,10 @@ async def run_ingestion_pipeline_background(
     logger.info(f"Starting background ingestion pipeline for task ID: {task_id}")
 
     try:
+        # Deferred so importing this module does not pull in GitPython
         from app.etl.tasks.ingestion import run_ingestion_pipeline
 
-        result = await run_ingestion_pipeline()
+        result = await run_ingestion_pipeline(max_concurrent=max_concurrent)
 
         # Add task ID to result
         result["task_id"] = task_id
@@ -418,10 +459,17 @@ async def run_ingestion_pipeline_background(
 
         raise
 
+    finally:
+        # Release the slot claimed by trigger_ingestion_pipeline
+        try:
+            await get_redis_client().zrem(INGESTION_INFLIGHT_KEY, task_id)
+        except Exception as e:
+            logger.warning(f"Failed to release ingestion slot for task {task_id}: {e}")
+
 
 async def trigger_artifact_processing_pipeline(
     content_types: Optional[List[str]] = None,
-    max_concurrent: int = 5,
+    max_concurrent: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Trigger the artifact processing pipeline to transform raw S3 content to processed content.
@@ -429,14 +477,12 @@ async def trigger_artifact_processing_pipeline(
 
     Args:
         content_types: List of content types to process (None for all)
-        max_concurrent: Maximum concurrent processing tasks
+        max_concurrent: Maximum concurrent file transfers (defaults to
+            S3_PROCESSING_CONCURRENCY)
 
     Returns:
         Dictionary with task ID and immediate acknowledgment
     """
-    import uuid
-    from datetime import datetime, timezone
-
     # Generate a unique task ID
     task_id = str(uuid.uuid4())
     processing_date = datetime.now(timezone.utc).isoformat()
@@ -468,7 +514,7 @@ async def trigger_artifact_processing_pipeline(
 async def run_artifact_processing_pipeline_background(
     task_id: str,
     content_types: Optional[List[str]] = None,
-    max_concurrent: int = 5,
+    max_concurrent: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Background task to run the artifact processing pipeline.
@@ -476,7 +522,8 @@ async def run_artifact_processing_pipeline_background(
     Args:
         task_id: Unique task identifier
         content_types: List of content types to process (None for all)
-        max_concurrent: Maximum concurrent processing tasks
+        max_concurrent: Maximum concurrent file transfers (defaults to
+            S3_PROCESSING_CONCURRENCY)
 
     Returns:
         Dictionary with pipeline results
@@ -535,7 +582,7 @@ async def run_artifact_processing_pipeline_background(
 
 async def run_artifact_processing_pipeline(
     content_types: Optional[List[str]] = None,
-    max_concurrent: int = 5,
+    max_concurrent: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Run the artifact processing pipeline using S3-aware processing logic.
@@ -543,7 +590,8 @@ async def run_artifact_processing_pipeline(
 
     Args:
         content_types: List of content types to process (None for all)
-        max_concurrent: Maximum concurrent processing tasks
+        max_concurrent: Maximum concurrent file transfers (defaults to
+            S3_PROCESSING_CONCURRENCY)
 
     Returns:
         Dictionary with pipeline results
@@ -567,59 +615,59 @@ async def run_artifact_processing_pipeline(
         if not storage_manager:
             raise RuntimeError("Failed to initialize storage manager")
 
-        # Debug: List all content to see what's actually in S3
-        all_content = await storage_manager.list_content()
-        logger.info(f"Found {len(all_content)} total content items in S3")
+        # Each helper lists its own raw/ prefix, so the whole-bucket summary
+        # is only worth an S3 listing when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            all_content = await storage_manager.list_content()
+            logger.debug(f"Found {len(all_content)} total content items in S3")
 
-        # Log the actual content types and names for debugging
-        content_by_type = {}
-        for item in all_content:
-            content_type = item.get("content_type", "unknown")
-            if content_type not in content_by_type:
-                content_by_type[content_type] = []
-            content_by_type[content_type].append(item.get("content_name", "unknown"))
+            content_by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for item in all_content:
+                content_by_type[item.get("content_type", "unknown")].append(item)
 
-        for ctype, names in content_by_type.items():
-            logger.info(
-                f"Content type '{ctype}': {len(names)} items - {names[:5]}{'...' if len(names) > 5 else ''}"
-            )
+            for ctype, items in content_by_type.items():
+                names = [item.get("content_name", "unknown") for item in items[:5]]
+                logger.debug(
+                    f"Content type '{ctype}': {len(items)} items - {names}{'...' if len(items) > 5 else ''}"
+                )
+
+        processors = {
+            "blog": process_blog_posts_s3,
+            "notebooks": process_notebooks_s3,
+            "slides": process_slides_s3,
+            "repos": process_repos_s3,
+            "redis_docs": process_redis_docs_s3,
+        }
 
-        # Process each content type
+        selected_types = []
         for content_type in content_types:
-            logger.info(f"Processing content type: {content_type}")
+            if content_type in processors:
+                selected_types.append(content_type)
+            else:
+                logger.warning(f"Unknown content type: {content_type}")
+
+        # Content types live under disjoint S3 prefixes, so process them
+        # concurrently; one type failing does not affect the others. A single
+        # semaphore caps in-flight files across all types at max_concurrent.
+        semaphore = asyncio.Semaphore(max_concurrent or S3_PROCESSING_CONCURRENCY)
+        logger.info(f"Processing content types: {selected_types}")
+        outcomes = await asyncio.gather(
+            *(
+                processors[content_type](storage_manager, semaphore=semaphore)
+                for content_type in selected_types
+            ),
+            return_exceptions=True,
+        )
 
-            try:
-                if content_type == "blog":
-                    processed_count = await process_blog_posts_s3(
-                        storage_manager, all_content
-                    )
-                elif content_type == "notebooks":
-                    processed_count = await process_notebooks_s3(
-                        storage_manager, all_content
-                    )
-                elif content_type == "slides":
-                    processed_count = await process_slides_s3(
-                        storage_manager, all_content
-                    )
-                elif content_type == "repos":
-                    processed_count = await process_repos_s3(
-                        storage_manager, all_content
-                    )
-                elif content_type == "redis_docs":
-                    processed_count = await process_redis_docs_s3(
-                        storage_manager, all_content
-                    )
-                else:
-                    logger.warning(f"Unknown content type: {content_type}")
-                    continue
-
-                results["results"][content_type] = processed_count
-                results["total_files_processed"] += processed_count
-                logger.info(f"Processed {processed_count} {content_type} files")
-
-            except Exception as e:
-                logger.error(f"Failed to process {content_type}: {e}")
-                results["results"][content_type] = {"error": str(e)}
+        for content_type, outcome in zip(selected_types, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to process {content_type}: {outcome}")
+                results["results"][content_type] = {"error": str(outcome)}
+                continue
+
+            results["results"][content_type] = outcome
+            results["total_files_processed"] += outcome
+            logger.info(f"Processed {outcome} {content_type} files")
 
         logger.info(
             f"Artifact processing completed: {results['total_files_processed']} files processed"
@@ -635,79 +683,76 @@ async def run_artifact_processing_pipeline(
 
 # Content processing functions for different types
 
+# Objects above this size are downloaded as parallel ranged GETs
+_RANGE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# HTML/PDF conversion is CPU-bound, so it runs in worker processes to keep
+# the event loop free for concurrent S3 transfers
+_process_pool: ProcessPoolExecutor | None = None
+
+# Most objects a staged helper holds in memory between download and upload:
+# room for a full set of transfers plus as many again waiting on conversion,
+# so downloads keep running while the process pool is busy
+_MAX_BUFFERED_OBJECTS = 2 * S3_PROCESSING_CONCURRENCY
+
+# Pages of a PDF extracted per process-pool task
+_PDF_PAGES_PER_SHARD = 25
+
+# Only long, text-heavy PDFs are worth sharding. Every shard copies the whole
+# file to a worker and reparses it (measured ~2 ms per MB plus ~0.1 ms per
+# page) while extraction costs ~1.5-6 ms per page, so below 100 pages the gain
+# is small and past 8 MiB (image-heavy decks) a shard's copy costs more than
+# its extraction.
+_PDF_SHARD_MIN_PAGES = 100
+_PDF_SHARD_MAX_BYTES = 8 * 1024 * 1024
+
 
 async def process_blog_posts_s3(
-    storage_manager, all_content: List[Dict[str, Any]]
+    storage_manager, semaphore: Optional[asyncio.Semaphore] = None
 ) -> int:
-    """Process blog posts from S3 raw to processed format."""
+    """Process blog posts from S3 raw to processed format.
+
+    Downloads and uploads are bounded by ``semaphore``; conversion overlaps
+    with the transfers of other posts.
+    """
     logger.info("Processing blog posts from S3")
 
     try:
         # List files directly from S3 raw/blogs/ folder
-        response = await asyncio.to_thread(
-            storage_manager.s3_client.list_objects_v2,
-            Bucket=storage_manager.bucket_name,
-            Prefix="raw/blogs/",
+        raw_blog_files = await run_s3_call(
+            _list_objects, storage_manager, "raw/blogs/", ".html"
         )
 
-        raw_blog_files = [
-            obj for obj in response.get("Contents", []) if obj["Key"].endswith(".html")
-        ]
-
         logger.info(f"Found {len(raw_blog_files)} blog files to process")
 
-        processed_count = 0
-
-        for obj in raw_blog_files:
-            try:
-                s3_key = obj["Key"]  # e.g., "raw/blogs/filename.html"
-                filename = Path(s3_key).name  # e.g., "filename.html"
-
-                # Download from raw/
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-                temp_path = Path(temp_file.name)
-                temp_file.close()
-
-                await asyncio.to_thread(
-                    storage_manager.s3_client.download_file,
-                    storage_manager.bucket_name,
-                    s3_key,
-                    str(temp_path),
-                )
-
-                # Process HTML to Markdown
-                processed_content = await convert_html_to_markdown(temp_path)
-
-                # Upload to processed/ with .md extension
-                processed_filename = filename.replace(".html", ".md")
-                processed_s3_key = f"processed/blog/{processed_filename}"
+        async def fetch(obj: Dict[str, Any]) -> bytes:
+            # Download from raw/ straight into memory
+            return await run_s3_call(_get_object_bytes, storage_manager, obj["Key"])
 
-                # Write processed content to temp file
-                processed_temp = tempfile.NamedTemporaryFile(
-                    delete=False, suffix=".md", mode="w", encoding="utf-8"
-                )
-                processed_temp.write(processed_content)
-                processed_temp.close()
-
-                await asyncio.to_thread(
-                    storage_manager.s3_client.upload_file,
-                    processed_temp.name,
-                    storage_manager.bucket_name,
-                    processed_s3_key,
-                )
+        async def store(obj: Dict[str, Any], processed_content: str) -> None:
+            filename = Path(obj["Key"]).name  # e.g., "filename.html"
 
-                processed_count += 1
-                logger.info(f"Processed blog post: {filename} -> {processed_filename}")
+            # Upload to processed/ with .md extension
+            processed_filename = filename.replace(".html", ".md")
+            processed_s3_key = f"processed/blog/{processed_filename}"
 
-                # Clean up
-                temp_path.unlink()
-                Path(processed_temp.name).unlink()
+            await run_s3_call(
+                storage_manager.s3_client.put_object,
+                Bucket=storage_manager.bucket_name,
+                Key=processed_s3_key,
+                Body=processed_content.encode("utf-8"),
+            )
 
-            except Exception as e:
-                logger.error(f"Failed to process blog post {filename}: {e}")
-                continue
+            logger.info(f"Processed blog post: {filename} -> {processed_filename}")
 
-        return processed_count
+        return await _process_staged(
+            raw_blog_files,
+            fetch,
+            convert_html_to_markdown,
+            store,
+            "blog post",
+            semaphore,
+        )
 
     except Exception as e:
         logger.error(f"Failed to process blog posts: {e}")
@@ -715,66 +760,41 @@ async def process_blog_posts_s3(
 
 
 async def process_notebooks_s3(
-    storage_manager, all_content: List[Dict[str, Any]]
+    storage_manager, semaphore: Optional[asyncio.Semaphore] = None
 ) -> int:
-    """Process notebooks from S3 raw to processed format."""
+    """Process notebooks from S3 raw to processed format.
+
+    Copies run concurrently, bounded by ``semaphore``.
+    """
     logger.info("Processing notebooks from S3")
 
     try:
         # List files directly from S3 raw/notebooks/ folder
-        response = await asyncio.to_thread(
-            storage_manager.s3_client.list_objects_v2,
-            Bucket=storage_manager.bucket_name,
-            Prefix="raw/notebooks/",
+        raw_notebook_files = await run_s3_call(
+            _list_objects, storage_manager, "raw/notebooks/", ".ipynb"
         )
 
-        raw_notebook_files = [
-            obj for obj in response.get("Contents", []) if obj["Key"].endswith(".ipynb")
-        ]
-
         logger.info(f"Found {len(raw_notebook_files)} notebook files to process")
 
-        processed_count = 0
-
-        for obj in raw_notebook_files:
-            try:
-                s3_key = obj["Key"]  # e.g., "raw/notebooks/filename.ipynb"
-                filename = Path(s3_key).name  # e.g., "filename.ipynb"
-
-                # Download from raw/
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".ipynb")
-                temp_path = Path(temp_file.name)
-                temp_file.close()
-
-                await asyncio.to_thread(
-                    storage_manager.s3_client.download_file,
-                    storage_manager.bucket_name,
-                    s3_key,
-                    str(temp_path),
-                )
-
-                # Process (just copy for now)
-                with open(temp_path, "rb") as f:
-                    f.read()  # Read but don't store since we're just copying
-
-                # Upload to processed/ with same filename
-                processed_s3_key = f"processed/notebooks/{filename}"
-                await asyncio.to_thread(
-                    storage_manager.s3_client.upload_file,
-                    str(temp_path),
-                    storage_manager.bucket_name,
-                    processed_s3_key,
-                )
-
-                processed_count += 1
-                logger.info(f"Processed notebook: {filename}")
+        async def process_one(obj: Dict[str, Any]) -> None:
+            s3_key = obj["Key"]  # e.g., "raw/notebooks/filename.ipynb"
+            filename = Path(s3_key).name  # e.g., "filename.ipynb"
+
+            # Notebooks are published unchanged, so copy them to
+            # processed/ server-side instead of downloading and re-uploading
+            processed_s3_key = f"processed/notebooks/{filename}"
+            await run_s3_call(
+                storage_manager.s3_client.copy_object,
+                Bucket=storage_manager.bucket_name,
+                CopySource={"Bucket": storage_manager.bucket_name, "Key": s3_key},
+                Key=processed_s3_key,
+            )
 
-                # Clean up
-                temp_path.unlink()
+            logger.info(f"Processed notebook: {filename}")
 
-            except Exception as e:
-                logger.error(f"Failed to process notebook {filename}: {e}")
-                continue
+        processed_count = await _process_concurrently(
+            raw_notebook_files, process_one, "notebook", semaphore
+        )
 
         logger.info(
             f"Processed {processed_count}/{len(raw_notebook_files)} notebook files"
@@ -786,149 +806,116 @@ async def process_notebooks_s3(
         return 0
 
 
-async def process_slides_s3(storage_manager, all_content: List[Dict[str, Any]]) -> int:
-    """Process slides/PDFs from S3 raw to processed format."""
+async def process_slides_s3(
+    storage_manager, semaphore: Optional[asyncio.Semaphore] = None
+) -> int:
+    """Process slides/PDFs from S3 raw to processed format.
+
+    Downloads and uploads are bounded by ``semaphore``; text extraction
+    overlaps with the transfers of other slides.
+    """
     logger.info("Processing slides from S3")
 
     try:
         # List files directly from S3 raw/slides/ folder
-        response = await asyncio.to_thread(
-            storage_manager.s3_client.list_objects_v2,
-            Bucket=storage_manager.bucket_name,
-            Prefix="raw/slides/",
+        raw_slide_files = await run_s3_call(
+            _list_objects, storage_manager, "raw/slides/", (".pdf", ".pptx")
         )
 
-        raw_slide_files = [
-            obj
-            for obj in response.get("Contents", [])
-            if obj["Key"].endswith(".pdf") or obj["Key"].endswith(".pptx")
-        ]
-
         logger.info(f"Found {len(raw_slide_files)} slide files to process")
 
-        processed_count = 0
-
-        for obj in raw_slide_files:
-            try:
-                s3_key = obj["Key"]  # e.g., "raw/slides/filename.pdf"
-                filename = Path(s3_key).name  # e.g., "filename.pdf"
-
-                # Download from raw/
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-                temp_path = Path(temp_file.name)
-                temp_file.close()
-
-                await asyncio.to_thread(
-                    storage_manager.s3_client.download_file,
-                    storage_manager.bucket_name,
-                    s3_key,
-                    str(temp_path),
-                )
-
-                # Extract text from PDF
-                processed_content = await extract_pdf_text(temp_path)
-
-                # Upload to processed/ with .txt extension
-                processed_filename = filename.replace(".pdf", ".txt").replace(
-                    ".pptx", ".txt"
-                )
-                processed_s3_key = f"processed/slides/{processed_filename}"
-
-                # Write processed content to temp file
-                processed_temp = tempfile.NamedTemporaryFile(
-                    delete=False, suffix=".txt", mode="w", encoding="utf-8"
-                )
-                processed_temp.write(processed_content)
-                processed_temp.close()
+        async def fetch(obj: Dict[str, Any]) -> bytes:
+            # Download from raw/ straight into memory
+            return await _download_object(
+                storage_manager, obj["Key"], obj.get("Size", 0)
+            )
 
-                await asyncio.to_thread(
-                    storage_manager.s3_client.upload_file,
-                    processed_temp.name,
-                    storage_manager.bucket_name,
-                    processed_s3_key,
-                )
+        async def store(obj: Dict[str, Any], processed_content: str) -> None:
+            filename = Path(obj["Key"]).name  # e.g., "filename.pdf"
 
-                processed_count += 1
-                logger.info(f"Processed slide: {filename} -> {processed_filename}")
+            # Upload to processed/ with .txt extension
+            processed_filename = filename.replace(".pdf", ".txt").replace(
+                ".pptx", ".txt"
+            )
+            processed_s3_key = f"processed/slides/{processed_filename}"
 
-                # Clean up
-                temp_path.unlink()
-                Path(processed_temp.name).unlink()
+            await run_s3_call(
+                storage_manager.s3_client.put_object,
+                Bucket=storage_manager.bucket_name,
+                Key=processed_s3_key,
+                Body=processed_content.encode("utf-8"),
+            )
 
-            except Exception as e:
-                logger.error(f"Failed to process slide {filename}: {e}")
-                continue
+            logger.info(f"Processed slide: {filename} -> {processed_filename}")
 
-        return processed_count
+        return await _process_staged(
+            raw_slide_files, fetch, extract_pdf_text, store, "slide", semaphore
+        )
 
     except Exception as e:
         logger.error(f"Failed to process slides: {e}")
         return 0
 
 
-async def process_repos_s3(storage_manager, all_content: List[Dict[str, Any]]) -> int:
-    """Process repositories from S3 raw to processed format."""
+async def process_repos_s3(
+    storage_manager, semaphore: Optional[asyncio.Semaphore] = None
+) -> int:
+    """Process repositories from S3 raw to processed format.
+
+    Repos are processed concurrently, bounded by ``semaphore``.
+    """
     logger.info("Processing repositories from S3")
 
     try:
-        # Filter for raw repo files (content_type is "raw" and path contains "repos/")
-        raw_repo_files = [
-            item
-            for item in all_content
-            if item.get("content_type") == "raw"
-            and "repos/" in item.get("content_name", "")
-            and item.get("content_name", "").endswith(".zip")
-        ]
+        # List raw repo archives directly from the S3 raw/repos/ folder
+        raw_repo_files = await run_s3_call(
+            _list_objects, storage_manager, "raw/repos/", ".zip"
+        )
 
         logger.info(f"Found {len(raw_repo_files)} repo files to process")
 
-        processed_count = 0
-
-        for file_info in raw_repo_files:
-            try:
-                content_name = file_info["content_name"]
+        # Archives are downloaded into one temp directory for the batch,
+        # removed in a single pass once every repo has been handled
+        temp_dir = Path(tempfile.mkdtemp(prefix="repos_"))
 
-                # Download raw repo (zip file)
-                # Download raw repo file (content is stored as "raw/repos/filename.zip")
-                local_path = await storage_manager.download_content("raw", content_name)
+        async def process_one(obj: Dict[str, Any]) -> None:
+            # e.g. "raw/repos/filename.zip" -> "repos/filename.zip"
+            content_name = obj["Key"].removeprefix("raw/")
 
-                # Convert repo to PDF (simplified - just copy for now)
-                with open(local_path, "rb") as f:
-                    processed_content = f.read()
+            # Download raw repo file (content is stored as "raw/repos/filename.zip")
+            local_path = await storage_manager.download_content(
+                "raw", content_name, dest_dir=temp_dir
+            )
 
+            try:
                 # Upload processed content to S3
                 # Extract just the filename from the path (e.g., "repos/filename.zip" -> "filename.pdf")
                 filename = Path(content_name).name
                 processed_filename = filename.replace(".zip", ".pdf")
-                processed_path = local_path.parent / processed_filename
 
-                # Write processed content to temp file
-                with open(processed_path, "wb") as f:
-                    f.write(processed_content)
-
-                # Upload to processed folder
+                # Convert repo to PDF (simplified - just copy for now). Uploading
+                # by path lets the transfer manager read multipart chunks of the
+                # archive in parallel straight from disk.
                 s3_key = f"processed/repos/{processed_filename}"
-                await asyncio.to_thread(
+                await run_s3_call(
                     storage_manager.s3_client.upload_file,
-                    str(processed_path),
+                    str(local_path),
                     storage_manager.bucket_name,
                     s3_key,
+                    Config=S3_TRANSFER_CONFIG,
                 )
 
-                processed_count += 1
                 logger.info(f"Processed repo: {content_name} -> {processed_filename}")
+            finally:
+                # Free the archive's disk space as soon as it is uploaded
+                local_path.unlink(missing_ok=True)
 
-                # Clean up local files
-                local_path.unlink()
-                processed_path.unlink()
-
-            except Exception as e:
-                logger.error(
-                    f"Failed to process repo {file_info.get('content_name', 'unknown')}: {e}"
-                )
-                continue
-
-        return processed_count
+        try:
+            return await _process_concurrently(
+                raw_repo_files, process_one, "repo", semaphore
+            )
+        finally:
+            await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
 
     except Exception as e:
         logger.error(f"Failed to process repositories: {e}")
@@ -936,179 +923,432 @@ async def process_repos_s3(storage_manager, all_content: List[Dict[str, Any]]) -
 
 
 async def process_redis_docs_s3(
-    storage_manager, all_content: List[Dict[str, Any]]
+    storage_manager, semaphore: Optional[asyncio.Semaphore] = None
 ) -> int:
-    """Process Redis docs from S3 raw to processed format."""
+    """Process Redis docs from S3 raw to processed format.
+
+    Pages go from S3 to the parser and back without touching local disk.
+    Downloads and uploads are bounded by ``semaphore``; conversion overlaps
+    with the transfers of other pages.
+    """
     logger.info("Processing Redis docs from S3")
 
     try:
-        # Filter for raw Redis doc files (content_type is "raw" and path contains "redis_docs/")
-        raw_redis_doc_files = [
-            item
-            for item in all_content
-            if item.get("content_type") == "raw"
-            and "redis_docs/" in item.get("content_name", "")
-            and item.get("content_name", "").endswith(".html")
-        ]
+        # List raw Redis doc pages directly from the S3 raw/redis_docs/ folder
+        raw_redis_doc_files = await run_s3_call(
+            _list_objects, storage_manager, "raw/redis_docs/", ".html"
+        )
 
         logger.info(f"Found {len(raw_redis_doc_files)} Redis doc files to process")
 
-        processed_count = 0
+        async def fetch(obj: Dict[str, Any]) -> bytes:
+            # Download from raw/ straight into memory
+            return await run_s3_call(_get_object_bytes, storage_manager, obj["Key"])
+
+        async def store(obj: Dict[str, Any], processed_content: str) -> None:
+            # Extract just the filename from the path (e.g., "raw/redis_docs/filename.html" -> "filename.txt")
+            filename = Path(obj["Key"]).name
+            processed_filename = filename.replace(".html", ".txt")
+
+            # Upload to processed folder straight from memory
+            s3_key = f"processed/redis_docs/{processed_filename}"
+            await run_s3_call(
+                storage_manager.s3_client.put_object,
+                Bucket=storage_manager.bucket_name,
+                Key=s3_key,
+                Body=processed_content.encode("utf-8"),
+            )
 
-        for file_info in raw_redis_doc_files:
-            try:
-                content_name = file_info["content_name"]
+            logger.info(f"Processed Redis doc: {filename} -> {processed_filename}")
 
-                # Download raw HTML file (content is stored as "raw/redis_docs/filename.html")
-                local_path = await storage_manager.download_content("raw", content_name)
+        return await _process_staged(
+            raw_redis_doc_files,
+            fetch,
+            convert_html_to_text,
+            store,
+            "Redis doc",
+            semaphore,
+        )
 
-                # Convert HTML to text
-                processed_content = await convert_html_to_text(local_path)
+    except Exception as e:
+        logger.error(f"Failed to process Redis docs: {e}")
+        return 0
 
-                # Upload processed content to S3
-                # Extract just the filename from the path (e.g., "redis_docs/filename.html" -> "filename.txt")
-                filename = Path(content_name).name
-                processed_filename = filename.replace(".html", ".txt")
-                processed_path = local_path.parent / processed_filename
 
-                # Write processed content to temp file
-                with open(processed_path, "w", encoding="utf-8") as f:
-                    f.write(processed_content)
+# Helper functions for content processing
 
-                # Upload to processed folder
-                s3_key = f"processed/redis_docs/{processed_filename}"
-                await asyncio.to_thread(
-                    storage_manager.s3_client.upload_file,
-                    str(processed_path),
-                    storage_manager.bucket_name,
-                    s3_key,
-                )
 
-                processed_count += 1
-                logger.info(
-                    f"Processed Redis doc: {content_name} -> {processed_filename}"
-                )
+async def _process_concurrently(
+    objects: List[Dict[str, Any]],
+    handler,
+    label: str,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> int:
+    """
+    Run ``handler`` on each S3 object concurrently and count the successes.
 
-                # Clean up local files
-                local_path.unlink()
-                processed_path.unlink()
+    Args:
+        objects: S3 object summaries from ``_list_objects``
+        handler: Coroutine function that processes one object
+        label: Human-readable object kind for failure logs
+        semaphore: Bound on objects in flight (defaults to
+            S3_PROCESSING_CONCURRENCY)
 
-            except Exception as e:
-                logger.error(
-                    f"Failed to process Redis doc {file_info.get('content_name', 'unknown')}: {e}"
-                )
-                continue
+    Returns:
+        Number of objects processed without raising
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(S3_PROCESSING_CONCURRENCY)
 
-        return processed_count
+    async def run(obj: Dict[str, Any]) -> None:
+        async with semaphore:
+            await handler(obj)
 
-    except Exception as e:
-        logger.error(f"Failed to process Redis docs: {e}")
-        return 0
+    # return_exceptions isolates failures, so one bad object cannot cancel
+    # the rest of the batch
+    outcomes = await asyncio.gather(
+        *(run(obj) for obj in objects), return_exceptions=True
+    )
 
+    processed_count = 0
+    for obj, outcome in zip(objects, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Failed to process {label} {obj['Key']}: {outcome}")
+        else:
+            processed_count += 1
+    return processed_count
+
+
+async def _process_staged(
+    objects: List[Dict[str, Any]],
+    fetch,
+    transform,
+    store,
+    label: str,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> int:
+    """
+    Download, transform and upload S3 objects with the stages overlapped.
 
-# Helper functions for content processing
+    ``semaphore`` is only held while an object is being fetched or stored, so
+    CPU-bound transforms do not tie up S3 slots and other objects keep
+    transferring meanwhile. At most ``_MAX_BUFFERED_OBJECTS`` objects are
+    between fetch and store at once, which keeps memory bounded when
+    transforms fall behind the downloads.
 
+    Args:
+        objects: S3 object summaries from ``_list_objects``
+        fetch: Coroutine function returning one object's raw content
+        transform: Coroutine function converting raw content for upload
+        store: Coroutine function uploading ``(obj, transformed)``
+        label: Human-readable object kind for failure logs
+        semaphore: Bound on concurrent S3 transfers (defaults to
+            S3_PROCESSING_CONCURRENCY)
 
-async def convert_html_to_markdown(html_path: Path) -> str:
-    """Convert HTML file to Markdown format."""
-    try:
-        from bs4 import BeautifulSoup
-        from markdownify import markdownify
-
-        with open(html_path, "r", encoding="utf-8") as f:
-            html_content = f.read()
-
-        # Parse HTML
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # Extract main content
-        content_selectors = [
-            "article",
-            ".post-content",
-            ".entry-content",
-            ".content",
-            "main",
-            ".blog-post",
-        ]
-
-        main_content = None
-        for selector in content_selectors:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-
-        if not main_content:
-            main_content = soup.find("body")
-
-        if main_content:
-            # Convert to markdown
-            markdown_content = markdownify(
-                str(main_content), heading_style="ATX", bullets="-"
-            )
+    Returns:
+        Number of objects processed without raising
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(S3_PROCESSING_CONCURRENCY)
+
+    async def handler(obj: Dict[str, Any]) -> None:
+        async with semaphore:
+            raw = await fetch(obj)
+        transformed = await transform(raw)
+        async with semaphore:
+            await store(obj, transformed)
+
+    return await _process_concurrently(
+        objects, handler, label, asyncio.Semaphore(_MAX_BUFFERED_OBJECTS)
+    )
 
-            # Clean up the markdown
-            lines = [line.strip() for line in markdown_content.split("\n")]
-            cleaned_lines = []
 
-            for line in lines:
-                if line or (cleaned_lines and cleaned_lines[-1]):
-                    cleaned_lines.append(line)
+def _list_objects(
+    storage_manager, prefix: str, suffixes: Union[str, Tuple[str, ...]] = ""
+) -> List[Dict[str, Any]]:
+    """
+    List every object under ``prefix`` (blocking; run via run_s3_call).
 
-            return "\n".join(cleaned_lines)
+    list_objects_v2 returns at most 1000 keys per call, so follow the
+    paginator rather than silently dropping the rest.
 
-        return ""
+    Args:
+        storage_manager: Storage manager whose client and bucket are listed
+        prefix: Key prefix to list
+        suffixes: Only keep keys ending in one of these (default: all keys)
+    """
+    paginator = storage_manager.s3_client.get_paginator("list_objects_v2")
+    return [
+        obj
+        for page in paginator.paginate(
+            Bucket=storage_manager.bucket_name, Prefix=prefix
+        )
+        for obj in page.get("Contents", [])
+        if obj["Key"].endswith(suffixes)
+    ]
+
+
+def _get_object_bytes(
+    storage_manager, s3_key: str, byte_range: Optional[str] = None
+) -> bytes:
+    """Read an S3 object's body into memory (blocking; run via run_s3_call)."""
+    kwargs = {"Range": byte_range} if byte_range else {}
+    response = storage_manager.s3_client.get_object(
+        Bucket=storage_manager.bucket_name, Key=s3_key, **kwargs
+    )
+    return response["Body"].read()
 
-    except Exception as e:
-        logger.error(f"Failed to convert HTML to Markdown: {e}")
-        return ""
 
+async def _download_object(storage_manager, s3_key: str, size: int = 0) -> bytes:
+    """
+    Download an S3 object into memory.
 
-async def extract_pdf_text(pdf_path: Path) -> str:
-    """Extract text from PDF file."""
-    try:
-        from PyPDF2 import PdfReader
+    Objects larger than ``_RANGE_CHUNK_SIZE`` are fetched as concurrent
+    byte-range GETs, since a single S3 connection tops out well below the
+    available bandwidth for large files.
+    """
+    if size <= _RANGE_CHUNK_SIZE:
+        return await run_s3_call(_get_object_bytes, storage_manager, s3_key)
+
+    ranges = [
+        f"bytes={start}-{min(start + _RANGE_CHUNK_SIZE, size) - 1}"
+        for start in range(0, size, _RANGE_CHUNK_SIZE)
+    ]
+    chunks = await asyncio.gather(
+        *(
+            run_s3_call(_get_object_bytes, storage_manager, s3_key, byte_range)
+            for byte_range in ranges
+        )
+    )
+    return b"".join(chunks)
 
-        with open(pdf_path, "rb") as f:
-            reader = PdfReader(f)
-            text_content = []
 
-            for page_num, page in enumerate(reader.pages):
-                try:
-                    text = page.extract_text()
-                    if text.strip():
-                        text_content.append(f"Page {page_num + 1}:\n{text}\n")
-                except Exception as e:
-                    logger.warning(f"Error extracting page {page_num + 1}: {e}")
-                    continue
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool for CPU-bound conversions, creating it lazily."""
+    global _process_pool
+    if _process_pool is None:
+        # Spawn rather than fork: the worker process already runs threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
 
-            return "\n".join(text_content)
 
-    except Exception as e:
-        logger.error(f"Failed to extract PDF text: {e}")
-        return ""
+async def _run_cpu_bound(func, *args):
+    """Run a CPU-bound conversion in the process pool, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_process_pool(), func, *args)
 
 
-async def convert_html_to_text(html_path: Path) -> str:
-    """Convert HTML file to plain text."""
-    try:
-        from bs4 import BeautifulSoup
+def _class_xpath(class_name: str) -> str:
+    """XPath for the first element carrying ``class_name`` (like ``.name`` in CSS)."""
+    return f"(//*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')])[1]"
+
+
+# Elements whose content is never part of a page's readable text
+_NON_TEXT_TAGS = frozenset({"script", "style", "noscript"})
+
+# One converter per process; markdownify caches its tag handlers per instance
+_MARKDOWN_CONVERTER = MarkdownConverter(heading_style="ATX", bullets="-")
+
+# A run of blank (or whitespace-only) lines in generated Markdown
+_MARKDOWN_BLANK_LINES = re.compile(r"\n(?:[ \t]*\n)+")
+
+# Where a blog page keeps its post, most specific first
+_MAIN_CONTENT_XPATHS = (
+    "(//article)[1]",
+    _class_xpath("post-content"),
+    _class_xpath("entry-content"),
+    _class_xpath("content"),
+    "(//main)[1]",
+    _class_xpath("blog-post"),
+    "(//body)[1]",
+)
+
+
+def _html_to_markdown(html_content: Union[str, bytes]) -> str:
+    """
+    Convert HTML content to Markdown (blocking; runs in the process pool).
+
+    The page is parsed with lxml only to find the main content; just that
+    subtree is serialised for markdownify, so navigation and other page
+    chrome never become BeautifulSoup objects.
+    """
+    if isinstance(html_content, str):
+        html_content = html_content.encode("utf-8")
+
+    # Parse HTML (pages are UTF-8 even when they do not declare a charset)
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    tree = lxml.html.document_fromstring(html_content, parser=parser)
+
+    # Extract main content
+    main_content = None
+    for xpath in _MAIN_CONTENT_XPATHS:
+        matches = tree.xpath(xpath)
+        if matches:
+            main_content = matches[0]
+            break
+
+    if main_content is not None:
+        # Drop scripts and styles in C so markdownify never has to parse them
+        etree.strip_elements(main_content, *_NON_TEXT_TAGS, with_tail=False)
+
+        # Convert to markdown
+        markdown_content = _MARKDOWN_CONVERTER.convert(
+            lxml.html.tostring(main_content, encoding="unicode", with_tail=False)
+        )
+
+        # Collapse runs of blank lines, keeping code and list indentation
+        return _MARKDOWN_BLANK_LINES.sub("\n\n", markdown_content).strip()
+
+    return ""
+
+
+def _pdf_page_count(pdf_content: bytes) -> int:
+    """Count a PDF's pages without extracting any text (blocking)."""
+    return len(PdfReader(io.BytesIO(pdf_content)).pages)
+
 
-        with open(html_path, "r", encoding="utf-8") as f:
-            html_content = f.read()
+def _pdf_to_text(pdf_content: bytes, start: int = 0, stop: Optional[int] = None) -> str:
+    """
+    Extract text from pages ``[start, stop)`` of a PDF (blocking; runs in the
+    process pool).
+    """
+    reader = PdfReader(io.BytesIO(pdf_content))
+    page_count = len(reader.pages)
+    text_content = []
+
+    for page_num in range(start, min(stop or page_count, page_count)):
+        try:
+            text = reader.pages[page_num].extract_text()
+            if text.strip():
+                text_content.append(f"Page {page_num + 1}:\n{text}\n")
+        except Exception as e:
+            logger.warning(f"Error extracting page {page_num + 1}: {e}")
+            continue
+
+    return "\n".join(text_content)
+
+
+# Bytes read from an HTML file per parser feed
+_HTML_READ_CHUNK_SIZE = 64 * 1024
+
+
+def _html_to_text(html: Union[Path, bytes]) -> str:
+    """
+    Convert an HTML file or document to plain text (blocking; runs in the
+    process pool).
+
+    The page is stream-parsed and each node is discarded once its text has
+    been emitted, so memory stays proportional to the nesting depth rather
+    than the size of the document.
+    """
+    lines: List[str] = []
+    # Open script/style/noscript elements enclosing the current position
+    skip_depth = 0
+    # Open elements, each with whether its leading .text was emitted yet
+    open_elements: List[list] = []
+
+    def emit(text: Optional[str]) -> None:
+        if text and not skip_depth:
+            # Drop blank lines and surrounding whitespace
+            lines.extend(line.strip() for line in text.splitlines() if line.strip())
+
+    def handle(event: str, elem: etree._Element) -> None:
+        nonlocal skip_depth
+        if event == "start":
+            if open_elements:
+                parent, text_emitted = open_elements[-1]
+                if not text_emitted:
+                    emit(parent.text)
+                    open_elements[-1][1] = True
+                # Earlier siblings are finished; emit their tails and drop them
+                for sibling in list(parent):
+                    if sibling is elem:
+                        break
+                    emit(sibling.tail)
+                    parent.remove(sibling)
+            open_elements.append([elem, False])
+            if elem.tag in _NON_TEXT_TAGS:
+                skip_depth += 1
+        else:
+            _, text_emitted = open_elements.pop()
+            if not text_emitted:
+                emit(elem.text)
+            for child in elem:
+                emit(child.tail)
+            del elem[:]
+            if elem.tag in _NON_TEXT_TAGS:
+                skip_depth -= 1
+
+    # Pages are stored as UTF-8; without this libxml2 assumes Latin-1 for
+    # documents that do not declare a charset. huge_tree lifts libxml2's
+    # nesting and text-node limits, past which it silently drops content.
+    parser = etree.HTMLPullParser(
+        events=("start", "end"), encoding="utf-8", huge_tree=True
+    )
+    if isinstance(html, bytes):
+        source = io.BytesIO(html)
+    else:
+        source = open(html, "rb", buffering=_HTML_READ_CHUNK_SIZE)
+    with source as f:
+        while chunk := f.read(_HTML_READ_CHUNK_SIZE):
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                handle(event, elem)
+    parser.close()
+    for event, elem in parser.read_events():
+        handle(event, elem)
+
+    return "\n".join(lines)
+
+
+async def convert_html_to_markdown(html_content: Union[str, bytes]) -> str:
+    """Convert HTML content to Markdown format."""
+    try:
+        return await _run_cpu_bound(_html_to_markdown, html_content)
+    except Exception as e:
+        logger.error(f"Failed to convert HTML to Markdown: {e}")
+        return ""
 
-        soup = BeautifulSoup(html_content, "html.parser")
 
-        # Remove script/style tags
-        for tag in soup(["script", "style", "noscript"]):
-            tag.decompose()
+async def extract_pdf_text(pdf_content: bytes) -> str:
+    """
+    Extract text from PDF content.
 
-        text = soup.get_text(separator="\n")
-        # Collapse multiple blank lines
-        lines = [line.strip() for line in text.splitlines()]
-        text_clean = "\n".join([line for line in lines if line])
+    Documents of at least ``_PDF_SHARD_MIN_PAGES`` pages and at most
+    ``_PDF_SHARD_MAX_BYTES`` are split into shards of ``_PDF_PAGES_PER_SHARD``
+    pages that all start together across the process pool; everything else
+    is extracted in a single task.
+    """
+    try:
+        page_count = 0
+        if len(pdf_content) <= _PDF_SHARD_MAX_BYTES:
+            # Counting pages only walks the page tree, so it stays in-process
+            page_count = await asyncio.to_thread(_pdf_page_count, pdf_content)
+
+        if page_count < _PDF_SHARD_MIN_PAGES:
+            return await _run_cpu_bound(_pdf_to_text, pdf_content)
+
+        shards = await asyncio.gather(
+            *(
+                _run_cpu_bound(
+                    _pdf_to_text, pdf_content, start, start + _PDF_PAGES_PER_SHARD
+                )
+                for start in range(0, page_count, _PDF_PAGES_PER_SHARD)
+            )
+        )
+        return "\n".join(text for text in shards if text)
+    except Exception as e:
+        logger.error(f"Failed to extract PDF text: {e}")
+        return ""
 
-        return text_clean
 
+async def convert_html_to_text(html: Union[Path, bytes]) -> str:
+    """Convert an HTML file, or HTML already in memory, to plain text."""
+    try:
+        return await _run_cpu_bound(_html_to_text, html)
     except Exception as e:
         logger.error(f"Failed to convert HTML to text: {e}")
         return ""
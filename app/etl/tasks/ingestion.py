@@ -10,33 +10,161 @@ This module provides Docket tasks for content ingestion, including:
 All tasks are designed to be run asynchronously via Docket workers.
 """
 
+import asyncio
+import functools
 import importlib.util
 import logging
+import os
+import re
 import shutil
 import tempfile
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import aiofiles
+import aiohttp
 import git
 
+from app.etl.ingestion_queries import source_date_to_epoch
 from app.etl.ledger_manager import get_etl_ledger_manager
 from app.utilities.database import get_tracking_index
+from app.utilities.environment import get_env_var
 from app.utilities.s3_utils import S3_REGION, get_s3_bucket_name
 
 logger = logging.getLogger(__name__)
 
+# Bytes buffered per read while streaming a download to disk
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# A run of blank (or whitespace-only) lines in generated Markdown
+_MARKDOWN_BLANK_LINES = re.compile(r"\n(?:[ \t]*\n)+")
+
+# Date folder of a processed content key, e.g. processed/blog_text/2025-09-10/
+_S3_DATE_RE = re.compile(r"/processed/[^/]+/(\d{4}-\d{2}-\d{2})/")
+
+# Ledger items the ingestion pipeline processes at once, across all kinds
+INGESTION_CONCURRENCY = int(get_env_var("INGESTION_CONCURRENCY", "8"))
+
+# Connections the pipeline's shared HTTP session keeps open
+_HTTP_CONNECTION_LIMIT = 16
+_HTTP_CONNECTION_LIMIT_PER_HOST = 8
+
+
+# Only the current tree goes into the PDF, so skip history, other branches
+# and tags when cloning
+_CLONE_OPTIONS = ["--depth=1", "--single-branch", "--no-tags"]
+
+# Directories left out of a repository PDF (hidden entries are skipped too)
+_SKIP_DIRS = frozenset({"__pycache__", "node_modules", ".git"})
+
+# Top-level files whose content is included in a repository PDF, besides READMEs
+_KEY_FILE_SUFFIXES = (".md", ".py", ".js", ".ts", ".yaml", ".yml", ".json")
+
+# Characters of each key file's content shown in a repository PDF
+_KEY_FILE_MAX_CHARS = 5000
+
+# Entries per paragraph of a repository PDF's structure listing
+_STRUCTURE_LINES_PER_PARAGRAPH = 500
+
+# Checked once: without reportlab, repositories are written out as Markdown
+_HAS_REPORTLAB = importlib.util.find_spec("reportlab") is not None
+
+
+def _sorted_entries(directory: str) -> List[os.DirEntry]:
+    """List the entries of ``directory`` worth showing, sorted by name."""
+    with os.scandir(directory) as it:
+        entries = [
+            entry
+            for entry in it
+            if not entry.name.startswith(".") and entry.name not in _SKIP_DIRS
+        ]
+    entries.sort(key=lambda entry: entry.name)
+    return entries
+
+
+def _walk_repo(repo_path: Path) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Walk a repository depth-first in sorted order.
+
+    Each directory is read with a single os.scandir call, whose entries carry
+    their names and file types, so nothing is stat'ed or listed twice.
+    Symlinked directories are listed but not descended into.
+
+    Yields:
+        (path relative to repo_path, directory entry) pairs, each directory
+        before its contents
+    """
+    root_len = len(str(repo_path)) + 1
+    stack = [iter(_sorted_entries(str(repo_path)))]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        yield entry.path[root_len:], entry
+        if entry.is_dir(follow_symlinks=False):
+            stack.append(iter(_sorted_entries(entry.path)))
+
+
+def _is_key_file(relative_path: str, entry: os.DirEntry) -> bool:
+    """Whether a walked entry is a top-level file whose content goes in the PDF."""
+    return (
+        os.sep not in relative_path
+        and entry.is_file()
+        and (entry.name.startswith("README") or entry.name.endswith(_KEY_FILE_SUFFIXES))
+    )
+
+
+def _escape_markup(text: str) -> str:
+    """Escape text for reportlab's paragraph markup."""
+    # Chained str.replace beats str.translate here: replacements longer than
+    # one character push translate onto its slow per-character path
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
 
 # Simple repo_to_pdf implementation
+def _repo_to_markdown(repo_path: Path, pdf_path: Path) -> None:
+    """Write the repository structure as Markdown at ``pdf_path``."""
+    markdown_path = pdf_path.with_suffix(".md")
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(f"# Repository: {repo_path.name}\n\n")
+        f.write("## Repository Structure\n\n")
+
+        for relative_path, entry in _walk_repo(repo_path):
+            if entry.is_file():
+                f.write(f"- 📄 {relative_path}\n")
+            elif entry.is_dir():
+                f.write(f"- 📁 {relative_path}/\n")
+
+    # Try to rename markdown to PDF (some systems can handle this)
+    try:
+        markdown_path.rename(pdf_path)
+        logger.info(f"Created markdown file as PDF fallback: {repo_path.name}")
+    except Exception:
+        # Create empty PDF file as last resort
+        pdf_path.touch()
+        logger.warning(
+            f"Created empty PDF placeholder for repository: {repo_path.name}"
+        )
+
+
 def repo_to_pdf(repo_path: Path, pdf_path: Path) -> None:
     """
     Convert a repository to PDF format.
 
     This creates a comprehensive PDF containing the repository structure
-    and content from key files (README, Python files, etc.).
+    and content from key files (README, Python files, etc.). Without
+    reportlab, a Markdown listing of the structure is written instead.
     """
     logger.info(f"Starting PDF conversion for repository: {repo_path.name}")
 
+    if not _HAS_REPORTLAB:
+        logger.error("reportlab not available")
+        _repo_to_markdown(repo_path, pdf_path)
+        return
+
     try:
         from reportlab.lib.enums import TA_LEFT
         from reportlab.lib.pagesizes import letter
@@ -65,50 +193,33 @@ def repo_to_pdf(repo_path: Path, pdf_path: Path) -> None:
         story.append(Paragraph("Repository Structure", styles["Heading2"]))
         story.append(Spacer(1, 6))
 
-        structure_text = ""
+        structure_lines = []
         file_count = 0
         dir_count = 0
+        # Top-level files whose content is added below, picked out in the same walk
+        key_files = []
 
-        for item in sorted(repo_path.rglob("*")):
-            # Skip hidden files and common irrelevant directories
-            if any(part.startswith(".") for part in item.parts):
-                continue
-            if any(
-                skip in str(item) for skip in ["__pycache__", "node_modules", ".git"]
-            ):
-                continue
-
-            if item.is_file():
-                relative_path = item.relative_to(repo_path)
-                structure_text += f"📄 {relative_path}<br/>"
+        for relative_path, entry in _walk_repo(repo_path):
+            if entry.is_file():
+                structure_lines.append(f"📄 {_escape_markup(relative_path)}")
                 file_count += 1
-            elif item.is_dir() and item != repo_path:
-                relative_path = item.relative_to(repo_path)
-                structure_text += f"📁 {relative_path}/<br/>"
+                if _is_key_file(relative_path, entry):
+                    key_files.append(Path(entry.path))
+            elif entry.is_dir():
+                structure_lines.append(f"📁 {_escape_markup(relative_path)}/")
                 dir_count += 1
 
-        # Add summary
-        summary_text = f"Summary: {dir_count} directories, {file_count} files<br/><br/>"
-        structure_para = Paragraph(summary_text + structure_text, styles["Normal"])
-        story.append(structure_para)
+        # Add summary, then the listing in bounded paragraphs so reportlab
+        # never has to parse one huge block of markup for a large repository
+        summary_text = f"Summary: {dir_count} directories, {file_count} files<br/>"
+        story.append(Paragraph(summary_text, styles["Normal"]))
+        for start in range(0, len(structure_lines), _STRUCTURE_LINES_PER_PARAGRAPH):
+            chunk = structure_lines[start : start + _STRUCTURE_LINES_PER_PARAGRAPH]
+            story.append(Paragraph("<br/>".join(chunk), styles["Normal"]))
         story.append(Spacer(1, 12))
 
-        # Add content from key files
-        key_files = []
-        for pattern in [
-            "README*",
-            "*.md",
-            "*.py",
-            "*.js",
-            "*.ts",
-            "*.yaml",
-            "*.yml",
-            "*.json",
-        ]:
-            key_files.extend(repo_path.glob(pattern))
-
-        # Limit to most important files
-        key_files = sorted(set(key_files))[:10]
+        # Limit to most important files (the walk is already in sorted order)
+        key_files = key_files[:10]
 
         if key_files:
             story.append(Paragraph("Key Files Content", styles["Heading2"]))
@@ -129,7 +240,10 @@ def repo_to_pdf(repo_path: Path, pdf_path: Path) -> None:
                 try:
                     relative_path = file_path.relative_to(repo_path)
                     story.append(
-                        Paragraph(f"File: {relative_path}", styles["Heading3"])
+                        Paragraph(
+                            f"File: {_escape_markup(str(relative_path))}",
+                            styles["Heading3"],
+                        )
                     )
 
                     # Read file content (limit size)
@@ -143,18 +257,19 @@ def repo_to_pdf(repo_path: Path, pdf_path: Path) -> None:
                         continue
 
                     try:
-                        content = file_path.read_text(encoding="utf-8")
+                        # Read only as far as the truncation limit; decoding
+                        # stays strict so binary files are still detected
+                        with open(file_path, "r", encoding="utf-8") as fh:
+                            content = fh.read(_KEY_FILE_MAX_CHARS + 1)
                         # Limit content length
-                        if len(content) > 5000:
-                            content = content[:5000] + "\n... [content truncated]"
+                        if len(content) > _KEY_FILE_MAX_CHARS:
+                            content = (
+                                content[:_KEY_FILE_MAX_CHARS]
+                                + "\n... [content truncated]"
+                            )
 
                         # Escape HTML characters and handle line breaks
-                        content = (
-                            content.replace("&", "&amp;")
-                            .replace("<", "&lt;")
-                            .replace(">", "&gt;")
-                        )
-                        content = content.replace("\n", "<br/>")
+                        content = _escape_markup(content).replace("\n", "<br/>")
 
                         content_para = Paragraph(content, code_style)
                         story.append(content_para)
@@ -182,41 +297,6 @@ def repo_to_pdf(repo_path: Path, pdf_path: Path) -> None:
         else:
             raise Exception("PDF file was not created or is empty")
 
-    except ImportError as e:
-        logger.error(f"reportlab not available: {e}")
-        # Create a detailed markdown file as fallback
-        markdown_path = pdf_path.with_suffix(".md")
-        with open(markdown_path, "w", encoding="utf-8") as f:
-            f.write(f"# Repository: {repo_path.name}\n\n")
-            f.write("## Repository Structure\n\n")
-
-            for item in sorted(repo_path.rglob("*")):
-                if any(part.startswith(".") for part in item.parts):
-                    continue
-                if any(
-                    skip in str(item)
-                    for skip in ["__pycache__", "node_modules", ".git"]
-                ):
-                    continue
-
-                if item.is_file():
-                    relative_path = item.relative_to(repo_path)
-                    f.write(f"- 📄 {relative_path}\n")
-                elif item.is_dir() and item != repo_path:
-                    relative_path = item.relative_to(repo_path)
-                    f.write(f"- 📁 {relative_path}/\n")
-
-        # Try to rename markdown to PDF (some systems can handle this)
-        try:
-            markdown_path.rename(pdf_path)
-            logger.info(f"Created markdown file as PDF fallback: {repo_path.name}")
-        except Exception:
-            # Create empty PDF file as last resort
-            pdf_path.touch()
-            logger.warning(
-                f"Created empty PDF placeholder for repository: {repo_path.name}"
-            )
-
     except Exception as e:
         logger.error(f"Failed to create PDF for repository {repo_path.name}: {e}")
         # Create a minimal valid PDF as fallback
@@ -230,7 +310,8 @@ def repo_to_pdf(repo_path: Path, pdf_path: Path) -> None:
             story = [
                 Paragraph(f"Repository: {repo_path.name}", styles["Title"]),
                 Paragraph(
-                    f"Error occurred during PDF generation: {str(e)}", styles["Normal"]
+                    f"Error occurred during PDF generation: {_escape_markup(str(e))}",
+                    styles["Normal"],
                 ),
             ]
             doc.build(story)
@@ -243,6 +324,76 @@ def repo_to_pdf(repo_path: Path, pdf_path: Path) -> None:
             pdf_path.touch()
 
 
+def _blog_to_markdown(blog_path: Path, markdown_path: Path) -> None:
+    """Convert a downloaded blog page to a Markdown file (blocking)."""
+    from bs4 import BeautifulSoup
+    from markdownify import markdownify
+
+    # Read HTML content
+    with open(blog_path, "r", encoding="utf-8") as f:
+        html_content = f.read()
+
+    # Parse HTML with libxml2 rather than the pure-Python parser
+    soup = BeautifulSoup(html_content, "lxml")
+
+    # Extract main content (try common selectors)
+    content_selectors = [
+        "article",
+        ".post-content",
+        ".entry-content",
+        ".content",
+        "main",
+        ".blog-post",
+    ]
+
+    main_content = None
+    for selector in content_selectors:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+
+    if not main_content:
+        main_content = soup.find("body")
+
+    if main_content:
+        # Convert to markdown while preserving structure
+        markdown_content = markdownify(
+            str(main_content), heading_style="ATX", bullets="-"
+        )
+
+        # Collapse runs of blank lines, keeping code and list indentation
+        final_content = _MARKDOWN_BLANK_LINES.sub("\n\n", markdown_content).strip()
+
+        # Write markdown file
+        with open(markdown_path, "w", encoding="utf-8") as f:
+            f.write(final_content)
+    else:
+        raise Exception("Could not extract main content from HTML")
+
+
+# Building an exporter loads its templates, so one is shared by every notebook
+@functools.lru_cache(maxsize=1)
+def _markdown_exporter():
+    from nbconvert import MarkdownExporter
+
+    return MarkdownExporter()
+
+
+def _notebook_to_markdown(notebook_bytes: bytes, markdown_path: Path) -> None:
+    """Convert downloaded Jupyter notebook JSON to a Markdown file (blocking)."""
+    import nbformat
+
+    # Parse the notebook
+    notebook = nbformat.reads(notebook_bytes.decode("utf-8"), as_version=4)
+
+    # Convert to markdown
+    (markdown_content, resources) = _markdown_exporter().from_notebook_node(notebook)
+
+    # Write markdown file
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(markdown_content)
+
+
 async def get_storage_manager(bucket_name: str = None):
     """
     Get S3 storage manager instance.
@@ -258,6 +409,19 @@ async def get_storage_manager(bucket_name: str = None):
     return get_content_storage_manager(bucket_name)
 
 
+def _extract_s3_date(s3_url: str) -> Optional[str]:
+    """
+    Extract the processing date from a processed content S3 URL.
+
+    e.g. s3://bucket/processed/blog_text/2025-09-10/filename.md -> 2025-09-10
+
+    Returns:
+        The YYYY-MM-DD date, or None if the URL does not carry one
+    """
+    match = _S3_DATE_RE.search(s3_url)
+    return match.group(1) if match else None
+
+
 async def update_tracking_index(
     content_name: str, content_type: str, s3_url: str
 ) -> bool:
@@ -279,67 +443,57 @@ async def update_tracking_index(
         current_date = datetime.now(timezone.utc)
         current_timestamp = int(current_date.timestamp())
 
-        # Get existing record and update it
         key = f"knowledge_tracking:{content_name}"
-        existing_record = await redis_client.json().get(key)
-
-        if existing_record:
-            # Extract date from S3 URL path (e.g., s3://bucket/processed/blog_text/2025-09-10/filename.md)
-            s3_date = None
-            try:
-                # Parse S3 URL to extract date from path
-                if "processed/" in s3_url:
-                    path_parts = s3_url.split("processed/")[1].split("/")
-                    if len(path_parts) >= 2:
-                        s3_date = path_parts[1]  # Should be YYYY-MM-DD format
-            except Exception as e:
-                logger.warning(f"Failed to extract date from S3 URL {s3_url}: {e}")
-
-            # Update existing record with S3 URL and ingested status
-            existing_record["bucket_url"] = s3_url
-            existing_record["processing_status"] = "ingested"
-            existing_record["updated_date"] = current_date.strftime("%Y-%m-%d")
-            existing_record["updated_ts"] = current_timestamp
-
-            # Update source_date to match the actual S3 processing date
-            if s3_date:
-                existing_record["source_date"] = s3_date
-                logger.info(f"Updated source_date to {s3_date} for {content_name}")
 
-            await redis_client.json().set(key, "$", existing_record)
-            logger.info(f"Updated tracking index for {content_name} - status: ingested")
-        else:
-            # Extract date from S3 URL path for new record
-            s3_date = None
-            try:
-                # Parse S3 URL to extract date from path
-                if "processed/" in s3_url:
-                    path_parts = s3_url.split("processed/")[1].split("/")
-                    if len(path_parts) >= 2:
-                        s3_date = path_parts[1]  # Should be YYYY-MM-DD format
-            except Exception as e:
-                logger.warning(f"Failed to extract date from S3 URL {s3_url}: {e}")
-
-            # Create new record if it doesn't exist
-            tracking_record = {
-                "name": content_name,
-                "content_type": content_type,
-                "content_url": "",  # Will be filled from original record
-                "archive": False,
-                "source_date": s3_date or current_date.strftime("%Y-%m-%d"),
-                "updated_date": current_date.strftime("%Y-%m-%d"),
-                "updated_ts": current_timestamp,
-                "bucket_url": s3_url,
-                "processing_status": "ingested",
-                "last_processing_attempt": current_timestamp,
-                "failure_reason": "",
-                "retry_count": 0,
-            }
+        s3_date = _extract_s3_date(s3_url)
+
+        # Full record, used only if the content is not tracked yet
+        source_date = s3_date or current_date.strftime("%Y-%m-%d")
+        tracking_record = {
+            "name": content_name,
+            "content_type": content_type,
+            "content_url": "",  # Will be filled from original record
+            "archive": False,
+            "source_date": source_date,
+            "source_date_epoch": source_date_to_epoch(source_date),
+            "updated_date": current_date.strftime("%Y-%m-%d"),
+            "updated_ts": current_timestamp,
+            "bucket_url": s3_url,
+            "processing_status": "ingested",
+            "last_processing_attempt": current_timestamp,
+            "failure_reason": "",
+            "retry_count": 0,
+        }
 
-            await redis_client.json().set(key, "$", tracking_record)
+        # Fields set on an existing record: S3 URL and ingested status, and
+        # source_date to match the actual S3 processing date
+        updates = {
+            "bucket_url": s3_url,
+            "processing_status": "ingested",
+            "updated_date": current_date.strftime("%Y-%m-%d"),
+            "updated_ts": current_timestamp,
+        }
+        if s3_date:
+            updates["source_date"] = s3_date
+            updates["source_date_epoch"] = source_date_to_epoch(s3_date)
+
+        # Create the record if it is missing (NX), then write just the
+        # changed fields, all in one MULTI/EXEC round trip with no read
+        pipe = redis_client.pipeline(transaction=True)
+        json_pipe = pipe.json()
+        json_pipe.set(key, "$", tracking_record, nx=True)
+        for field, value in updates.items():
+            json_pipe.set(key, f"$.{field}", value)
+        created, *_ = await pipe.execute()
+
+        if created:
             logger.info(
                 f"Created new tracking record for {content_name} - status: ingested"
             )
+        else:
+            if s3_date:
+                logger.info(f"Updated source_date to {s3_date} for {content_name}")
+            logger.info(f"Updated tracking index for {content_name} - status: ingested")
 
         return True
 
@@ -375,7 +529,9 @@ async def process_repository(
         repo_path = Path(temp_dir) / repo_name
 
         logger.info(f"Cloning repository: {repo_name}")
-        git.Repo.clone_from(github_url, repo_path)
+        await asyncio.to_thread(
+            git.Repo.clone_from, github_url, repo_path, multi_options=_CLONE_OPTIONS
+        )
         logger.info(f"Successfully cloned {repo_name}")
 
         # Step 2: Convert to PDF
@@ -383,7 +539,7 @@ async def process_repository(
         pdf_path = repo_path.parent / pdf_filename
 
         logger.info(f"Converting repository to PDF: {repo_name}")
-        repo_to_pdf(repo_path, pdf_path)
+        await asyncio.to_thread(repo_to_pdf, repo_path, pdf_path)
         logger.info(f"Successfully created PDF: {pdf_filename}")
 
         # Step 3: Upload to S3
@@ -423,9 +579,17 @@ async def process_repository(
             logger.info(f"Cleaned up temporary directory: {temp_dir}")
 
 
+def _http_session(session: Optional[aiohttp.ClientSession]):
+    """Use ``session`` without closing it, or open a new session for one call."""
+    if session is not None:
+        return nullcontext(session)
+    return aiohttp.ClientSession()
+
+
 async def process_blog(
     blog_name: str,
     blog_url: str,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> Dict[str, Any]:
     """
     Process a single blog: download HTML, convert to markdown, upload to S3.
@@ -433,6 +597,7 @@ async def process_blog(
     Args:
         blog_name: Name of the blog
         blog_url: URL of the blog
+        session: HTTP session to download with (a new one is opened if omitted)
 
     Returns:
         Dictionary with processing results
@@ -450,16 +615,18 @@ async def process_blog(
         blog_path = Path(temp_dir) / f"{blog_name}.html"
 
         logger.info(f"Downloading blog: {blog_name}")
-        import aiohttp
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(blog_url) as response:
+        async with _http_session(session) as http:
+            async with http.get(blog_url) as response:
                 if response.status != 200:
                     raise Exception(f"Failed to download blog: HTTP {response.status}")
 
-                content = await response.read()
-                with open(blog_path, "wb") as f:
-                    f.write(content)
+                # Disk writes go through aiofiles so other items keep
+                # downloading while this one writes
+                async with aiofiles.open(blog_path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(
+                        _DOWNLOAD_CHUNK_SIZE
+                    ):
+                        await f.write(chunk)
 
         logger.info(f"Successfully downloaded blog: {blog_name}")
 
@@ -469,59 +636,9 @@ async def process_blog(
 
         logger.info(f"Converting blog to markdown: {blog_name}")
         try:
-            from bs4 import BeautifulSoup
-            from markdownify import markdownify
-
-            # Read HTML content
-            with open(blog_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
-
-            # Parse HTML
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            # Extract main content (try common selectors)
-            content_selectors = [
-                "article",
-                ".post-content",
-                ".entry-content",
-                ".content",
-                "main",
-                ".blog-post",
-            ]
-
-            main_content = None
-            for selector in content_selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-
-            if not main_content:
-                main_content = soup.find("body")
-
-            if main_content:
-                # Convert to markdown while preserving structure
-                markdown_content = markdownify(
-                    str(main_content), heading_style="ATX", bullets="-"
-                )
-
-                # Clean up the markdown
-                # Remove excessive whitespace
-                lines = [line.strip() for line in markdown_content.split("\n")]
-                cleaned_lines = []
-
-                for line in lines:
-                    if line or (cleaned_lines and cleaned_lines[-1]):
-                        cleaned_lines.append(line)
-
-                final_content = "\n".join(cleaned_lines)
-
-                # Write markdown file
-                with open(markdown_path, "w", encoding="utf-8") as f:
-                    f.write(final_content)
-
-                logger.info(f"Successfully created markdown: {markdown_filename}")
-            else:
-                raise Exception("Could not extract main content from HTML")
+            # Parsing and conversion are CPU-bound; keep them off the event loop
+            await asyncio.to_thread(_blog_to_markdown, blog_path, markdown_path)
+            logger.info(f"Successfully created markdown: {markdown_filename}")
 
         except ImportError as e:
             logger.error(f"Required packages not available: {e}")
@@ -578,6 +695,7 @@ async def process_blog(
 async def process_notebook(
     notebook_name: str,
     github_url: str,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> Dict[str, Any]:
     """
     Process a single notebook: download, convert to markdown, upload to S3.
@@ -585,6 +703,7 @@ async def process_notebook(
     Args:
         notebook_name: Name of the notebook
         github_url: GitHub URL of the notebook
+        session: HTTP session to download with (a new one is opened if omitted)
 
     Returns:
         Dictionary with processing results
@@ -597,55 +716,38 @@ async def process_notebook(
         # Get S3 bucket name
         bucket_name = get_s3_bucket_name()
 
-        # Step 1: Download notebook file directly
+        # Step 1: Download notebook JSON; it is parsed from memory, so only
+        # the markdown output touches disk
         temp_dir = tempfile.mkdtemp(prefix=f"notebook_{notebook_name}_")
-        notebook_path = Path(temp_dir) / f"{notebook_name}.ipynb"
 
         logger.info(f"Downloading notebook: {notebook_name}")
-        import aiohttp
 
         # Convert GitHub blob URL to raw URL
         raw_url = github_url.replace("github.com", "raw.githubusercontent.com").replace(
             "/blob/", "/"
         )
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(raw_url) as response:
+        async with _http_session(session) as http:
+            async with http.get(raw_url) as response:
                 if response.status != 200:
                     raise Exception(
                         f"Failed to download notebook: HTTP {response.status}"
                     )
 
-                content = await response.read()
-                with open(notebook_path, "wb") as f:
-                    f.write(content)
+                notebook_bytes = await response.read()
 
         logger.info(f"Successfully downloaded notebook: {notebook_name}")
 
         # Step 2: Convert Jupyter notebook to markdown
         markdown_filename = f"{notebook_name}.md"
-        markdown_path = notebook_path.parent / markdown_filename
+        markdown_path = Path(temp_dir) / markdown_filename
 
         logger.info(f"Converting notebook to markdown: {notebook_name}")
         try:
-            import nbformat
-            from nbconvert import MarkdownExporter
-
-            # Read the notebook
-            with open(notebook_path, "r", encoding="utf-8") as f:
-                notebook_content = f.read()
-
-            # Parse the notebook
-            notebook = nbformat.reads(notebook_content, as_version=4)
-
-            # Convert to markdown
-            exporter = MarkdownExporter()
-            (markdown_content, resources) = exporter.from_notebook_node(notebook)
-
-            # Write markdown file
-            with open(markdown_path, "w", encoding="utf-8") as f:
-                f.write(markdown_content)
-
+            # nbconvert's export is CPU-bound; keep it off the event loop
+            await asyncio.to_thread(
+                _notebook_to_markdown, notebook_bytes, markdown_path
+            )
             logger.info(f"Successfully created markdown: {markdown_filename}")
 
         except ImportError as e:
@@ -697,7 +799,15 @@ async def process_notebook(
             logger.info(f"Cleaned up temporary directory: {temp_dir}")
 
 
-async def run_ingestion_pipeline() -> Dict[str, Any]:
+async def _bounded(semaphore: asyncio.Semaphore, coro):
+    """Await ``coro`` while holding a slot of ``semaphore``."""
+    async with semaphore:
+        return await coro
+
+
+async def run_ingestion_pipeline(
+    max_concurrent: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Run the complete ingestion pipeline.
 
@@ -707,6 +817,13 @@ async def run_ingestion_pipeline() -> Dict[str, Any]:
     3. Creates blog process tasks for each blog in the ledger
     4. Creates notebook process tasks for each notebook in the ledger
 
+    Items are independent and mostly waiting on the network, so they run
+    concurrently, with at most ``max_concurrent`` in flight at once.
+
+    Args:
+        max_concurrent: Maximum items processed at once (defaults to
+            INGESTION_CONCURRENCY)
+
     Returns:
         Dictionary with pipeline results
     """
@@ -725,35 +842,66 @@ async def run_ingestion_pipeline() -> Dict[str, Any]:
             "notebooks": [],
         }
 
-        # Process repositories
         repos = ledger.get("repos", [])
+        blogs = ledger.get("blogs", [])
+        notebooks = ledger.get("notebooks", [])
         if repos:
             logger.info(f"Processing {len(repos)} repositories")
-            for repo in repos:
-                task_result = await process_repository(
-                    repo_name=repo["name"], github_url=repo["github_url"]
-                )
-                results["repos"].append(task_result)
-
-        # Process blogs
-        blogs = ledger.get("blogs", [])
         if blogs:
             logger.info(f"Processing {len(blogs)} blogs")
-            for blog in blogs:
-                task_result = await process_blog(
-                    blog_name=blog["name"], blog_url=blog["blog_url"]
-                )
-                results["blogs"].append(task_result)
-
-        # Process notebooks
-        notebooks = ledger.get("notebooks", [])
         if notebooks:
             logger.info(f"Processing {len(notebooks)} notebooks")
-            for notebook in notebooks:
-                task_result = await process_notebook(
-                    notebook_name=notebook["name"], github_url=notebook["github_url"]
-                )
-                results["notebooks"].append(task_result)
+
+        # One semaphore bounds the items in flight across all three kinds, and
+        # blog and notebook downloads share one pooled HTTP session
+        semaphore = asyncio.Semaphore(max_concurrent or INGESTION_CONCURRENCY)
+        connector = aiohttp.TCPConnector(
+            limit=_HTTP_CONNECTION_LIMIT,
+            limit_per_host=_HTTP_CONNECTION_LIMIT_PER_HOST,
+        )
+        async with aiohttp.ClientSession(connector=connector) as session:
+            repo_results, blog_results, notebook_results = await asyncio.gather(
+                asyncio.gather(
+                    *(
+                        _bounded(
+                            semaphore,
+                            process_repository(
+                                repo_name=repo["name"], github_url=repo["github_url"]
+                            ),
+                        )
+                        for repo in repos
+                    )
+                ),
+                asyncio.gather(
+                    *(
+                        _bounded(
+                            semaphore,
+                            process_blog(
+                                blog_name=blog["name"],
+                                blog_url=blog["blog_url"],
+                                session=session,
+                            ),
+                        )
+                        for blog in blogs
+                    )
+                ),
+                asyncio.gather(
+                    *(
+                        _bounded(
+                            semaphore,
+                            process_notebook(
+                                notebook_name=notebook["name"],
+                                github_url=notebook["github_url"],
+                                session=session,
+                            ),
+                        )
+                        for notebook in notebooks
+                    )
+                ),
+            )
+        results["repos"] = repo_results
+        results["blogs"] = blog_results
+        results["notebooks"] = notebook_results
 
         # Calculate summary
         total_items = len(repos) + len(blogs) + len(notebooks)
@@ -839,6 +987,9 @@ async def extend_documentation(
                 "content_type": doc_type,
                 "content_url": doc_url,
                 "source_date": current_time.strftime("%Y-%m-%d"),
+                "source_date_epoch": source_date_to_epoch(
+                    current_time.strftime("%Y-%m-%d")
+                ),
                 "updated_date": current_time.strftime("%Y-%m-%d"),
                 "updated_ts": current_timestamp,
                 "processing_status": "processing",
@@ -11,21 +11,27 @@ This module provides Docket tasks for content vectorization, including:
 All tasks are designed to be run asynchronously via Docket workers.
 """
 
+import asyncio
+import functools
 import json
 import logging
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import boto3
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.document_loaders.parsers import PyPDFParser
+from langchain_core.documents.base import Blob
 
+from app.api.content_storage import S3_CLIENT_CONFIG, run_s3_call
+from app.etl.ingestion_queries import source_date_to_epoch
 from app.utilities.database import (
     get_document_index,
     get_vectorizer,
 )
+from app.utilities.environment import get_env_var
 from app.utilities.s3_utils import S3_REGION, get_s3_bucket_name
 
 logger = logging.getLogger(__name__)
@@ -34,6 +40,41 @@ logger = logging.getLogger(__name__)
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 
+# Chunks sent to the embedding provider per request
+EMBEDDING_BATCH_SIZE = 64
+
+# Content files the vectorization pipeline processes at once
+VECTORIZATION_CONCURRENCY = int(get_env_var("VECTORIZATION_CONCURRENCY", "8"))
+
+
+# boto3 clients are thread-safe and costly to build (credential chain,
+# endpoint resolution, connection pool), so one is shared by every S3 call
+@functools.lru_cache(maxsize=1)
+def _s3_client():
+    return boto3.client("s3", region_name=S3_REGION, config=S3_CLIENT_CONFIG)
+
+
+def _get_object_bytes(bucket_name: str, s3_key: str) -> bytes:
+    """Fetch an S3 object's content (blocking; the body is read on the same thread)."""
+    response = _s3_client().get_object(Bucket=bucket_name, Key=s3_key)
+    return response["Body"].read()
+
+
+def _list_pages(bucket_name: str, prefix: str, field: str, **kwargs) -> List[Dict]:
+    """
+    Collect ``field`` entries from every list_objects_v2 page under ``prefix``.
+
+    list_objects_v2 returns at most 1000 entries per call, so follow the
+    paginator rather than silently dropping the rest (blocking; run via
+    run_s3_call).
+    """
+    paginator = _s3_client().get_paginator("list_objects_v2")
+    return [
+        entry
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix, **kwargs)
+        for entry in page.get(field, [])
+    ]
+
 
 async def get_latest_date_folder(bucket_name: str, content_type: str) -> str:
     """
@@ -47,8 +88,6 @@ async def get_latest_date_folder(bucket_name: str, content_type: str) -> str:
         Latest date folder (YYYY-MM-DD format)
     """
     try:
-        s3_client = boto3.client("s3", region_name=S3_REGION)
-
         # List all date folders for this content type
         # Map content types to their correct S3 paths
         if content_type == "blog":
@@ -58,19 +97,18 @@ async def get_latest_date_folder(bucket_name: str, content_type: str) -> str:
         else:
             prefix = f"processed/{content_type}/"
 
-        response = s3_client.list_objects_v2(
-            Bucket=bucket_name, Prefix=prefix, Delimiter="/"
+        common_prefixes = await run_s3_call(
+            _list_pages, bucket_name, prefix, "CommonPrefixes", Delimiter="/"
         )
 
         # Extract date folders
         date_folders = []
-        if "CommonPrefixes" in response:
-            for obj in response["CommonPrefixes"]:
-                folder_path = obj["Prefix"]
-                # Extract date from path like "processed/repo/2025-09-05/"
-                date_part = folder_path.split("/")[-2]
-                if date_part and len(date_part) == 10:  # YYYY-MM-DD format
-                    date_folders.append(date_part)
+        for obj in common_prefixes:
+            folder_path = obj["Prefix"]
+            # Extract date from path like "processed/repo/2025-09-05/"
+            date_part = folder_path.split("/")[-2]
+            if date_part and len(date_part) == 10:  # YYYY-MM-DD format
+                date_folders.append(date_part)
 
         if not date_folders:
             raise ValueError(f"No date folders found for {content_type}")
@@ -103,8 +141,6 @@ async def list_content_files_in_folder(
         List of content file information
     """
     try:
-        s3_client = boto3.client("s3", region_name=S3_REGION)
-
         # Determine the correct prefix and file extension based on content type
         if content_type == "blog":
             prefix = f"processed/blog_text/{date_folder}/"
@@ -116,23 +152,22 @@ async def list_content_files_in_folder(
             prefix = f"processed/{content_type}/{date_folder}/"
             file_extension = ".pdf"
 
-        response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
+        objects = await run_s3_call(_list_pages, bucket_name, prefix, "Contents")
 
         content_files = []
-        if "Contents" in response:
-            for obj in response["Contents"]:
-                key = obj["Key"]
-                if key.endswith(file_extension):
-                    # Extract filename from path
-                    filename = Path(key).name
-                    content_files.append(
-                        {
-                            "s3_key": key,
-                            "filename": filename,
-                            "content_type": content_type,
-                            "date_folder": date_folder,
-                        }
-                    )
+        for obj in objects:
+            key = obj["Key"]
+            if key.endswith(file_extension):
+                # Extract filename from path
+                filename = Path(key).name
+                content_files.append(
+                    {
+                        "s3_key": key,
+                        "filename": filename,
+                        "content_type": content_type,
+                        "date_folder": date_folder,
+                    }
+                )
 
         logger.info(f"Found {len(content_files)} {file_extension} files in {prefix}")
         return content_files
@@ -154,7 +189,7 @@ async def download_pdf_from_s3(bucket_name: str, s3_key: str) -> Path:
         Path to downloaded PDF file
     """
     try:
-        s3_client = boto3.client("s3", region_name=S3_REGION)
+        s3_client = _s3_client()
 
         # Create temporary file
         temp_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
@@ -162,7 +197,7 @@ async def download_pdf_from_s3(bucket_name: str, s3_key: str) -> Path:
         temp_file.close()
 
         # Download file
-        s3_client.download_file(bucket_name, s3_key, str(temp_path))
+        await run_s3_call(s3_client.download_file, bucket_name, s3_key, str(temp_path))
 
         logger.info(f"Downloaded {s3_key} to {temp_path}")
         return temp_path
@@ -172,87 +207,72 @@ async def download_pdf_from_s3(bucket_name: str, s3_key: str) -> Path:
         raise
 
 
-async def download_file_from_s3(bucket_name: str, s3_key: str) -> Path:
+async def download_bytes_from_s3(bucket_name: str, s3_key: str) -> bytes:
     """
-    Download a file from S3 to a temporary location.
+    Download an S3 object into memory.
 
     Args:
         bucket_name: S3 bucket name
         s3_key: S3 object key
 
     Returns:
-        Path to the downloaded file
+        The object's content
     """
     try:
-        s3_client = boto3.client("s3", region_name=S3_REGION)
-
-        # Determine file extension from S3 key
-        file_extension = Path(s3_key).suffix
-        if not file_extension:
-            file_extension = ".txt"  # Default fallback
-
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_extension)
-        temp_path = Path(temp_file.name)
-        temp_file.close()
+        content = await run_s3_call(_get_object_bytes, bucket_name, s3_key)
 
-        # Download from S3
-        s3_client.download_file(bucket_name, s3_key, str(temp_path))
-
-        logger.info(f"Downloaded {s3_key} to {temp_path}")
-        return temp_path
+        logger.info(f"Downloaded {s3_key} ({len(content)} bytes)")
+        return content
 
     except Exception as e:
         logger.error(f"Failed to download {s3_key}: {e}")
         raise
 
 
-async def extract_text_from_pdf(pdf_path: Path) -> str:
+async def extract_text_from_pdf(pdf_bytes: bytes, filename: str) -> str:
     """
-    Extract text content from a PDF file.
+    Extract text content from a PDF held in memory.
 
     Args:
-        pdf_path: Path to PDF file
+        pdf_bytes: Content of the PDF file
+        filename: Name of the file, for logging
 
     Returns:
         Extracted text content
     """
     try:
-        loader = PyPDFLoader(str(pdf_path))
-        documents = loader.load()
+        documents = PyPDFParser().lazy_parse(Blob.from_data(pdf_bytes))
 
         # Combine all pages into single text
-        text_content = "\n".join([doc.page_content for doc in documents])
+        text_content = "\n".join(doc.page_content for doc in documents)
 
-        logger.info(f"Extracted {len(text_content)} characters from {pdf_path.name}")
+        logger.info(f"Extracted {len(text_content)} characters from {filename}")
         return text_content
 
     except Exception as e:
-        logger.error(f"Failed to extract text from {pdf_path}: {e}")
+        logger.error(f"Failed to extract text from {filename}: {e}")
         raise
 
 
-async def extract_text_from_markdown(markdown_path: Path) -> str:
+async def extract_text_from_markdown(markdown_bytes: bytes, filename: str) -> str:
     """
-    Extract text content from a markdown file.
+    Extract text content from a markdown file held in memory.
 
     Args:
-        markdown_path: Path to the markdown file
+        markdown_bytes: Content of the markdown file
+        filename: Name of the file, for logging
 
     Returns:
         Extracted text content
     """
     try:
-        with open(markdown_path, "r", encoding="utf-8") as f:
-            text_content = f.read()
+        text_content = markdown_bytes.decode("utf-8")
 
-        logger.info(
-            f"Extracted {len(text_content)} characters from {markdown_path.name}"
-        )
+        logger.info(f"Extracted {len(text_content)} characters from {filename}")
         return text_content
 
     except Exception as e:
-        logger.error(f"Failed to extract text from {markdown_path}: {e}")
+        logger.error(f"Failed to extract text from {filename}: {e}")
         raise
 
 
@@ -291,6 +311,39 @@ async def chunk_text(
         raise
 
 
+def _embed_chunks(vectorizer, chunks: List[str], filename: str) -> List[Any]:
+    """
+    Embed chunks a batch at a time.
+
+    A batch that fails is retried chunk by chunk, so one bad chunk only
+    loses its own embedding.
+
+    Returns:
+        One embedding buffer per chunk, or None where embedding failed
+    """
+    embeddings = []
+    for start in range(0, len(chunks), EMBEDDING_BATCH_SIZE):
+        batch = chunks[start : start + EMBEDDING_BATCH_SIZE]
+        try:
+            embeddings.extend(
+                vectorizer.embed_many(
+                    batch, as_buffer=True, batch_size=EMBEDDING_BATCH_SIZE
+                )
+            )
+        except Exception as e:
+            logger.warning(
+                f"Batch embedding failed for chunks {start}-{start + len(batch) - 1} "
+                f"of {filename}, embedding one by one: {e}"
+            )
+            for i, chunk_text in enumerate(batch, start):
+                try:
+                    embeddings.append(vectorizer.embed(chunk_text, as_buffer=True))
+                except Exception as e:
+                    logger.error(f"Error processing chunk {i} from {filename}: {e}")
+                    embeddings.append(None)
+    return embeddings
+
+
 async def vectorize_and_store_chunks(
     chunks: List[str], filename: str, content_type: str, date_folder: str
 ) -> int:
@@ -324,39 +377,43 @@ async def vectorize_and_store_chunks(
         current_timestamp = datetime.now(timezone.utc).timestamp()
         current_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
+        # Generate embeddings in batches rather than one request per chunk; the
+        # provider calls block, so they run off the event loop and other files
+        # keep going meanwhile
+        embeddings = await asyncio.to_thread(
+            _embed_chunks, vectorizer, chunks, filename
+        )
+
+        # Fields shared by every chunk of the file are built once
+        file_stem = Path(filename).stem
+        file_fields = {
+            "source_file": filename,
+            "type": rag_type,
+            "source_date": date_folder,  # Date when content was originally created
+            "update_date": current_date,  # Date when this chunk was processed
+            "updated_at": current_timestamp,  # Timestamp when this chunk was processed
+        }
+
         # Prepare data for Redis
         data_batch = []
         keys_batch = []
 
-        for i, chunk_text in enumerate(chunks):
-            try:
-                # Generate embedding
-                embedding = vectorizer.embed(chunk_text, as_buffer=True)
-
-                # Create unique key for this chunk
-                file_stem = Path(filename).stem
-                chunk_key = f"rag_doc:{rag_type}:{file_stem}_chunk_{i}"
+        for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
+            if embedding is None:
+                continue
 
-                # Prepare data for Redis with timestamp fields
-                chunk_data = {
-                    "name": f"{file_stem}_chunk_{i}",
+            chunk_name = f"{file_stem}_chunk_{i}"
+            keys_batch.append(f"rag_doc:{rag_type}:{chunk_name}")
+            data_batch.append(
+                {
+                    "name": chunk_name,
                     "description": chunk_text,
-                    "source_file": filename,
-                    "type": rag_type,
                     "vector": embedding,
                     "chunk_index": i,
                     "start_index": i * CHUNK_SIZE,  # Approximate start index
-                    "source_date": date_folder,  # Date when content was originally created
-                    "update_date": current_date,  # Date when this chunk was processed
-                    "updated_at": current_timestamp,  # Timestamp when this chunk was processed
+                    **file_fields,
                 }
-
-                data_batch.append(chunk_data)
-                keys_batch.append(chunk_key)
-
-            except Exception as e:
-                logger.error(f"Error processing chunk {i} from {filename}: {e}")
-                continue
+            )
 
         # Store all chunks in batch
         if data_batch:
@@ -455,6 +512,7 @@ async def create_tracking_record_for_direct_upload(
             "content_url": "direct_upload",
             "archive": False,
             "source_date": date_folder,
+            "source_date_epoch": source_date_to_epoch(date_folder),
             "updated_date": current_date.strftime("%Y-%m-%d"),
             "updated_ts": current_timestamp,
             "bucket_url": f"s3://{get_s3_bucket_name()}/{s3_key}",
@@ -517,8 +575,11 @@ async def scan_s3_for_direct_uploads() -> List[Dict[str, str]]:
         List of file information for direct uploads
     """
     try:
+        from app.utilities.database import get_redis_client
+
         bucket_name = get_s3_bucket_name()
         content_files = []
+        found_files = []
 
         # Process each content type
         content_types = ["repo", "blog", "notebook"]
@@ -532,36 +593,44 @@ async def scan_s3_for_direct_uploads() -> List[Dict[str, str]]:
                 files_in_folder = await list_content_files_in_folder(
                     bucket_name, content_type, latest_date
                 )
-
-                for file_info in files_in_folder:
-                    filename = file_info["filename"]
-                    content_name = Path(filename).stem
-
-                    # Check if tracking record exists
-                    from app.utilities.database import get_redis_client
-
-                    redis_client = get_redis_client()
-                    key = f"knowledge_tracking:{content_name}"
-                    existing_record = await redis_client.json().get(key)
-
-                    if not existing_record:
-                        # Create tracking record for direct upload
-                        await create_tracking_record_for_direct_upload(
-                            filename, content_type, file_info["s3_key"], latest_date
-                        )
-                        content_files.append(file_info)
-                        logger.info(
-                            f"Created tracking record for direct upload: {filename}"
-                        )
-                    else:
-                        # Record exists, add to processing list if status is "ingested"
-                        if existing_record.get("processing_status") == "ingested":
-                            content_files.append(file_info)
+                found_files.extend(
+                    (file_info, latest_date) for file_info in files_in_folder
+                )
 
             except Exception as e:
                 logger.error(f"Failed to scan {content_type} for direct uploads: {e}")
                 continue
 
+        # Check which files already have tracking records in one round trip
+        existing_records = []
+        if found_files:
+            pipe = get_redis_client().pipeline(transaction=False)
+            json_pipe = pipe.json()
+            for file_info, _ in found_files:
+                content_name = Path(file_info["filename"]).stem
+                json_pipe.get(f"knowledge_tracking:{content_name}")
+            existing_records = await pipe.execute()
+
+        for (file_info, latest_date), existing_record in zip(
+            found_files, existing_records
+        ):
+            filename = file_info["filename"]
+
+            if not existing_record:
+                # Create tracking record for direct upload
+                await create_tracking_record_for_direct_upload(
+                    filename,
+                    file_info["content_type"],
+                    file_info["s3_key"],
+                    latest_date,
+                )
+                content_files.append(file_info)
+                logger.info(f"Created tracking record for direct upload: {filename}")
+            else:
+                # Record exists, add to processing list if status is "ingested"
+                if existing_record.get("processing_status") == "ingested":
+                    content_files.append(file_info)
+
         logger.info(f"Found {len(content_files)} files ready for vectorization")
         return content_files
 
@@ -584,7 +653,6 @@ async def process_content_file(
     Returns:
         Processing results
     """
-    temp_path = None
     content_name = None
     try:
         s3_key = file_info["s3_key"]
@@ -598,17 +666,20 @@ async def process_content_file(
         # Step 1: Update tracking index to vectorize-pending
         await update_tracking_index_status(content_name, "vectorize-pending")
 
-        # Step 2: Download file from S3
-        temp_path = await download_file_from_s3(bucket_name, s3_key)
-
-        # Step 3: Extract text based on file type
+        # Pick the extractor before downloading anything
         if filename.endswith(".md"):
-            text_content = await extract_text_from_markdown(temp_path)
+            extract_text = extract_text_from_markdown
         elif filename.endswith(".pdf"):
-            text_content = await extract_text_from_pdf(temp_path)
+            extract_text = extract_text_from_pdf
         else:
             raise Exception(f"Unsupported file type: {filename}")
 
+        # Step 2: Download file from S3 into memory
+        content = await download_bytes_from_s3(bucket_name, s3_key)
+
+        # Step 3: Extract text based on file type
+        text_content = await extract_text(content, filename)
+
         # Step 4: Chunk the text
         chunks = await chunk_text(text_content)
 
@@ -651,21 +722,43 @@ async def process_content_file(
             "filename": file_info.get("filename", "unknown"),
             "error": str(e),
         }
-    finally:
-        # Clean up temporary file
-        if temp_path and temp_path.exists():
-            temp_path.unlink()
-            logger.info(f"Cleaned up temporary file: {temp_path}")
 
 
-async def run_vectorization_pipeline() -> Dict[str, Any]:
+async def _bounded(semaphore: asyncio.Semaphore, coro):
+    """Await ``coro`` while holding a slot of ``semaphore``."""
+    async with semaphore:
+        return await coro
+
+
+def _record_failure(
+    results: Dict[str, Any], record: Dict[str, Any], error: Exception
+) -> None:
+    """Count a content record that could not be processed."""
+    logger.error(f"Failed to process content record {record.get('name')}: {error}")
+    results["failed_items"] += 1
+    results["details"].append(
+        {
+            "status": "failed",
+            "content_name": record.get("name"),
+            "error": str(error),
+        }
+    )
+
+
+async def run_vectorization_pipeline(
+    max_concurrent: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Run the complete vectorization pipeline using knowledge tracking index.
 
     This pipeline:
     1. Scans S3 bucket for direct uploads and creates tracking records
     2. Queries tracking index for content with status "ingested"
-    3. Processes each content item and updates status accordingly
+    3. Processes the content items concurrently and updates status accordingly
+
+    Args:
+        max_concurrent: Maximum files processed at once (defaults to
+            VECTORIZATION_CONCURRENCY)
 
     Returns:
         Pipeline results
@@ -711,6 +804,7 @@ async def run_vectorization_pipeline() -> Dict[str, Any]:
             f"Processing {len(content_records)} content items for vectorization"
         )
 
+        file_infos = []
         for record in content_records:
             try:
                 # Extract file information from tracking record
@@ -732,35 +826,44 @@ async def run_vectorization_pipeline() -> Dict[str, Any]:
                 content_type = record.get("content_type", "")
 
                 # Create file info for processing
-                file_info = {
-                    "s3_key": s3_key,
-                    "filename": filename,
-                    "content_type": content_type,
-                    "date_folder": record.get("source_date", ""),
-                }
+                file_infos.append(
+                    (
+                        record,
+                        {
+                            "s3_key": s3_key,
+                            "filename": filename,
+                            "content_type": content_type,
+                            "date_folder": record.get("source_date", ""),
+                        },
+                    )
+                )
 
-                # Process the content file
-                result = await process_content_file(bucket_name, file_info)
-                results["details"].append(result)
-                results["content_items_processed"] += 1
+            except Exception as e:
+                _record_failure(results, record, e)
+
+        # Files are independent and mostly waiting on S3, the embedding
+        # provider and Redis, so they run concurrently up to the limit
+        semaphore = asyncio.Semaphore(max_concurrent or VECTORIZATION_CONCURRENCY)
+        file_results = await asyncio.gather(
+            *(
+                _bounded(semaphore, process_content_file(bucket_name, file_info))
+                for _, file_info in file_infos
+            ),
+            return_exceptions=True,
+        )
 
-                if result.get("status") == "success":
-                    results["successful_items"] += 1
-                else:
-                    results["failed_items"] += 1
+        for (record, _), result in zip(file_infos, file_results):
+            if isinstance(result, Exception):
+                _record_failure(results, record, result)
+                continue
 
-            except Exception as e:
-                logger.error(
-                    f"Failed to process content record {record.get('name')}: {e}"
-                )
+            results["details"].append(result)
+            results["content_items_processed"] += 1
+
+            if result.get("status") == "success":
+                results["successful_items"] += 1
+            else:
                 results["failed_items"] += 1
-                results["details"].append(
-                    {
-                        "status": "failed",
-                        "content_name": record.get("name"),
-                        "error": str(e),
-                    }
-                )
 
         # Calculate summary
         results["summary"] = {
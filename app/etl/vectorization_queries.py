@@ -12,6 +12,7 @@ from typing import Any, Dict, List
 
 import boto3
 
+from app.etl.ingestion_queries import source_date_to_epoch
 from app.utilities.database import get_redis_client
 from app.utilities.s3_utils import S3_REGION, get_s3_bucket_name
 
@@ -185,6 +186,7 @@ async def create_tracking_record_for_direct_upload(
             "content_url": "direct_upload",
             "archive": "false",
             "source_date": date_folder,
+            "source_date_epoch": source_date_to_epoch(date_folder),
             "update_date": current_date.strftime("%Y-%m-%d"),
             "updated_at": current_timestamp,
             "bucket_url": f"s3://{get_s3_bucket_name()}/{s3_key}",
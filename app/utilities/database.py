@@ -11,6 +11,9 @@ INDEX_NAME = "rag_doc"
 ANSWER_INDEX_NAME = "answer"
 TRACKING_INDEX_NAME = "knowledge_tracking"
 
+# Default lifetime of a cached embedding that is not read again (30 days)
+EMBEDDINGS_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
 _document_index: AsyncSearchIndex | None = None
 _vectorizer: OpenAITextVectorizer | None = None
 _answer_index: AsyncSearchIndex | None = None
@@ -111,6 +114,7 @@ TRACKING_SCHEMA = {
         {"name": "content_type", "type": "text"},
         {"name": "content_url", "type": "text"},
         {"name": "source_date", "type": "tag"},
+        {"name": "source_date_epoch", "type": "numeric"},
         {"name": "update_date", "type": "tag"},
         {"name": "updated_at", "type": "numeric"},
         {"name": "bucket_url", "type": "text"},
@@ -126,8 +130,16 @@ TRACKING_SCHEMA = {
 def get_vectorizer() -> OpenAITextVectorizer:
     global _vectorizer
     if _vectorizer is None:
+        # Entries are keyed by chunk text and model, so unchanged chunks are
+        # not re-embedded on later runs. Hits refresh the TTL, so only entries
+        # unused for a whole TTL expire.
         cache = EmbeddingsCache(
-            redis_url=get_env_var("REDIS_URL", "redis://localhost:6379/0")
+            redis_url=get_env_var("REDIS_URL", "redis://localhost:6379/0"),
+            ttl=int(
+                get_env_var(
+                    "EMBEDDINGS_CACHE_TTL_SECONDS", str(EMBEDDINGS_CACHE_TTL_SECONDS)
+                )
+            ),
         )
         _vectorizer = OpenAITextVectorizer(model="text-embedding-3-small", cache=cache)
     return _vectorizer
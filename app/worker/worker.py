@@ -85,6 +85,14 @@ async def main():
     except Exception as e:
         logger.warning(f"Could not determine LLM provider/model: {e}")
 
+    # Keep the in-process ledger cache in step with writes from other processes
+    from app.etl.ledger_manager import (
+        start_invalidation_listener,
+        stop_invalidation_listener,
+    )
+
+    await start_invalidation_listener()
+
     # Tasks will be registered automatically by Worker.run() from all_tasks
 
     # Main worker loop with comprehensive error handling
@@ -154,6 +162,8 @@ async def main():
             )
             await asyncio.sleep(5)
 
+    await stop_invalidation_listener()
+
 
 if __name__ == "__main__":
     try:
@@ -2,6 +2,11 @@ import asyncio
 
 from dotenv import load_dotenv
 
+from app.etl.ingestion_queries import (
+    backfill_source_date_epoch,
+    close_pool,
+    reload_config,
+)
 from app.utilities.database import (
     get_answer_index,
     get_document_index,
@@ -25,6 +30,15 @@ async def seed():
         # Currently a no-op other than creating the index
         await index.create(overwrite=True, drop=False)
 
+    # Records written before source_date_epoch existed are invisible to the
+    # ingestion query's staleness check until they carry the field.
+    # Settings were read at import, before load_dotenv ran.
+    reload_config()
+    try:
+        await backfill_source_date_epoch()
+    finally:
+        await close_pool()
+
 
 if __name__ == "__main__":
     asyncio.run(seed())
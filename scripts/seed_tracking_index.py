@@ -44,6 +44,7 @@ def create_tracking_record(name: str, content_type: str, content_url: str) -> di
         "content_url": content_url,
         "archive": False,
         "source_date": "",
+        "source_date_epoch": 0,
         "updated_date": "",
         "updated_ts": current_timestamp,
         "bucket_url": "",
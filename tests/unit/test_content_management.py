@@ -2,11 +2,15 @@
 Unit tests for content management system components.
 """
 
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from app.api import content_storage
 from app.api.content_ledger import ContentLedgerManager, get_content_ledger_manager
 from app.api.content_storage import ContentStorageManager, get_content_storage_manager
 
@@ -48,19 +52,86 @@ class TestContentStorageManager:
         mock_file.exists.return_value = True
         mock_file.stat.return_value = Mock(st_size=1024)
 
-        # Mock async operations
-        with patch("asyncio.to_thread") as mock_to_thread:
-            # Make to_thread call the actual function
-            mock_to_thread.side_effect = lambda func, *args, **kwargs: func(
-                *args, **kwargs
-            )
+        result = await storage_manager.upload_content(
+            "test_type", "test_name", mock_file
+        )
+
+        assert result == "s3://test-bucket/test_type/test_name"
+        mock_s3_client.upload_file.assert_called_once()
+        assert (
+            mock_s3_client.upload_file.call_args.kwargs["Config"]
+            is content_storage.S3_TRANSFER_CONFIG
+        )
 
-            result = await storage_manager.upload_content(
-                "test_type", "test_name", mock_file
+    @pytest.mark.asyncio
+    async def test_download_content_uses_transfer_config(
+        self, storage_manager, mock_s3_client
+    ):
+        """Test that downloads use the shared multipart transfer settings."""
+        local_path = await storage_manager.download_content("raw", "post.html")
+
+        try:
+            assert local_path.name == "post.html"
+            mock_s3_client.download_file.assert_called_once_with(
+                "test-bucket",
+                "raw/post.html",
+                str(local_path),
+                Config=content_storage.S3_TRANSFER_CONFIG,
             )
+        finally:
+            local_path.parent.rmdir()
+
+    @pytest.mark.asyncio
+    async def test_download_content_into_dest_dir(
+        self, storage_manager, mock_s3_client, tmp_path
+    ):
+        """Test that nested content names download under the given directory."""
+        local_path = await storage_manager.download_content(
+            "raw", "repos/tool.zip", dest_dir=tmp_path
+        )
+
+        assert local_path == tmp_path / "repos" / "tool.zip"
+        assert local_path.parent.is_dir()
+        mock_s3_client.download_file.assert_called_once_with(
+            "test-bucket",
+            "raw/repos/tool.zip",
+            str(local_path),
+            Config=content_storage.S3_TRANSFER_CONFIG,
+        )
+
+    @pytest.mark.asyncio
+    async def test_cross_region_uploads_reuse_client(self, storage_manager):
+        """Test that a cross-region client is created once and then reused."""
+        mock_file = Mock(spec=Path)
+        mock_file.exists.return_value = True
+        mock_file.stat.return_value = Mock(st_size=1024)
+        regional_client = Mock()
 
-            assert result == "s3://test-bucket/test_type/test_name"
-            mock_s3_client.upload_file.assert_called_once()
+        with patch("boto3.client", return_value=regional_client) as mock_client:
+            await storage_manager.upload_file(mock_file, "one", region="eu-west-1")
+            await storage_manager.upload_file(mock_file, "two", region="eu-west-1")
+
+        mock_client.assert_called_once_with(
+            "s3", region_name="eu-west-1", config=content_storage.S3_CLIENT_CONFIG
+        )
+        assert regional_client.upload_file.call_count == 2
+
+    def test_s3_client_keeps_default_addressing_style(self):
+        """Virtual-host addressing is opt-in so dotted bucket names keep working."""
+        assert content_storage.S3_CLIENT_CONFIG.s3["addressing_style"] == "auto"
+
+    @pytest.mark.asyncio
+    async def test_s3_calls_run_on_dedicated_pool(self):
+        """Blocking S3 calls run on the S3 pool, not the default executor."""
+        thread_name = await content_storage.run_s3_call(
+            lambda: threading.current_thread().name
+        )
+
+        assert thread_name.startswith("s3")
+        assert (
+            content_storage._get_s3_executor()._max_workers
+            == content_storage.S3_CLIENT_CONFIG.max_pool_connections
+        )
 
     @pytest.mark.asyncio
     async def test_upload_content_file_not_found(self, storage_manager):
@@ -71,6 +142,41 @@ class TestContentStorageManager:
         with pytest.raises(FileNotFoundError):
             await storage_manager.upload_content("test_type", "test_name", mock_file)
 
+    @pytest.mark.asyncio
+    async def test_list_content_is_cached(self, storage_manager, mock_s3_client):
+        """Test that listings are reused until the TTL expires or content changes."""
+        mock_s3_client.list_objects_v2.return_value = {
+            "Contents": [
+                {
+                    "Key": "raw/blogs/post.html",
+                    "Size": 10,
+                    "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc),
+                }
+            ]
+        }
+        mock_s3_client.head_object.return_value = {"Metadata": {}}
+
+        first = await storage_manager.list_content()
+        second = await storage_manager.list_content()
+
+        assert first == second
+        assert first[0]["content_name"] == "blogs/post.html"
+        assert mock_s3_client.list_objects_v2.call_count == 1
+        assert mock_s3_client.head_object.call_count == 1
+
+        # Writing through the manager drops the cached listing
+        await storage_manager.delete_content("raw", "blogs/post.html")
+        await storage_manager.list_content()
+        assert mock_s3_client.list_objects_v2.call_count == 2
+
+        # So does the TTL running out
+        with patch(
+            "app.api.content_storage.time.monotonic",
+            return_value=time.monotonic() + content_storage.LIST_CACHE_TTL_SECONDS,
+        ):
+            await storage_manager.list_content()
+        assert mock_s3_client.list_objects_v2.call_count == 3
+
     def test_get_content_type(self, storage_manager):
         """Test content type detection."""
         assert storage_manager._get_content_type(Path("test.html")) == "text/html"
@@ -105,6 +211,10 @@ class TestContentLedgerManager:
         mock_client.zrange = AsyncMock()
         mock_client.zrem = AsyncMock()
         mock_client.zcard = AsyncMock()
+        mock_pipeline = Mock()
+        mock_pipeline.json = Mock()
+        mock_pipeline.execute = AsyncMock()
+        mock_client.pipeline = Mock(return_value=mock_pipeline)
         return mock_client
 
     @pytest.fixture
@@ -129,11 +239,17 @@ class TestContentLedgerManager:
     async def test_update_content_in_registry(self, ledger_manager, mock_redis_client):
         """Test updating content in registry."""
         result = await ledger_manager.update_content_in_registry(
-            "test_type", "test_name", {"status": "updated"}
+            "test_type", "test_name", {"status": "updated", "vector_count": 3}
         )
 
         assert result is True
-        mock_redis_client.json().set.assert_called()
+        # All field writes go out in a single transactional pipeline
+        mock_redis_client.pipeline.assert_called_once_with(transaction=True)
+        pipeline = mock_redis_client.pipeline.return_value
+        written = [call.args[1] for call in pipeline.json().set.call_args_list]
+        assert written == ["$.status", "$.vector_count", "$.last_updated"]
+        pipeline.execute.assert_awaited_once()
+        mock_redis_client.json().set.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_remove_content_from_registry(
@@ -167,6 +283,38 @@ class TestContentLedgerManager:
         assert isinstance(result, str)
         mock_redis_client.zadd.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_record_ingestion_uses_single_pipeline(
+        self, ledger_manager, mock_redis_client
+    ):
+        """Test that recording an ingestion is one transactional round trip."""
+        result = await ledger_manager.record_ingestion(
+            content_type="pipeline_result",
+            content_name="task_123",
+            s3_location="",
+            metadata={"status": "completed"},
+        )
+
+        assert result is True
+        mock_redis_client.pipeline.assert_called_once_with(transaction=True)
+        pipeline = mock_redis_client.pipeline.return_value
+
+        registry_key, path, content_info = pipeline.json().set.call_args.args
+        assert registry_key == "ledger:content_registry:pipeline_result:task_123"
+        assert path == "$"
+        assert content_info["status"] == "completed"
+        assert content_info["processing_status"] == "ingested"
+        pipeline.sadd.assert_called_once_with(
+            "ledger:content_registry:types:pipeline_result", "task_123"
+        )
+        pipeline.zadd.assert_called_once()
+        pipeline.execute.assert_awaited_once()
+
+        # Nothing goes to Redis outside the pipeline
+        mock_redis_client.json().set.assert_not_called()
+        mock_redis_client.sadd.assert_not_called()
+        mock_redis_client.zadd.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_get_next_processing_task(self, ledger_manager, mock_redis_client):
         """Test getting next task from queue."""
@@ -182,6 +330,13 @@ class TestContentLedgerManager:
 class TestContentManagementIntegration:
     """Integration tests for content management system."""
 
+    @pytest.fixture
+    def mock_s3_client(self):
+        """Mock S3 client."""
+        mock_client = Mock()
+        mock_client.head_bucket.return_value = None
+        return mock_client
+
     @pytest.mark.asyncio
     async def test_get_content_storage_manager(self):
         """Test getting content storage manager."""
@@ -190,6 +345,34 @@ class TestContentManagementIntegration:
         # Should return None if AWS credentials are not configured
         assert manager is None or isinstance(manager, ContentStorageManager)
 
+    def test_get_content_storage_manager_reuses_client(self, mock_s3_client):
+        """Test that managers (and their S3 clients) are cached per bucket."""
+        from app.api import content_storage
+
+        with (
+            patch.dict(content_storage._storage_managers, clear=True),
+            patch("boto3.client", return_value=mock_s3_client) as mock_client,
+        ):
+            first = get_content_storage_manager("test-bucket")
+            second = get_content_storage_manager("test-bucket")
+            other = get_content_storage_manager("other-bucket")
+
+        assert first is second
+        assert other is not first
+        assert mock_client.call_count == 2
+        assert mock_s3_client.head_bucket.call_count == 2
+
+    def test_get_content_storage_manager_does_not_cache_failures(self):
+        """Test that a failed initialization is retried on the next call."""
+        from app.api import content_storage
+
+        with (
+            patch.dict(content_storage._storage_managers, clear=True),
+            patch("boto3.client", side_effect=Exception("No credentials")),
+        ):
+            assert get_content_storage_manager("test-bucket") is None
+            assert content_storage._storage_managers == {}
+
     @pytest.mark.asyncio
     async def test_get_content_ledger_manager(self):
         """Test getting content ledger manager."""
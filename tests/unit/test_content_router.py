@@ -16,6 +16,13 @@ from app.api.routers.content import (
     run_async_ingestion_pipeline,
     run_async_vectorization_pipeline,
 )
+from app.etl.ingestion_queries import ContentRow
+
+
+async def _stream(rows):
+    """Async generator standing in for query_content_for_ingestion."""
+    for row in rows:
+        yield row
 
 
 class TestContentRouter:
@@ -43,16 +50,16 @@ class TestContentRouter:
         """Test successful async ingestion pipeline."""
         # Mock the ingestion query function to return sample content
         mock_content = [
-            {
-                "name": "test-blog",
-                "content_type": "blog",
-                "content_url": "https://example.com/blog",
-            },
-            {
-                "name": "test-notebook",
-                "content_type": "notebook",
-                "content_url": "https://github.com/user/repo/notebook.ipynb",
-            },
+            ContentRow(
+                name="test-blog",
+                content_type="blog",
+                content_url="https://example.com/blog",
+            ),
+            ContentRow(
+                name="test-notebook",
+                content_type="notebook",
+                content_url="https://github.com/user/repo/notebook.ipynb",
+            ),
         ]
 
         # Mock the Docket task queue
@@ -96,23 +103,11 @@ class TestContentRouter:
         with (
             patch(
                 "app.api.routers.content.query_content_for_ingestion",
-                return_value=mock_content,
+                return_value=_stream(mock_content),
             ) as mock_query,
             patch("app.api.routers.content.Docket", return_value=mock_docket),
-            patch("app.api.routers.content.filter_content_by_type") as mock_filter,
             patch("app.api.routers.content.logger") as mock_logger,
         ):
-            # Mock the filter function to return the expected content
-            def filter_side_effect(content, content_type):
-                filtered = [
-                    item for item in content if item["content_type"] == content_type
-                ]
-                print(
-                    f"Filtering {content_type}: {len(filtered)} items from {len(content)} total"
-                )
-                return filtered
-
-            mock_filter.side_effect = filter_side_effect
             print(f"Mock content: {mock_content}")
 
             # Capture logger calls to see what's happening
@@ -158,7 +153,8 @@ class TestContentRouter:
 
         with (
             patch(
-                "app.api.routers.content.query_content_for_ingestion", return_value=[]
+                "app.api.routers.content.query_content_for_ingestion",
+                return_value=_stream([]),
             ),
             patch("app.api.routers.content.Docket", return_value=mock_docket),
         ):
@@ -173,9 +169,16 @@ class TestContentRouter:
     @pytest.mark.asyncio
     async def test_run_async_ingestion_pipeline_error(self):
         """Test ingestion pipeline with error."""
-        with patch(
-            "app.api.routers.content.query_content_for_ingestion",
-            side_effect=Exception("Query error"),
+        mock_docket = AsyncMock()
+        mock_docket.__aenter__ = AsyncMock(return_value=mock_docket)
+        mock_docket.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch(
+                "app.api.routers.content.query_content_for_ingestion",
+                side_effect=Exception("Query error"),
+            ),
+            patch("app.api.routers.content.Docket", return_value=mock_docket),
         ):
             with pytest.raises(Exception, match="Query error"):
                 await run_async_ingestion_pipeline()
@@ -268,11 +271,11 @@ class TestContentRouter:
     async def test_ingestion_pipeline_task_queuing(self):
         """Test that ingestion tasks are properly queued with Docket."""
         mock_content = [
-            {
-                "name": "test-blog",
-                "content_type": "blog",
-                "content_url": "https://example.com/blog",
-            },
+            ContentRow(
+                name="test-blog",
+                content_type="blog",
+                content_url="https://example.com/blog",
+            ),
         ]
 
         mock_docket = AsyncMock()
@@ -295,7 +298,7 @@ class TestContentRouter:
         with (
             patch(
                 "app.api.routers.content.query_content_for_ingestion",
-                return_value=mock_content,
+                return_value=_stream(mock_content),
             ),
             patch("app.api.routers.content.Docket", return_value=mock_docket),
         ):
@@ -355,11 +358,11 @@ class TestContentRouter:
     async def test_ingestion_pipeline_result_structure(self):
         """Test that ingestion pipeline returns correct result structure."""
         mock_content = [
-            {
-                "name": "test-blog",
-                "content_type": "blog",
-                "content_url": "https://example.com/blog",
-            },
+            ContentRow(
+                name="test-blog",
+                content_type="blog",
+                content_url="https://example.com/blog",
+            ),
         ]
 
         mock_docket = AsyncMock()
@@ -378,7 +381,7 @@ class TestContentRouter:
         with (
             patch(
                 "app.api.routers.content.query_content_for_ingestion",
-                return_value=mock_content,
+                return_value=_stream(mock_content),
             ),
             patch("app.api.routers.content.Docket", return_value=mock_docket),
         ):
@@ -464,16 +467,16 @@ class TestContentRouter:
     async def test_ingestion_pipeline_task_keys(self):
         """Test that ingestion pipeline generates correct task keys."""
         mock_content = [
-            {
-                "name": "test-blog",
-                "content_type": "blog",
-                "content_url": "https://example.com/blog",
-            },
-            {
-                "name": "test-notebook",
-                "content_type": "notebook",
-                "content_url": "https://github.com/user/repo/notebook.ipynb",
-            },
+            ContentRow(
+                name="test-blog",
+                content_type="blog",
+                content_url="https://example.com/blog",
+            ),
+            ContentRow(
+                name="test-notebook",
+                content_type="notebook",
+                content_url="https://github.com/user/repo/notebook.ipynb",
+            ),
         ]
 
         mock_docket = AsyncMock()
@@ -492,7 +495,7 @@ class TestContentRouter:
         with (
             patch(
                 "app.api.routers.content.query_content_for_ingestion",
-                return_value=mock_content,
+                return_value=_stream(mock_content),
             ),
             patch("app.api.routers.content.Docket", return_value=mock_docket),
         ):
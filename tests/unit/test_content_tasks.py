@@ -0,0 +1,962 @@
+"""
+Tests for the S3 artifact processing helpers in app.etl.tasks.content_tasks.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from app.etl.tasks.content_tasks import (
+    INGESTION_INFLIGHT_KEY,
+    _download_object,
+    _html_to_markdown,
+    _html_to_text,
+    _pdf_to_text,
+    _process_concurrently,
+    _process_staged,
+    add_content_to_knowledge_base,
+    convert_html_to_markdown,
+    extract_pdf_text,
+    get_redis_url,
+    process_blog_posts_s3,
+    process_content_pipeline,
+    process_notebooks_s3,
+    process_redis_docs_s3,
+    process_repos_s3,
+    process_slides_s3,
+    run_artifact_processing_pipeline,
+    run_ingestion_pipeline_background,
+    trigger_ingestion_pipeline,
+)
+
+BLOG_HTML = "<html><body><article><h1>Title</h1><p>Body</p></article></body></html>"
+
+
+def make_pdf(pages):
+    """Build a PDF with one page per string (empty strings make blank pages)."""
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for page_text in pages:
+        if page_text:
+            pdf.drawString(72, 720, page_text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def inline_conversions():
+    """Run HTML/PDF conversions in the default thread pool, not worker processes."""
+    with patch("app.etl.tasks.content_tasks._get_process_pool", return_value=None):
+        yield
+
+
+def set_listing(manager, objects, page_size=1000):
+    """Serve ``objects`` from the list_objects_v2 paginator in S3-sized pages."""
+    pages = [
+        {"Contents": objects[i : i + page_size]}
+        for i in range(0, len(objects), page_size)
+    ]
+    manager.s3_client.get_paginator.return_value.paginate.return_value = pages
+
+
+@pytest.fixture
+def mock_storage_manager():
+    """Storage manager whose S3 client serves a few raw blog posts."""
+    manager = Mock()
+    manager.bucket_name = "test-bucket"
+    set_listing(
+        manager,
+        [
+            {"Key": "raw/blogs/one.html"},
+            {"Key": "raw/blogs/two.html"},
+            {"Key": "raw/blogs/three.html"},
+            {"Key": "raw/blogs/notes.txt"},
+        ],
+    )
+    manager.uploads = {}
+
+    def get_object(Bucket, Key):
+        return {"Body": io.BytesIO(BLOG_HTML.encode("utf-8"))}
+
+    def put_object(Bucket, Key, Body):
+        manager.uploads[Key] = Body.decode("utf-8")
+
+    manager.s3_client.get_object.side_effect = get_object
+    manager.s3_client.put_object.side_effect = put_object
+    return manager
+
+
+class TestProcessBlogPostsS3:
+    """Test blog post conversion from raw HTML to processed Markdown."""
+
+    @pytest.mark.asyncio
+    async def test_converts_each_html_post(self, mock_storage_manager):
+        """Every raw HTML post is converted and uploaded as Markdown."""
+        processed = await process_blog_posts_s3(mock_storage_manager)
+
+        assert processed == 3
+        assert set(mock_storage_manager.uploads) == {
+            "processed/blog/one.md",
+            "processed/blog/two.md",
+            "processed/blog/three.md",
+        }
+        assert "# Title" in mock_storage_manager.uploads["processed/blog/one.md"]
+
+    @pytest.mark.asyncio
+    async def test_lists_every_page(self, mock_storage_manager):
+        """Posts beyond the first 1000-key listing page are still processed."""
+        set_listing(
+            mock_storage_manager,
+            [{"Key": f"raw/blogs/post{i}.html"} for i in range(5)],
+            page_size=2,
+        )
+
+        processed = await process_blog_posts_s3(mock_storage_manager)
+
+        assert processed == 5
+        mock_storage_manager.s3_client.get_paginator.assert_called_once_with(
+            "list_objects_v2"
+        )
+        paginate = mock_storage_manager.s3_client.get_paginator.return_value.paginate
+        paginate.assert_called_once_with(Bucket="test-bucket", Prefix="raw/blogs/")
+
+    @pytest.mark.asyncio
+    async def test_failed_post_does_not_stop_others(self, mock_storage_manager):
+        """A failing download is logged and the remaining posts still run."""
+        get_object = mock_storage_manager.s3_client.get_object.side_effect
+
+        def flaky_get_object(Bucket, Key):
+            if Key.endswith("two.html"):
+                raise RuntimeError("boom")
+            return get_object(Bucket, Key)
+
+        mock_storage_manager.s3_client.get_object.side_effect = flaky_get_object
+
+        processed = await process_blog_posts_s3(mock_storage_manager)
+
+        assert processed == 2
+        assert "processed/blog/two.md" not in mock_storage_manager.uploads
+
+    @pytest.mark.asyncio
+    async def test_downloads_are_bounded_by_semaphore(self, mock_storage_manager):
+        """No more posts are in flight than the semaphore allows."""
+        get_object = mock_storage_manager.s3_client.get_object.side_effect
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def slow_get_object(Bucket, Key):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return get_object(Bucket, Key)
+
+        mock_storage_manager.s3_client.get_object.side_effect = slow_get_object
+
+        processed = await process_blog_posts_s3(
+            mock_storage_manager, semaphore=asyncio.Semaphore(2)
+        )
+
+        assert processed == 3
+        assert peak == 2
+
+
+class TestProcessSlidesS3:
+    """Test slide text extraction from raw PDFs."""
+
+    @pytest.mark.asyncio
+    async def test_extracts_text_in_memory(self, mock_storage_manager):
+        """PDF bytes go straight from get_object to the extractor and back."""
+        set_listing(
+            mock_storage_manager,
+            [
+                {"Key": "raw/slides/deck.pdf"},
+                {"Key": "raw/slides/talk.pptx"},
+                {"Key": "raw/slides/notes.txt"},
+            ],
+        )
+
+        with patch(
+            "app.etl.tasks.content_tasks.extract_pdf_text",
+            return_value="Page 1:\nHello\n",
+        ) as mock_extract:
+            processed = await process_slides_s3(mock_storage_manager)
+
+        assert processed == 2
+        mock_extract.assert_called_with(BLOG_HTML.encode("utf-8"))
+        assert mock_storage_manager.uploads == {
+            "processed/slides/deck.txt": "Page 1:\nHello\n",
+            "processed/slides/talk.txt": "Page 1:\nHello\n",
+        }
+        mock_storage_manager.s3_client.download_file.assert_not_called()
+        mock_storage_manager.s3_client.upload_file.assert_not_called()
+
+
+class TestProcessNotebooksS3:
+    """Test notebook publishing from raw/ to processed/."""
+
+    @pytest.mark.asyncio
+    async def test_copies_notebooks_server_side(self, mock_storage_manager):
+        """Notebooks are copied within the bucket without a local round trip."""
+        set_listing(
+            mock_storage_manager,
+            [{"Key": "raw/notebooks/a.ipynb"}, {"Key": "raw/notebooks/readme.md"}],
+        )
+
+        processed = await process_notebooks_s3(mock_storage_manager)
+
+        assert processed == 1
+        mock_storage_manager.s3_client.copy_object.assert_called_once_with(
+            Bucket="test-bucket",
+            CopySource={"Bucket": "test-bucket", "Key": "raw/notebooks/a.ipynb"},
+            Key="processed/notebooks/a.ipynb",
+        )
+        mock_storage_manager.s3_client.get_object.assert_not_called()
+        mock_storage_manager.s3_client.download_file.assert_not_called()
+
+
+class TestDownloadObject:
+    """Test in-memory S3 downloads."""
+
+    @pytest.mark.asyncio
+    async def test_small_object_uses_single_get(self, mock_storage_manager):
+        """Objects under the chunk size are fetched with one plain GET."""
+        data = await _download_object(mock_storage_manager, "raw/blogs/one.html", 10)
+
+        assert data == BLOG_HTML.encode("utf-8")
+        mock_storage_manager.s3_client.get_object.assert_called_once_with(
+            Bucket="test-bucket", Key="raw/blogs/one.html"
+        )
+
+    @pytest.mark.asyncio
+    async def test_large_object_is_fetched_in_ranges(self, mock_storage_manager):
+        """Large objects are split into byte ranges and reassembled in order."""
+        payload = bytes(range(256)) * 4
+
+        def ranged_get_object(Bucket, Key, Range):
+            start, end = map(int, Range.removeprefix("bytes=").split("-"))
+            return {"Body": io.BytesIO(payload[start : end + 1])}
+
+        mock_storage_manager.s3_client.get_object.side_effect = ranged_get_object
+
+        with patch("app.etl.tasks.content_tasks._RANGE_CHUNK_SIZE", 300):
+            data = await _download_object(
+                mock_storage_manager, "raw/slides/deck.pdf", len(payload)
+            )
+
+        assert data == payload
+        ranges = sorted(
+            call.kwargs["Range"]
+            for call in mock_storage_manager.s3_client.get_object.call_args_list
+        )
+        assert ranges == [
+            "bytes=0-299",
+            "bytes=300-599",
+            "bytes=600-899",
+            "bytes=900-1023",
+        ]
+
+
+class TestProcessConcurrently:
+    """Test the shared fan-out helper for S3 objects."""
+
+    @pytest.mark.asyncio
+    async def test_failures_do_not_stop_other_objects(self, caplog):
+        """A raising handler is logged and the remaining objects still run."""
+        handled = []
+
+        async def handler(obj):
+            if obj["Key"] == "bad":
+                raise ValueError("corrupt")
+            handled.append(obj["Key"])
+
+        objects = [{"Key": "a"}, {"Key": "bad"}, {"Key": "b"}]
+        processed = await _process_concurrently(objects, handler, "thing")
+
+        assert processed == 2
+        assert sorted(handled) == ["a", "b"]
+        assert "Failed to process thing bad: corrupt" in caplog.text
+
+
+class TestProcessStaged:
+    """Test overlapping of fetch, transform and store stages."""
+
+    @pytest.mark.asyncio
+    async def test_transfer_slot_is_free_during_transform(self):
+        """Another object can download while the first is being transformed."""
+        fetched = []
+        second_fetched = asyncio.Event()
+        stored = {}
+
+        async def fetch(obj):
+            fetched.append(obj["Key"])
+            if len(fetched) == 2:
+                second_fetched.set()
+            return obj["Key"].upper()
+
+        async def transform(raw):
+            # Deadlocks (and times out) if the single slot is held here
+            await asyncio.wait_for(second_fetched.wait(), timeout=1)
+            return raw + "!"
+
+        async def store(obj, transformed):
+            stored[obj["Key"]] = transformed
+
+        processed = await _process_staged(
+            [{"Key": "a"}, {"Key": "b"}],
+            fetch,
+            transform,
+            store,
+            "thing",
+            asyncio.Semaphore(1),
+        )
+
+        assert processed == 2
+        assert stored == {"a": "A!", "b": "B!"}
+
+    @pytest.mark.asyncio
+    async def test_downloads_run_ahead_of_transforms(self):
+        """Fetches continue past the transfer limit while transforms are busy."""
+        keys = [{"Key": str(i)} for i in range(4)]
+        all_fetched = asyncio.Event()
+        fetched = []
+
+        async def fetch(obj):
+            fetched.append(obj["Key"])
+            if len(fetched) == len(keys):
+                all_fetched.set()
+            return obj["Key"]
+
+        async def transform(raw):
+            # Every object is downloaded before any conversion finishes
+            await asyncio.wait_for(all_fetched.wait(), timeout=1)
+            return raw
+
+        async def store(obj, transformed):
+            pass
+
+        processed = await _process_staged(
+            keys, fetch, transform, store, "thing", asyncio.Semaphore(2)
+        )
+
+        assert processed == 4
+
+
+class TestGetRedisUrl:
+    """Test the cached Redis URL lookup."""
+
+    def test_url_is_read_once(self):
+        """The environment is only consulted until the cache is cleared."""
+        get_redis_url.cache_clear()
+        try:
+            with patch.dict(os.environ, {"REDIS_URL": "redis://first:6379/0"}):
+                assert get_redis_url() == "redis://first:6379/0"
+            with patch.dict(os.environ, {"REDIS_URL": "redis://second:6379/0"}):
+                assert get_redis_url() == "redis://first:6379/0"
+                get_redis_url.cache_clear()
+                assert get_redis_url() == "redis://second:6379/0"
+        finally:
+            get_redis_url.cache_clear()
+
+
+class TestTriggerIngestionPipeline:
+    """Test queueing of the ingestion pipeline."""
+
+    @pytest.fixture
+    def mock_docket(self):
+        """Docket whose scheduled calls are recorded rather than queued."""
+        docket = MagicMock()
+        docket.__aenter__ = AsyncMock(return_value=docket)
+        docket.__aexit__ = AsyncMock(return_value=None)
+        docket.add.return_value = AsyncMock()
+        with patch("app.etl.tasks.content_tasks.Docket", return_value=docket):
+            yield docket
+
+    @pytest.fixture
+    def inflight(self):
+        """In-flight runs (task id to slot deadline) seen by the mocked Redis."""
+        return {}
+
+    @pytest.fixture
+    def mock_redis(self, inflight):
+        """Redis client answering in-flight sorted set commands from ``inflight``."""
+
+        def pipeline(transaction=True):
+            pipe = Mock()
+            queued = []
+
+            def drop_expired(key, low, high):
+                expired = [
+                    task for task, deadline in inflight.items() if deadline <= high
+                ]
+                for task in expired:
+                    del inflight[task]
+                return len(expired)
+
+            pipe.zremrangebyscore.side_effect = lambda *args: queued.append(
+                lambda: drop_expired(*args)
+            )
+            pipe.zadd.side_effect = lambda key, mapping: queued.append(
+                lambda: inflight.update(mapping) or len(mapping)
+            )
+            pipe.zcard.side_effect = lambda key: queued.append(lambda: len(inflight))
+            pipe.execute = AsyncMock(side_effect=lambda: [op() for op in queued])
+            return pipe
+
+        client = Mock()
+        client.pipeline.side_effect = pipeline
+        client.zrem = AsyncMock(
+            side_effect=lambda key, task: int(inflight.pop(task, None) is not None)
+        )
+        with patch("app.etl.tasks.content_tasks.get_redis_client", return_value=client):
+            yield client
+
+    @pytest.mark.asyncio
+    async def test_enqueues_background_task_with_docket(
+        self, mock_docket, mock_redis, inflight
+    ):
+        """The pipeline is handed to Docket rather than run in-process."""
+        result = await trigger_ingestion_pipeline(
+            content_types=["blog"], max_concurrent=3
+        )
+
+        assert result["status"] == "accepted"
+        mock_docket.add.assert_called_once_with(
+            run_ingestion_pipeline_background, key=f"ingestion_{result['task_id']}"
+        )
+        mock_docket.add.return_value.assert_awaited_once_with(
+            task_id=result["task_id"],
+            content_types=["blog"],
+            force_refresh=False,
+            max_concurrent=3,
+        )
+        assert list(inflight) == [result["task_id"]]
+        mock_redis.zrem.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_enqueues_on_the_worker_docket(self, mock_docket, mock_redis):
+        """The task goes to the docket the worker consumes, not the default one."""
+        from app.etl.tasks import content_tasks
+
+        await trigger_ingestion_pipeline()
+
+        content_tasks.Docket.assert_called_once_with(
+            name="applied-ai-agent", url=get_redis_url()
+        )
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_too_many_runs_in_flight(
+        self, mock_docket, mock_redis, inflight
+    ):
+        """Triggers beyond MAX_INFLIGHT_INGESTIONS are refused and not queued."""
+        live = time.time() + 600
+        inflight.update({"first": live, "second": live})
+
+        with patch.dict(os.environ, {"MAX_INFLIGHT_INGESTIONS": "2"}):
+            result = await trigger_ingestion_pipeline()
+
+        assert result["status"] == "rejected"
+        mock_docket.add.assert_not_called()
+        mock_redis.zrem.assert_awaited_once_with(
+            INGESTION_INFLIGHT_KEY, result["task_id"]
+        )
+        assert set(inflight) == {"first", "second"}
+
+    @pytest.mark.asyncio
+    async def test_expired_slots_do_not_block_new_runs(
+        self, mock_docket, mock_redis, inflight
+    ):
+        """Slots of runs that never finished lapse instead of locking ingestion out."""
+        lapsed = time.time() - 1
+        inflight.update({"lost": lapsed, "crashed": lapsed})
+
+        with patch.dict(os.environ, {"MAX_INFLIGHT_INGESTIONS": "2"}):
+            result = await trigger_ingestion_pipeline()
+
+        assert result["status"] == "accepted"
+        assert list(inflight) == [result["task_id"]]
+        assert inflight[result["task_id"]] > time.time()
+
+    @pytest.mark.asyncio
+    async def test_releases_slot_when_enqueue_fails(
+        self, mock_docket, mock_redis, inflight
+    ):
+        """A failed enqueue gives its in-flight slot back."""
+        mock_docket.add.return_value.side_effect = ConnectionError("redis down")
+
+        with pytest.raises(ConnectionError):
+            await trigger_ingestion_pipeline()
+
+        assert inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_background_run_releases_slot(self, mock_redis, inflight):
+        """The worker frees its own slot even when the pipeline fails."""
+        live = time.time() + 600
+        inflight.update({"abc": live, "other": live})
+        ledger = Mock()
+        ledger.record_ingestion = AsyncMock()
+
+        with (
+            patch(
+                "app.etl.tasks.ingestion.run_ingestion_pipeline",
+                side_effect=RuntimeError("boom"),
+            ),
+            patch(
+                "app.etl.tasks.content_tasks.get_content_ledger_manager",
+                return_value=ledger,
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            await run_ingestion_pipeline_background(task_id="abc")
+
+        mock_redis.zrem.assert_awaited_once_with(INGESTION_INFLIGHT_KEY, "abc")
+        assert set(inflight) == {"other"}
+
+
+class TestRunArtifactProcessingPipeline:
+    """Test fan-out of the artifact processing pipeline."""
+
+    @pytest.fixture
+    def storage_manager(self):
+        """Storage manager with an empty bucket listing."""
+        manager = Mock()
+        manager.list_content = AsyncMock(return_value=[])
+        with patch(
+            "app.etl.tasks.content_tasks.get_content_storage_manager",
+            return_value=manager,
+        ):
+            yield manager
+
+    @pytest.mark.asyncio
+    async def test_content_types_run_concurrently(self, storage_manager):
+        """Each content type starts without waiting for the others to finish."""
+        notebooks_started = asyncio.Event()
+
+        async def process_blogs(*args, **kwargs):
+            # Deadlocks (and times out) if content types run one at a time
+            await asyncio.wait_for(notebooks_started.wait(), timeout=1)
+            return 2
+
+        async def process_notebooks(*args, **kwargs):
+            notebooks_started.set()
+            return 3
+
+        with (
+            patch(
+                "app.etl.tasks.content_tasks.process_blog_posts_s3",
+                side_effect=process_blogs,
+            ),
+            patch(
+                "app.etl.tasks.content_tasks.process_notebooks_s3",
+                side_effect=process_notebooks,
+            ),
+        ):
+            result = await run_artifact_processing_pipeline(
+                content_types=["blog", "notebooks"]
+            )
+
+        assert result["results"] == {"blog": 2, "notebooks": 3}
+        assert result["total_files_processed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_bucket_is_not_listed_without_debug_logging(self, storage_manager):
+        """Helpers list their own prefixes, so the whole bucket is not listed."""
+        with patch(
+            "app.etl.tasks.content_tasks.process_repos_s3", return_value=1
+        ) as mock_repos:
+            await run_artifact_processing_pipeline(content_types=["repos"])
+
+        storage_manager.list_content.assert_not_awaited()
+        assert mock_repos.await_args.args == (storage_manager,)
+
+    @pytest.mark.asyncio
+    async def test_content_types_share_one_semaphore(self, storage_manager):
+        """Every helper is bounded by the same max_concurrent semaphore."""
+        with (
+            patch(
+                "app.etl.tasks.content_tasks.process_blog_posts_s3", return_value=0
+            ) as mock_blog,
+            patch(
+                "app.etl.tasks.content_tasks.process_slides_s3", return_value=0
+            ) as mock_slides,
+        ):
+            await run_artifact_processing_pipeline(
+                content_types=["blog", "slides"], max_concurrent=3
+            )
+
+        semaphore = mock_blog.await_args.kwargs["semaphore"]
+        assert isinstance(semaphore, asyncio.Semaphore)
+        assert semaphore._value == 3
+        assert mock_slides.await_args.kwargs["semaphore"] is semaphore
+
+    @pytest.mark.asyncio
+    async def test_concurrency_defaults_to_configured_value(self, storage_manager):
+        """Without max_concurrent the S3_PROCESSING_CONCURRENCY setting applies."""
+        with (
+            patch("app.etl.tasks.content_tasks.S3_PROCESSING_CONCURRENCY", 7),
+            patch(
+                "app.etl.tasks.content_tasks.process_repos_s3", return_value=0
+            ) as mock_repos,
+        ):
+            await run_artifact_processing_pipeline(content_types=["repos"])
+
+        assert mock_repos.await_args.kwargs["semaphore"]._value == 7
+
+    @pytest.mark.asyncio
+    async def test_failed_content_type_is_isolated(self, storage_manager):
+        """A failing content type is reported without losing the others."""
+        with (
+            patch(
+                "app.etl.tasks.content_tasks.process_slides_s3",
+                side_effect=RuntimeError("boom"),
+            ),
+            patch("app.etl.tasks.content_tasks.process_repos_s3", return_value=4),
+        ):
+            result = await run_artifact_processing_pipeline(
+                content_types=["slides", "repos", "videos"]
+            )
+
+        assert result["status"] == "success"
+        assert result["results"] == {"slides": {"error": "boom"}, "repos": 4}
+        assert result["total_files_processed"] == 4
+
+
+class TestConversions:
+    """Test the CPU-bound conversion helpers."""
+
+    def test_html_conversion_runs_in_spawned_process(self):
+        """The conversion function can be shipped to a spawned worker process."""
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            markdown = pool.submit(_html_to_markdown, BLOG_HTML.encode()).result()
+
+        assert markdown == "# Title\n\nBody"
+
+    def test_html_to_markdown_converts_only_main_content(self):
+        """Page chrome outside the selected content is not converted."""
+        page = (
+            "<html><body><nav>Home | About</nav>"
+            '<div class="wide post-content"><h2>Post</h2><p>Text</p></div>'
+            "<main><p>Not the post</p></main></body></html>"
+        )
+
+        assert _html_to_markdown(page) == "## Post\n\nText"
+        assert _html_to_markdown("<p>Loose</p>") == "Loose"
+
+    def test_html_to_markdown_keeps_code_indentation(self):
+        """Blank lines collapse but indentation inside code blocks survives."""
+        page = (
+            "<article><p>Intro</p><p></p><p></p>"
+            "<pre><code>def f():\n    return 1</code></pre></article>"
+        )
+
+        markdown = _html_to_markdown(page)
+
+        assert "\n\n\n" not in markdown
+        assert markdown.startswith("Intro\n\n")
+        assert "    return 1" in markdown
+
+    def test_html_to_markdown_drops_scripts(self):
+        """Script, style and noscript content never reaches the Markdown."""
+        page = (
+            "<article><h2>Post</h2><script>track()</script>"
+            "<style>p {}</style><noscript>Enable JS</noscript>Text</article>"
+        )
+
+        assert _html_to_markdown(page) == "## Post\n\nText"
+
+    def test_html_to_text_drops_scripts_and_keeps_utf8(self, tmp_path):
+        """Script/style content is removed and undeclared UTF-8 decodes correctly."""
+        page = tmp_path / "page.html"
+        page.write_bytes(
+            "<html><head><style>p {}</style></head><body>"
+            "<h1>Caf\u00e9</h1><script>track()</script>after<p>Body</p>"
+            "</body></html>".encode("utf-8")
+        )
+
+        assert _html_to_text(page) == "Caf\u00e9\nafter\nBody"
+
+    def test_html_to_text_accepts_bytes(self):
+        """HTML already in memory converts the same as a file on disk."""
+        assert _html_to_text(BLOG_HTML.encode("utf-8")) == "Title\nBody"
+
+    def test_html_to_text_keeps_document_order(self, tmp_path):
+        """Text, tails and nested blocks come out in reading order."""
+        page = tmp_path / "page.html"
+        page.write_text(
+            "<html><body><div>intro<!-- note -->more"
+            "<ul><li>one <b>bold</b> end</li><li>two</li></ul>"
+            "before<noscript><p>hidden</p></noscript>outro</div></body></html>",
+            encoding="utf-8",
+        )
+
+        assert _html_to_text(page).splitlines() == [
+            "intro",
+            "more",
+            "one",
+            "bold",
+            "end",
+            "two",
+            "before",
+            "outro",
+        ]
+
+    def test_html_to_text_handles_deep_pages_across_reads(self, tmp_path):
+        """Deeply nested pages spanning many read chunks keep all their text."""
+        depth = 300
+        page = tmp_path / "page.html"
+        page.write_text(
+            "<html><body>"
+            + "<div>" * depth
+            + "deep"
+            + "</div>" * depth
+            + "<p>"
+            + "x" * (3 * 64 * 1024)
+            + "</p><p>after</p></body></html>",
+            encoding="utf-8",
+        )
+
+        assert _html_to_text(page).splitlines() == [
+            "deep",
+            "x" * (3 * 64 * 1024),
+            "after",
+        ]
+
+    def test_pdf_to_text_labels_pages_with_text(self):
+        """Each page with text is labelled; blank pages are skipped."""
+        text = _pdf_to_text(make_pdf(["First page", "", "Third page"]))
+
+        lines = [line for line in text.splitlines() if line]
+        assert lines == ["Page 1:", "First page", "Page 3:", "Third page"]
+
+    @pytest.mark.asyncio
+    async def test_long_pdfs_are_extracted_in_shards(self):
+        """Long documents are split into page ranges that start together."""
+        pdf_content = make_pdf([f"Slide {n}" for n in range(1, 8)])
+        expected = _pdf_to_text(pdf_content)
+
+        async def run_inline(func, *args):
+            return func(*args)
+
+        with (
+            patch("app.etl.tasks.content_tasks._PDF_PAGES_PER_SHARD", 3),
+            patch("app.etl.tasks.content_tasks._PDF_SHARD_MIN_PAGES", 5),
+            patch(
+                "app.etl.tasks.content_tasks._run_cpu_bound", side_effect=run_inline
+            ) as mock_run,
+        ):
+            text = await extract_pdf_text(pdf_content)
+
+        assert text == expected
+        # Page count comes from an in-process pass, so every shard is a range
+        assert [call.args[2:] for call in mock_run.call_args_list] == [
+            (0, 3),
+            (3, 6),
+            (6, 9),
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "min_pages, max_bytes",
+        [(100, 8 * 1024 * 1024), (5, 0)],
+        ids=["short document", "oversized payload"],
+    )
+    async def test_pdfs_below_shard_threshold_use_one_task(self, min_pages, max_bytes):
+        """Short or very large PDFs are extracted in a single pool task."""
+        pdf_content = make_pdf([f"Slide {n}" for n in range(1, 8)])
+
+        async def run_inline(func, *args):
+            return func(*args)
+
+        with (
+            patch("app.etl.tasks.content_tasks._PDF_PAGES_PER_SHARD", 3),
+            patch("app.etl.tasks.content_tasks._PDF_SHARD_MIN_PAGES", min_pages),
+            patch("app.etl.tasks.content_tasks._PDF_SHARD_MAX_BYTES", max_bytes),
+            patch(
+                "app.etl.tasks.content_tasks._run_cpu_bound", side_effect=run_inline
+            ) as mock_run,
+        ):
+            text = await extract_pdf_text(pdf_content)
+
+        assert text == _pdf_to_text(pdf_content)
+        assert [call.args[1:] for call in mock_run.call_args_list] == [(pdf_content,)]
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_returns_empty_content(self):
+        """A failed worker process is logged like any other conversion error."""
+        with patch(
+            "app.etl.tasks.content_tasks._run_cpu_bound",
+            side_effect=BrokenProcessPool("worker died"),
+        ):
+            assert await convert_html_to_markdown(BLOG_HTML) == ""
+
+
+class TestProcessContentPipeline:
+    """Test the single-item content pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_removes_download_directory(self, tmp_path):
+        """The downloaded file and its temp directory are removed afterwards."""
+        download_dir = tmp_path / "download"
+        download_dir.mkdir()
+        local_path = download_dir / "post.html"
+        local_path.write_text(BLOG_HTML)
+
+        storage_manager = Mock()
+        storage_manager.download_content = AsyncMock(return_value=local_path)
+        ledger_manager = Mock()
+        ledger_manager.update_content_in_registry = AsyncMock()
+
+        with (
+            patch(
+                "app.etl.tasks.content_tasks.get_content_storage_manager",
+                return_value=storage_manager,
+            ),
+            patch(
+                "app.etl.tasks.content_tasks.get_content_ledger_manager",
+                return_value=ledger_manager,
+            ),
+        ):
+            result = await process_content_pipeline(
+                "blog", "post.html", "s3://bucket/blog/post.html"
+            )
+
+        assert result["status"] == "success"
+        assert not download_dir.exists()
+
+
+class TestAddContentToKnowledgeBase:
+    """Test registering content that already lives in S3."""
+
+    @pytest.fixture
+    def managers(self):
+        """Patched storage and ledger managers."""
+        storage_manager = Mock()
+        storage_manager.content_exists = AsyncMock(return_value=True)
+        ledger_manager = Mock()
+        ledger_manager.add_content_to_registry = AsyncMock()
+        ledger_manager.add_to_processing_queue = AsyncMock(return_value="task-1")
+
+        with (
+            patch(
+                "app.etl.tasks.content_tasks.get_content_storage_manager",
+                return_value=storage_manager,
+            ),
+            patch(
+                "app.etl.tasks.content_tasks.get_content_ledger_manager",
+                return_value=ledger_manager,
+            ),
+        ):
+            yield storage_manager, ledger_manager
+
+    @pytest.mark.asyncio
+    async def test_missing_content_is_not_registered(self, managers):
+        """Content is verified in S3 before it is registered."""
+        storage_manager, ledger_manager = managers
+        storage_manager.content_exists.return_value = False
+
+        with pytest.raises(FileNotFoundError):
+            await add_content_to_knowledge_base("blog", "post", "s3://b/blog/post")
+
+        storage_manager.content_exists.assert_awaited_once_with("blog", "post")
+        ledger_manager.add_content_to_registry.assert_not_called()
+
+
+class TestProcessReposS3:
+    """Test repository archive processing."""
+
+    @pytest.mark.asyncio
+    async def test_lists_raw_repos_prefix(self, mock_storage_manager):
+        """Repos are found with a raw/repos/ prefix listing, not a bucket scan."""
+        set_listing(
+            mock_storage_manager,
+            [{"Key": "raw/repos/tool.zip"}, {"Key": "raw/repos/README.md"}],
+        )
+
+        async def download_content(content_type, content_name, dest_dir):
+            local_path = dest_dir / content_name
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            local_path.write_bytes(b"zip bytes")
+            return local_path
+
+        mock_storage_manager.download_content = AsyncMock(side_effect=download_content)
+
+        uploaded = {}
+
+        def upload_file(filename, bucket, key, Config):
+            uploaded[(bucket, key)] = Path(filename).read_bytes()
+
+        mock_storage_manager.s3_client.upload_file.side_effect = upload_file
+
+        processed = await process_repos_s3(mock_storage_manager)
+
+        assert processed == 1
+        paginate = mock_storage_manager.s3_client.get_paginator.return_value.paginate
+        paginate.assert_called_once_with(Bucket="test-bucket", Prefix="raw/repos/")
+        args, kwargs = mock_storage_manager.download_content.await_args
+        assert args == ("raw", "repos/tool.zip")
+        assert uploaded == {("test-bucket", "processed/repos/tool.pdf"): b"zip bytes"}
+        # The batch's temp directory is gone once processing finishes
+        assert not kwargs["dest_dir"].exists()
+
+    @pytest.mark.asyncio
+    async def test_temp_dir_removed_when_upload_fails(self, mock_storage_manager):
+        """A failed upload does not leave the downloaded archive behind."""
+        set_listing(mock_storage_manager, [{"Key": "raw/repos/tool.zip"}])
+
+        async def download_content(content_type, content_name, dest_dir):
+            local_path = dest_dir / content_name
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            local_path.write_bytes(b"zip bytes")
+            return local_path
+
+        mock_storage_manager.download_content = AsyncMock(side_effect=download_content)
+        mock_storage_manager.s3_client.upload_file.side_effect = Exception("S3 down")
+
+        processed = await process_repos_s3(mock_storage_manager)
+
+        assert processed == 0
+        dest_dir = mock_storage_manager.download_content.await_args.kwargs["dest_dir"]
+        assert not dest_dir.exists()
+
+
+class TestProcessRedisDocsS3:
+    """Test Redis docs conversion from raw HTML to processed text."""
+
+    @pytest.mark.asyncio
+    async def test_converts_pages_without_local_files(self, mock_storage_manager):
+        """Pages are fetched into memory, converted and uploaded as text."""
+        set_listing(
+            mock_storage_manager,
+            [{"Key": "raw/redis_docs/intro.html"}, {"Key": "raw/redis_docs/logo.png"}],
+        )
+
+        processed = await process_redis_docs_s3(mock_storage_manager)
+
+        assert processed == 1
+        assert mock_storage_manager.uploads == {
+            "processed/redis_docs/intro.txt": "Title\nBody"
+        }
+        mock_storage_manager.s3_client.get_object.assert_called_once_with(
+            Bucket="test-bucket", Key="raw/redis_docs/intro.html"
+        )
+        mock_storage_manager.download_content.assert_not_called()
+        mock_storage_manager.s3_client.upload_file.assert_not_called()
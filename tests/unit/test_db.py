@@ -176,6 +176,19 @@ class TestIndexCreation:
         )
         assert result == mock_vectorizer
 
+    @patch("app.utilities.database.OpenAITextVectorizer")
+    @patch("app.utilities.database.EmbeddingsCache")
+    def test_get_vectorizer_cache_expires_entries(
+        self, mock_cache_class, mock_vectorizer_class
+    ):
+        """The embeddings cache is created with a TTL so stale entries expire."""
+        from app.utilities.database import EMBEDDINGS_CACHE_TTL_SECONDS
+
+        with patch("app.utilities.database._vectorizer", None):
+            get_vectorizer()
+
+        assert mock_cache_class.call_args.kwargs["ttl"] == EMBEDDINGS_CACHE_TTL_SECONDS
+
     @patch("app.utilities.database.get_env_var", return_value="redis://test:6379/0")
     @patch("app.utilities.database.Redis.from_url")
     def test_get_redis_client_creation(self, mock_redis_from_url, mock_get_env_var):
@@ -0,0 +1,61 @@
+"""Test that the ETL packages defer importing their task modules."""
+
+import subprocess
+import sys
+
+TASK_MODULES = (
+    "app.etl.tasks.content_tasks",
+    "app.etl.tasks.ingestion",
+    "app.etl.tasks.vectorization",
+)
+
+
+def _loaded_after(code: str) -> set:
+    """Run ``code`` in a fresh interpreter and return the task modules it loaded."""
+    script = (
+        f"import sys\n{code}\n"
+        f"print(','.join(m for m in {TASK_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return {name for name in result.stdout.strip().split(",") if name}
+
+
+class TestLazyTaskImports:
+    """Test lazy loading of app.etl.tasks."""
+
+    def test_importing_etl_helpers_skips_task_modules(self):
+        """Importing a sibling ETL module should not load any task module."""
+        assert _loaded_after("import app.etl.ingestion_queries") == set()
+
+    def test_importing_tasks_package_skips_task_modules(self):
+        """Importing the tasks package alone should not load its submodules."""
+        assert _loaded_after("import app.etl.tasks") == set()
+
+    def test_attribute_access_loads_only_owning_module(self):
+        """Accessing a task loads the module that defines it."""
+        loaded = _loaded_after(
+            "from app.etl.tasks import run_ingestion_pipeline\n"
+            "assert callable(run_ingestion_pipeline)"
+        )
+        assert "app.etl.tasks.ingestion" in loaded
+        assert "app.etl.tasks.vectorization" not in loaded
+
+    def test_etl_package_forwards_task_names(self):
+        """app.etl still exposes the task functions by name."""
+        loaded = _loaded_after("import app.etl\nassert callable(app.etl.process_blog)")
+        assert "app.etl.tasks.ingestion" in loaded
+
+    def test_unknown_attribute_raises(self):
+        """Unknown names raise AttributeError rather than importing anything."""
+        loaded = _loaded_after(
+            "import app.etl.tasks\n"
+            "try:\n"
+            "    app.etl.tasks.not_a_task\n"
+            "except AttributeError:\n"
+            "    pass\n"
+            "else:\n"
+            "    raise SystemExit(1)"
+        )
+        assert loaded == set()
@@ -7,7 +7,9 @@ the knowledge tracking index and determining refresh policies.
 
 import os
 from datetime import datetime, timedelta, timezone
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
 
 
 class TestIngestionQueries:
@@ -15,47 +17,47 @@ class TestIngestionQueries:
 
     def test_should_process_content_with_staged_status(self):
         """Test that staged content is always processed."""
-        from app.etl.ingestion_queries import should_process_content
+        from app.etl.ingestion_queries import ContentRow, should_process_content
 
-        content_item = {
-            "name": "test-content",
-            "processing_status": "staged",
-            "source_date": "2025-09-10",
-        }
+        content_item = ContentRow(
+            name="test-content",
+            processing_status="staged",
+            source_date="2025-09-10",
+        )
 
         result = should_process_content(content_item)
         assert result is True
 
     def test_should_process_content_skips_currently_processing(self):
         """Test that content currently being processed is skipped."""
-        from app.etl.ingestion_queries import should_process_content
+        from app.etl.ingestion_queries import ContentRow, should_process_content
 
-        content_item = {
-            "name": "test-content",
-            "processing_status": "processing",
-            "source_date": "2025-09-10",
-        }
+        content_item = ContentRow(
+            name="test-content",
+            processing_status="processing",
+            source_date="2025-09-10",
+        )
 
         result = should_process_content(content_item)
         assert result is False
 
     def test_should_process_content_skips_processing(self):
         """Test that content already processing is skipped."""
-        from app.etl.ingestion_queries import should_process_content
+        from app.etl.ingestion_queries import ContentRow, should_process_content
 
         for status in ["processing", "ingest-pending", "vectorize-pending"]:
-            content_item = {
-                "name": "test-content",
-                "processing_status": status,
-                "source_date": "2025-09-10",
-            }
+            content_item = ContentRow(
+                name="test-content",
+                processing_status=status,
+                source_date="2025-09-10",
+            )
 
             result = should_process_content(content_item)
             assert result is False, f"Status {status} should be skipped"
 
     def test_should_process_content_with_stale_date(self):
         """Test that stale content is processed based on CONTENT_REFRESH_THRESHOLD_DAYS."""
-        from app.etl.ingestion_queries import should_process_content
+        from app.etl.ingestion_queries import ContentRow, should_process_content
 
         # Mock environment variable for 7-day threshold
         with patch.dict(os.environ, {"CONTENT_REFRESH_THRESHOLD_DAYS": "7"}):
@@ -64,18 +66,18 @@ class TestIngestionQueries:
                 "%Y-%m-%d"
             )
 
-            content_item = {
-                "name": "stale-content",
-                "processing_status": "completed",  # Completed but stale
-                "source_date": stale_date,
-            }
+            content_item = ContentRow(
+                name="stale-content",
+                processing_status="completed",  # Completed but stale
+                source_date=stale_date,
+            )
 
             result = should_process_content(content_item)
             assert result is True
 
     def test_should_process_content_with_fresh_date(self):
         """Test that fresh content is not processed."""
-        from app.etl.ingestion_queries import should_process_content
+        from app.etl.ingestion_queries import ContentRow, should_process_content
 
         # Mock environment variable for 7-day threshold
         with patch.dict(os.environ, {"CONTENT_REFRESH_THRESHOLD_DAYS": "7"}):
@@ -84,109 +86,318 @@ class TestIngestionQueries:
                 "%Y-%m-%d"
             )
 
-            content_item = {
-                "name": "fresh-content",
-                "processing_status": "completed",  # Completed and fresh
-                "source_date": fresh_date,
-            }
+            content_item = ContentRow(
+                name="fresh-content",
+                processing_status="completed",  # Completed and fresh
+                source_date=fresh_date,
+            )
 
             result = should_process_content(content_item)
             assert result is False
 
+    def test_reload_config_reads_refresh_threshold(self):
+        """Test that settings are cached until reload_config is called."""
+        from app.etl import ingestion_queries
+
+        try:
+            with patch.dict(
+                os.environ,
+                {
+                    "CONTENT_REFRESH_THRESHOLD_DAYS": "30",
+                    "REDIS_URL": "redis://cached:6379/0",
+                },
+            ):
+                ingestion_queries.reload_config()
+
+            # Values persist after the environment is restored
+            assert ingestion_queries._REFRESH_DAYS == 30
+            assert ingestion_queries._REFRESH_DELTA == timedelta(days=30)
+            assert ingestion_queries.get_redis_url() == "redis://cached:6379/0"
+        finally:
+            ingestion_queries.reload_config()
+
+    def test_batch_size_sets_cursor_page_size(self):
+        """Test that INGESTION_BATCH_SIZE controls the cursor page size."""
+        from app.etl import ingestion_queries
+
+        try:
+            with patch.dict(os.environ, {"INGESTION_BATCH_SIZE": "50"}):
+                ingestion_queries.reload_config()
+
+            args = ingestion_queries.build_ingestion_query().build_args()
+            assert args[args.index("WITHCURSOR") + 2] == "50"
+        finally:
+            ingestion_queries.reload_config()
+
+    @pytest.mark.asyncio
+    @patch("app.etl.ingestion_queries.ConnectionPool")
+    async def test_redis_client_is_shared(self, mock_pool_class):
+        """Test that the Redis client and pool are created once and reused."""
+        from app.etl import ingestion_queries
+
+        mock_pool_class.from_url.return_value.disconnect = AsyncMock()
+
+        await ingestion_queries.close_pool()
+        try:
+            first = ingestion_queries.get_redis_client()
+            second = ingestion_queries.get_redis_client()
+
+            assert first is second
+            mock_pool_class.from_url.assert_called_once()
+        finally:
+            await ingestion_queries.close_pool()
+
+        mock_pool_class.from_url.return_value.disconnect.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("app.etl.ingestion_queries.get_redis_client")
+    async def test_backfill_makes_legacy_records_selectable(self, mock_get_client):
+        """Test that legacy records without the epoch are backfilled and selected."""
+        from app.etl.ingestion_queries import (
+            backfill_source_date_epoch,
+            build_ingestion_query,
+            source_date_to_epoch,
+        )
+
+        async def scan_iter(**kwargs):
+            for key in (
+                "knowledge_tracking:legacy",
+                "knowledge_tracking:current",
+                "knowledge_tracking:deleted",
+            ):
+                yield key
+
+        read_pipe, write_pipe = Mock(), Mock()
+        read_pipe.execute = AsyncMock(
+            return_value=[
+                {"$.source_date": ["2020-01-01"], "$.source_date_epoch": []},
+                {"$.source_date": ["2025-09-10"], "$.source_date_epoch": [1]},
+                None,
+            ]
+        )
+        write_pipe.execute = AsyncMock(return_value=[True])
+
+        mock_client = Mock()
+        mock_client.scan_iter = scan_iter
+        mock_client.pipeline.side_effect = [read_pipe, write_pipe]
+        mock_get_client.return_value = mock_client
+
+        assert await backfill_source_date_epoch() == 1
+
+        legacy_epoch = source_date_to_epoch("2020-01-01")
+        write_pipe.json.return_value.set.assert_called_once_with(
+            "knowledge_tracking:legacy",
+            "$.source_date_epoch",
+            legacy_epoch,
+            nx=True,
+        )
+        # The backfilled epoch falls inside the query's stale range
+        query_string = build_ingestion_query()._query
+        assert legacy_epoch < int(query_string.rsplit("(", 1)[1].rstrip("])"))
+
     def test_filter_content_by_type(self):
         """Test that content filtering by type works correctly."""
-        from app.etl.ingestion_queries import filter_content_by_type
+        from app.etl.ingestion_queries import ContentRow, filter_content_by_type
 
         content_items = [
-            {"name": "blog1", "content_type": "blog"},
-            {"name": "repo1", "content_type": "repo"},
-            {"name": "blog2", "content_type": "blog"},
-            {"name": "notebook1", "content_type": "notebook"},
+            ContentRow(name="blog1", content_type="blog"),
+            ContentRow(name="repo1", content_type="repo"),
+            ContentRow(name="blog2", content_type="blog"),
+            ContentRow(name="notebook1", content_type="notebook"),
         ]
 
         # Filter for blogs
         blog_items = filter_content_by_type(content_items, "blog")
         assert len(blog_items) == 2
-        assert all(item["content_type"] == "blog" for item in blog_items)
-        assert "blog1" in [item["name"] for item in blog_items]
-        assert "blog2" in [item["name"] for item in blog_items]
+        assert all(item.content_type == "blog" for item in blog_items)
+        assert "blog1" in [item.name for item in blog_items]
+        assert "blog2" in [item.name for item in blog_items]
 
         # Filter for repos
         repo_items = filter_content_by_type(content_items, "repo")
         assert len(repo_items) == 1
-        assert repo_items[0]["name"] == "repo1"
+        assert repo_items[0].name == "repo1"
 
     def test_build_ingestion_query(self):
         """Test that the ingestion query is built correctly."""
-        from redis.commands.search.query import Query
+        from redis.commands.search.aggregation import AggregateRequest
 
-        from app.etl.ingestion_queries import build_ingestion_query
+        from app.etl.ingestion_queries import CONTENT_FIELDS, build_ingestion_query
 
         query = build_ingestion_query()
 
         # Verify the query object is created correctly
         assert query is not None
-        assert isinstance(query, Query)
-        # Verify it has the expected return fields
-        assert query._return_fields is not None
+        assert isinstance(query, AggregateRequest)
+        args = query.build_args()
+        # Every ContentRow field is loaded and results are read via a cursor
+        assert args[args.index("LOAD") + 1] == str(len(CONTENT_FIELDS))
+        assert "@source_date_epoch" in args
+        assert args[args.index("WITHCURSOR") + 1 : args.index("WITHCURSOR") + 3] == [
+            "COUNT",
+            "500",
+        ]
 
-    @patch("app.etl.ingestion_queries.redis.Redis")
-    def test_query_content_for_ingestion(self, mock_redis_class):
-        """Test the full query_content_for_ingestion function."""
-        from app.etl.ingestion_queries import query_content_for_ingestion
+    def test_build_ingestion_query_excludes_in_flight_statuses(self):
+        """Test that in-flight statuses are filtered out by RediSearch."""
+        from app.etl.ingestion_queries import build_ingestion_query
 
-        # Mock Redis client and search results
-        mock_client = Mock()
-        mock_redis_class.from_url.return_value = mock_client
+        query_string = build_ingestion_query()._query
 
-        # Create mock search results with different statuses
-        class MockDoc:
-            def __init__(self, data):
-                self.__dict__ = data
+        assert "@archive:{false}" in query_string
+        assert (
+            "-@processing_status:{processing|ingest\\-pending|vectorize\\-pending}"
+            in query_string
+        )
 
-        mock_docs = [
-            MockDoc(
-                {
-                    "name": "staged-content",
-                    "content_type": "blog",
-                    "processing_status": "staged",
-                    "source_date": "2025-09-10",
-                }
-            ),
-            MockDoc(
-                {
-                    "name": "completed-content",
-                    "content_type": "blog",
-                    "processing_status": "completed",
-                    "source_date": "2025-09-10",
-                }
-            ),
-        ]
+    def test_build_ingestion_query_filters_stale_content(self):
+        """Test that the staged-or-stale predicate is part of the query."""
+        from app.etl.ingestion_queries import build_ingestion_query
 
-        mock_search_results = Mock()
-        mock_search_results.docs = mock_docs
-        mock_client.ft.return_value.search.return_value = mock_search_results
+        with patch.dict(os.environ, {"CONTENT_REFRESH_THRESHOLD_DAYS": "7"}):
+            query_string = build_ingestion_query()._query
+
+        cutoff = int((datetime.now(timezone.utc) - timedelta(days=7)).timestamp())
+        assert "@processing_status:{staged} | @source_date_epoch:[-inf (" in (
+            query_string
+        )
+        # Allow for the clock ticking between building the query and the assert
+        queried_cutoff = int(query_string.rsplit("(", 1)[1].rstrip("])"))
+        assert abs(queried_cutoff - cutoff) <= 5
+
+    def test_should_process_content_with_shared_cutoff(self):
+        """Test that a precomputed cutoff is used instead of the clock."""
+        from app.etl.ingestion_queries import (
+            ContentRow,
+            refresh_cutoff_epoch,
+            should_process_content,
+        )
+
+        content_item = ContentRow(
+            name="content",
+            processing_status="completed",
+            source_date_epoch="1000",
+        )
+
+        with patch("app.etl.ingestion_queries.time.time") as mock_time:
+            assert should_process_content(content_item, cutoff_epoch=2000.0) is True
+            assert should_process_content(content_item, cutoff_epoch=500.0) is False
+            mock_time.assert_not_called()
+
+        with patch.dict(os.environ, {"CONTENT_REFRESH_THRESHOLD_DAYS": "7"}):
+            expected = datetime.now(timezone.utc) - timedelta(days=7)
+            assert abs(refresh_cutoff_epoch() - expected.timestamp()) <= 5
+
+    def test_source_date_to_epoch(self):
+        """Test conversion of source dates to epoch seconds."""
+        from app.etl.ingestion_queries import source_date_to_epoch
+
+        assert source_date_to_epoch("2025-09-10") == int(
+            datetime(2025, 9, 10, tzinfo=timezone.utc).timestamp()
+        )
+        assert source_date_to_epoch("") == 0
+        assert source_date_to_epoch(None) == 0
+        assert source_date_to_epoch("not-a-date") == 0
+        # Single-digit month/day parse as they did with strptime
+        assert source_date_to_epoch("2025-9-1") == int(
+            datetime(2025, 9, 1, tzinfo=timezone.utc).timestamp()
+        )
+        # Well-formed but impossible, or trailing junk
+        assert source_date_to_epoch("2025-02-30") == 0
+        assert source_date_to_epoch("2025-09-10T00:00") == 0
+
+    def test_should_process_content_prefers_source_date_epoch(self):
+        """Test that the indexed epoch is used instead of parsing source_date."""
+        from app.etl.ingestion_queries import ContentRow, should_process_content
+
+        fresh_epoch = int((datetime.now(timezone.utc) - timedelta(days=1)).timestamp())
+        content_item = ContentRow(
+            name="fresh-content",
+            processing_status="completed",
+            # Stale string date is ignored when the epoch is present
+            source_date="2020-01-01",
+            source_date_epoch=str(fresh_epoch),
+        )
+
+        with patch.dict(os.environ, {"CONTENT_REFRESH_THRESHOLD_DAYS": "7"}):
+            assert should_process_content(content_item) is False
+
+    @pytest.mark.asyncio
+    @patch("app.etl.ingestion_queries.get_redis_client")
+    async def test_query_content_for_ingestion(self, mock_get_client):
+        """Test the full query_content_for_ingestion function."""
+        from redis.commands.search.aggregation import Cursor
+
+        from app.etl.ingestion_queries import ContentRow, query_content_for_ingestion
+
+        # Mock Redis client and search results
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+
+        # Two cursor pages; a cursor id of 0 marks the last one
+        first_page = Mock(
+            rows=[
+                [
+                    "name",
+                    "staged-content",
+                    "content_type",
+                    "blog",
+                    "processing_status",
+                    "staged",
+                    "source_date",
+                    "2025-09-10",
+                ]
+            ],
+            cursor=Cursor(42),
+        )
+        last_page = Mock(
+            rows=[
+                [
+                    "name",
+                    "completed-content",
+                    "content_type",
+                    "blog",
+                    "processing_status",
+                    "completed",
+                    "source_date",
+                    "2025-09-10",
+                ]
+            ],
+            cursor=Cursor(0),
+        )
+        mock_client.ft.return_value.aggregate = AsyncMock(
+            side_effect=[first_page, last_page]
+        )
 
         # Mock environment variable
         with patch.dict(os.environ, {"CONTENT_REFRESH_THRESHOLD_DAYS": "7"}):
-            result = query_content_for_ingestion()
+            stream = query_content_for_ingestion()
+            # Nothing is fetched until the stream is consumed
+            mock_client.ft.return_value.aggregate.assert_not_called()
+            result = [item async for item in stream]
 
         # Verify both staged and completed content are returned (the function returns all content, filtering happens later)
         assert len(result) == 2
+        assert all(isinstance(item, ContentRow) for item in result)
         # Check that staged content is included
         staged_content = next(
-            (item for item in result if item["name"] == "staged-content"), None
+            (item for item in result if item.name == "staged-content"), None
         )
         assert staged_content is not None
-        assert staged_content["processing_status"] == "staged"
+        assert staged_content.processing_status == "staged"
         # Check that completed content is also included
         completed_content = next(
-            (item for item in result if item["name"] == "completed-content"), None
+            (item for item in result if item.name == "completed-content"), None
         )
         assert completed_content is not None
-        assert completed_content["processing_status"] == "completed"
+        assert completed_content.processing_status == "completed"
+        # Fields absent from a hit are filled with None
+        assert completed_content.content_url is None
 
         # Verify Redis was called correctly
-        mock_redis_class.from_url.assert_called_once()
+        mock_get_client.assert_called_once()
         mock_client.ft.assert_called_with("knowledge_tracking")
-        mock_client.ft.return_value.search.assert_called_once()
+        aggregate_calls = mock_client.ft.return_value.aggregate.call_args_list
+        assert len(aggregate_calls) == 2
+        # The second page is read from the cursor returned with the first
+        assert aggregate_calls[1].args[0] is first_page.cursor
@@ -8,22 +8,214 @@ This module tests the ingestion functionality including:
 - Tracking index updates
 """
 
-from unittest.mock import AsyncMock, Mock, mock_open, patch
+import asyncio
+import threading
+from unittest.mock import ANY, AsyncMock, Mock, mock_open, patch
 
+import aiohttp
 import pytest
+from pypdf import PdfReader
 
 from app.etl.tasks.ingestion import (
+    _STRUCTURE_LINES_PER_PARAGRAPH,
+    _blog_to_markdown,
+    _extract_s3_date,
+    _markdown_exporter,
+    _notebook_to_markdown,
+    _walk_repo,
     get_s3_bucket_name,
     process_blog,
     process_notebook,
     process_repository,
+    repo_to_pdf,
+    run_ingestion_pipeline,
     update_tracking_index,
 )
 
 
+@pytest.fixture
+def sample_repo(tmp_path):
+    """Small repository tree with hidden and generated entries to skip."""
+    repo = tmp_path / "sample-repo"
+    (repo / "src" / "pkg").mkdir(parents=True)
+    (repo / "src" / "pkg" / "core.py").write_text("x = 1\n")
+    (repo / "src" / "__pycache__").mkdir()
+    (repo / "src" / "__pycache__" / "core.pyc").write_bytes(b"\0")
+    (repo / "node_modules" / "dep").mkdir(parents=True)
+    (repo / ".git").mkdir()
+    (repo / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (repo / ".env").write_text("SECRET=1\n")
+    (repo / "README.md").write_text("# Sample <repo> & docs\nSecond line\n")
+    (repo / "setup.py").write_text("print('setup')\n")
+    (repo / "LICENSE").write_text("MIT\n")
+    return repo
+
+
+async def _iter_chunks(*chunks):
+    """Stand-in for aiohttp's ``response.content.iter_chunked``."""
+    for chunk in chunks:
+        yield chunk
+
+
+class TestRepoToPdf:
+    """Test conversion of a cloned repository to PDF."""
+
+    def test_walk_repo_is_sorted_and_skips_hidden(self, sample_repo):
+        """The walk lists directories before their contents, in sorted order."""
+        walked = [path for path, _ in _walk_repo(sample_repo)]
+
+        assert walked == [
+            "LICENSE",
+            "README.md",
+            "setup.py",
+            "src",
+            "src/pkg",
+            "src/pkg/core.py",
+        ]
+
+    def test_pdf_lists_structure_and_key_files(self, sample_repo, tmp_path):
+        """The PDF shows the tree and the content of top-level key files."""
+        pdf_path = tmp_path / "sample-repo.pdf"
+
+        repo_to_pdf(sample_repo, pdf_path)
+
+        text = "\n".join(page.extract_text() for page in PdfReader(str(pdf_path)).pages)
+        assert "Summary: 2 directories, 4 files" in text
+        assert "src/pkg/core.py" in text
+        assert "File: README.md" in text
+        assert "# Sample <repo> & docs" in text
+        assert "File: setup.py" in text
+        # Only top-level files matching the key patterns are included
+        assert "File: LICENSE" not in text
+        assert "File: src/pkg/core.py" not in text
+        assert "SECRET" not in text
+
+    def test_key_file_content_is_truncated_and_binary_skipped(self, tmp_path):
+        """Long key files are cut at the limit and undecodable ones are noted."""
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        (repo / "long.md").write_text("a" * 20000 + "TAIL")
+        (repo / "data.json").write_bytes(b"\xff\xfe\x00binary")
+        pdf_path = tmp_path / "repo.pdf"
+
+        repo_to_pdf(repo, pdf_path)
+
+        text = "".join(page.extract_text() for page in PdfReader(str(pdf_path)).pages)
+        assert "[content truncated]" in text
+        assert "TAIL" not in text
+        assert "[Binary file - content not shown]" in text
+
+    def test_markup_characters_in_file_names_are_escaped(self, tmp_path):
+        """File names containing markup characters do not break the PDF."""
+        repo = tmp_path / "repo"
+        (repo / "R&D").mkdir(parents=True)
+        (repo / "R&D" / "a<b>.txt").write_text("x")
+        (repo / "notes&todo.md").write_text("Fish & chips")
+        pdf_path = tmp_path / "repo.pdf"
+
+        repo_to_pdf(repo, pdf_path)
+
+        text = "".join(page.extract_text() for page in PdfReader(str(pdf_path)).pages)
+        assert "Error occurred during PDF generation" not in text
+        assert "R&D/a<b>.txt" in text
+        assert "File: notes&todo.md" in text
+        assert "Fish & chips" in text
+
+    def test_without_reportlab_writes_markdown_listing(self, sample_repo, tmp_path):
+        """Without reportlab the structure is written as Markdown instead."""
+        pdf_path = tmp_path / "sample-repo.pdf"
+
+        with patch("app.etl.tasks.ingestion._HAS_REPORTLAB", False):
+            repo_to_pdf(sample_repo, pdf_path)
+
+        listing = pdf_path.read_text(encoding="utf-8")
+        assert listing.startswith("# Repository: sample-repo\n")
+        assert "- 📄 src/pkg/core.py\n" in listing
+        assert "node_modules" not in listing
+        assert not pdf_path.with_suffix(".md").exists()
+
+    def test_large_listing_is_split_into_paragraphs(self, tmp_path):
+        """Large repositories are listed in several bounded paragraphs."""
+        from reportlab.platypus import Paragraph
+
+        repo = tmp_path / "big-repo"
+        repo.mkdir()
+        file_total = 2 * _STRUCTURE_LINES_PER_PARAGRAPH + 1
+        for i in range(file_total):
+            (repo / f"file_{i:04d}.txt").write_text("x")
+        pdf_path = tmp_path / "big-repo.pdf"
+        story = []
+
+        def build(flowables):
+            story.extend(flowables)
+            pdf_path.write_bytes(b"%PDF-1.4")
+
+        with patch("reportlab.platypus.SimpleDocTemplate.build", side_effect=build):
+            repo_to_pdf(repo, pdf_path)
+
+        listings = [
+            flowable.text
+            for flowable in story
+            if isinstance(flowable, Paragraph) and "file_" in flowable.text
+        ]
+        assert len(listings) == 3
+        assert listings[0].count("<br/>") == _STRUCTURE_LINES_PER_PARAGRAPH - 1
+        assert listings[-1] == f"📄 file_{file_total - 1:04d}.txt"
+
+
+class TestBlogToMarkdown:
+    """Test the blocking blog HTML to Markdown conversion."""
+
+    def test_blank_line_runs_collapse_and_code_keeps_indentation(self, tmp_path):
+        """Blank runs shrink to one empty line; indented code is left alone."""
+        blog_path = tmp_path / "post.html"
+        blog_path.write_text(
+            "<html><body><article><h1>Title</h1><br><br><br>"
+            "<p>Intro</p><pre><code>def f():\n    return 1</code></pre>"
+            "</article></body></html>",
+            encoding="utf-8",
+        )
+        markdown_path = tmp_path / "post.md"
+
+        _blog_to_markdown(blog_path, markdown_path)
+
+        markdown = markdown_path.read_text(encoding="utf-8")
+        assert markdown.startswith("# Title\n\n")
+        assert "\n\n\n" not in markdown
+        assert "    return 1" in markdown
+
+
+class TestNotebookToMarkdown:
+    """Test the blocking notebook to Markdown conversion."""
+
+    def test_exporter_is_built_once(self, tmp_path):
+        """Notebooks after the first reuse the cached exporter."""
+        notebook = (
+            b'{"cells": [{"cell_type": "markdown", "id": "c1", "metadata": {}, '
+            b'"source": "# Hello"}], "metadata": {}, '
+            b'"nbformat": 4, "nbformat_minor": 5}'
+        )
+        _markdown_exporter.cache_clear()
+        try:
+            for name in ("one", "two"):
+                _notebook_to_markdown(notebook, tmp_path / f"{name}.md")
+
+            assert _markdown_exporter.cache_info().misses == 1
+            assert "# Hello" in (tmp_path / "two.md").read_text(encoding="utf-8")
+        finally:
+            _markdown_exporter.cache_clear()
+
+
 class TestIngestionTasks:
     """Test cases for ingestion tasks."""
 
+    @pytest.fixture(autouse=True)
+    def fresh_markdown_exporter(self):
+        """Each test builds (or mocks) its own notebook exporter."""
+        _markdown_exporter.cache_clear()
+        yield
+        _markdown_exporter.cache_clear()
+
     @pytest.fixture
     def mock_storage_manager(self):
         """Mock S3 storage manager."""
@@ -35,11 +227,15 @@ class TestIngestionTasks:
 
     @pytest.fixture
     def mock_redis_client(self):
-        """Mock Redis client."""
+        """Mock Redis client whose transactional pipeline records JSON writes."""
         client = AsyncMock()
         json_mock = AsyncMock()
         json_mock.set = AsyncMock()
         client.json = Mock(return_value=json_mock)
+        pipeline = Mock()
+        pipeline.json = Mock(return_value=Mock())
+        pipeline.execute = AsyncMock(return_value=[True])
+        client.pipeline = Mock(return_value=pipeline)
         return client
 
     @pytest.fixture
@@ -89,9 +285,6 @@ class TestIngestionTasks:
     @pytest.mark.asyncio
     async def test_update_tracking_index_success(self, mock_redis_client):
         """Test successful tracking index update."""
-        # Mock that no existing record exists, so a new one will be created
-        mock_redis_client.json.return_value.get = AsyncMock(return_value=None)
-
         with patch(
             "app.utilities.database.get_redis_client", return_value=mock_redis_client
         ):
@@ -100,14 +293,16 @@ class TestIngestionTasks:
             )
 
             assert result is True
-            mock_redis_client.json.return_value.set.assert_called_once()
-
-            # Check the call arguments
-            call_args = mock_redis_client.json.return_value.set.call_args
-            assert call_args[0][0] == "knowledge_tracking:test-content"
-            assert call_args[0][1] == "$"
-
-            tracking_record = call_args[0][2]
+            mock_redis_client.pipeline.assert_called_once_with(transaction=True)
+            pipeline = mock_redis_client.pipeline.return_value
+            pipeline.execute.assert_awaited_once()
+
+            # The full record is only written if the key does not exist yet
+            create_call = pipeline.json.return_value.set.call_args_list[0]
+            key, path, tracking_record = create_call.args
+            assert key == "knowledge_tracking:test-content"
+            assert path == "$"
+            assert create_call.kwargs == {"nx": True}
             assert tracking_record["name"] == "test-content"
             assert tracking_record["content_type"] == "blog_md"
             assert (
@@ -115,10 +310,56 @@ class TestIngestionTasks:
                 == "https://s3.amazonaws.com/bucket/test.md"
             )
 
+            # Nothing is read back or written outside the pipeline
+            mock_redis_client.json.return_value.get.assert_not_called()
+            mock_redis_client.json.return_value.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_tracking_index_updates_fields_only(self, mock_redis_client):
+        """Existing records get targeted field writes, including the S3 date."""
+        # JSON.SET ... NX replies nil when the record already exists
+        mock_redis_client.pipeline.return_value.execute.return_value = [None] + [
+            True
+        ] * 6
+
+        with patch(
+            "app.utilities.database.get_redis_client", return_value=mock_redis_client
+        ):
+            result = await update_tracking_index(
+                "test-content",
+                "blog_md",
+                "s3://bucket/processed/blog_text/2025-09-10/test.md",
+            )
+
+        assert result is True
+        pipeline = mock_redis_client.pipeline.return_value
+        field_writes = {
+            call.args[1]: call.args[2]
+            for call in pipeline.json.return_value.set.call_args_list[1:]
+        }
+        assert field_writes["$.bucket_url"] == (
+            "s3://bucket/processed/blog_text/2025-09-10/test.md"
+        )
+        assert field_writes["$.processing_status"] == "ingested"
+        assert field_writes["$.source_date"] == "2025-09-10"
+        assert "$.name" not in field_writes
+        assert "$.retry_count" not in field_writes
+
+    def test_extract_s3_date(self):
+        """The date folder is read from processed content URLs only."""
+        assert (
+            _extract_s3_date("s3://bucket/processed/blog_text/2025-09-10/post.md")
+            == "2025-09-10"
+        )
+        assert _extract_s3_date("s3://bucket/processed/blog_text/post.md") is None
+        assert _extract_s3_date("https://s3.amazonaws.com/bucket/test.md") is None
+
     @pytest.mark.asyncio
     async def test_update_tracking_index_failure(self, mock_redis_client):
         """Test tracking index update failure."""
-        mock_redis_client.json.return_value.set.side_effect = Exception("Redis error")
+        mock_redis_client.pipeline.return_value.execute.side_effect = Exception(
+            "Redis error"
+        )
 
         with patch(
             "app.utilities.database.get_redis_client", return_value=mock_redis_client
@@ -153,7 +394,9 @@ class TestIngestionTasks:
             # Mock aiohttp response
             mock_response = AsyncMock()
             mock_response.status = 200
-            mock_response.read = AsyncMock(return_value=sample_html_content.encode())
+            mock_response.content.iter_chunked = Mock(
+                return_value=_iter_chunks(sample_html_content.encode())
+            )
 
             # Create proper async context manager for the response
             class MockResponseContextManager:
@@ -199,6 +442,8 @@ class TestIngestionTasks:
             result = await process_blog("test-blog", "https://example.com/test-blog")
 
             assert result["status"] == "success"
+            mock_response.content.iter_chunked.assert_called_once_with(64 * 1024)
+            mock_bs.assert_called_once_with(sample_html_content, "lxml")
             assert result["blog_name"] == "test-blog"
             assert "s3_url" in result
             assert "markdown_path" in result
@@ -256,6 +501,67 @@ class TestIngestionTasks:
             assert "error" in result
             assert "HTTP 404" in result["error"]
 
+    @pytest.mark.asyncio
+    async def test_process_blog_streams_download_to_file(self, mock_storage_manager):
+        """Every downloaded chunk lands in the HTML file handed to the converter."""
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content.iter_chunked = Mock(
+            return_value=_iter_chunks(b"<html><body>", b"<p>Hi</p></body></html>")
+        )
+        response_context = AsyncMock()
+        response_context.__aenter__.return_value = mock_response
+        session = Mock()
+        session.get = Mock(return_value=response_context)
+        downloaded = []
+
+        def fake_convert(blog_path, markdown_path):
+            downloaded.append(blog_path.read_bytes())
+            markdown_path.write_text("Hi", encoding="utf-8")
+
+        with (
+            patch(
+                "app.etl.tasks.ingestion.get_s3_bucket_name", return_value="test-bucket"
+            ),
+            patch(
+                "app.etl.tasks.ingestion.get_storage_manager",
+                return_value=mock_storage_manager,
+            ),
+            patch("app.etl.tasks.ingestion.update_tracking_index", return_value=True),
+            patch("app.etl.tasks.ingestion._blog_to_markdown", fake_convert),
+        ):
+            result = await process_blog(
+                "test-blog", "https://example.com/test-blog", session=session
+            )
+
+        assert result["status"] == "success"
+        assert downloaded == [b"<html><body><p>Hi</p></body></html>"]
+
+    @pytest.mark.asyncio
+    async def test_process_blog_uses_given_session(self):
+        """A caller's session is used as-is and left open."""
+        mock_response = AsyncMock()
+        mock_response.status = 404
+        response_context = AsyncMock()
+        response_context.__aenter__.return_value = mock_response
+        session = Mock()
+        session.get = Mock(return_value=response_context)
+
+        with (
+            patch(
+                "app.etl.tasks.ingestion.get_s3_bucket_name", return_value="test-bucket"
+            ),
+            patch("aiohttp.ClientSession") as mock_aiohttp,
+        ):
+            result = await process_blog(
+                "test-blog", "https://example.com/test-blog", session=session
+            )
+
+        assert "HTTP 404" in result["error"]
+        session.get.assert_called_once_with("https://example.com/test-blog")
+        session.close.assert_not_called()
+        mock_aiohttp.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_process_notebook_success(
         self, mock_storage_manager, sample_notebook_content
@@ -284,7 +590,7 @@ class TestIngestionTasks:
             mock_response = AsyncMock()
             mock_response.status = 200
             mock_response.read = AsyncMock(
-                return_value='{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 0}'.encode()
+                return_value=b'{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 0}'
             )
 
             # Create a proper async context manager
@@ -337,6 +643,13 @@ class TestIngestionTasks:
             assert result["notebook_name"] == "test-notebook"
             assert "s3_url" in result
             assert "markdown_path" in result
+            # The notebook is parsed from the downloaded bytes; only the
+            # markdown is written to disk
+            mock_nbformat_reads.assert_called_once_with(
+                '{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 0}',
+                as_version=4,
+            )
+            mock_file.assert_called_once_with(ANY, "w", encoding="utf-8")
 
     @pytest.mark.asyncio
     async def test_process_notebook_http_error(self):
@@ -406,7 +719,6 @@ class TestIngestionTasks:
             patch("app.etl.tasks.ingestion.git.Repo") as mock_repo_class,
             patch("app.etl.tasks.ingestion.repo_to_pdf") as mock_repo_to_pdf,
         ):
-
             # Mock git repository
             mock_repo = Mock()
             mock_repo.remotes.origin.url = "https://github.com/user/repo.git"
@@ -421,9 +733,52 @@ class TestIngestionTasks:
 
             assert result["status"] == "success"
             assert result["repo_name"] == "test-repo"
+            # Only the latest commit of the default branch is fetched
+            mock_repo_class.clone_from.assert_called_once_with(
+                "https://github.com/user/test-repo",
+                ANY,
+                multi_options=["--depth=1", "--single-branch", "--no-tags"],
+            )
             assert "s3_url" in result
             assert "pdf_path" in result
 
+    @pytest.mark.asyncio
+    async def test_process_repository_blocking_steps_run_in_threads(
+        self, mock_storage_manager
+    ):
+        """Cloning and PDF conversion do not block the event loop."""
+        loop_thread = threading.current_thread()
+        threads = {}
+
+        def record(step):
+            def run(*args, **kwargs):
+                threads[step] = threading.current_thread()
+
+            return run
+
+        with (
+            patch(
+                "app.etl.tasks.ingestion.get_s3_bucket_name", return_value="test-bucket"
+            ),
+            patch(
+                "app.etl.tasks.ingestion.get_storage_manager",
+                return_value=mock_storage_manager,
+            ),
+            patch("app.etl.tasks.ingestion.update_tracking_index", return_value=True),
+            patch(
+                "app.etl.tasks.ingestion.git.Repo.clone_from",
+                side_effect=record("clone"),
+            ),
+            patch("app.etl.tasks.ingestion.repo_to_pdf", side_effect=record("pdf")),
+        ):
+            result = await process_repository(
+                "test-repo", "https://github.com/user/test-repo"
+            )
+
+        assert result["status"] == "success"
+        assert set(threads) == {"clone", "pdf"}
+        assert loop_thread not in threads.values()
+
     @pytest.mark.asyncio
     async def test_process_repository_git_error(self, mock_storage_manager):
         """Test repository processing with git error."""
@@ -437,7 +792,6 @@ class TestIngestionTasks:
             ),
             patch("app.etl.tasks.ingestion.git.Repo.clone_from") as mock_clone_from,
         ):
-
             # Mock git error
             mock_clone_from.side_effect = Exception("Git clone failed")
 
@@ -467,7 +821,9 @@ class TestIngestionTasks:
             # Mock HTTP response
             mock_response = AsyncMock()
             mock_response.status = 200
-            mock_response.read = AsyncMock(return_value=b"<html>test</html>")
+            mock_response.content.iter_chunked = Mock(
+                return_value=_iter_chunks(b"<html>test</html>")
+            )
 
             # Create proper async context manager for the response
             class MockResponseContextManager:
@@ -560,3 +916,85 @@ class TestIngestionTasks:
             assert result["status"] == "failed"
             assert "error" in result
             assert "nbformat and nbconvert are required" in result["error"]
+
+
+class TestRunIngestionPipeline:
+    """Test the ledger-driven ingestion pipeline."""
+
+    @pytest.fixture
+    def ledger(self):
+        """Ledger with a few items of each kind."""
+        return {
+            "repos": [
+                {"name": f"repo{i}", "github_url": f"https://github.com/o/repo{i}"}
+                for i in range(3)
+            ],
+            "blogs": [
+                {"name": f"blog{i}", "blog_url": f"https://example.com/{i}"}
+                for i in range(3)
+            ],
+            "notebooks": [
+                {
+                    "name": "nb",
+                    "github_url": "https://github.com/o/r/blob/main/nb.ipynb",
+                }
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_items_run_concurrently_up_to_limit(self, ledger):
+        """Items of all kinds overlap, bounded by max_concurrent, in ledger order."""
+        ledger_manager = Mock()
+        ledger_manager.get_ledger = AsyncMock(return_value=ledger)
+        in_flight = 0
+        peak = 0
+        sessions = []
+
+        def fake_download(name, session):
+            sessions.append(session)
+            return fake_process(name)
+
+        async def fake_process(name):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"status": "success", "name": name}
+
+        with (
+            patch(
+                "app.etl.tasks.ingestion.get_etl_ledger_manager",
+                return_value=ledger_manager,
+            ),
+            patch(
+                "app.etl.tasks.ingestion.process_repository",
+                lambda repo_name, github_url: fake_process(repo_name),
+            ),
+            patch(
+                "app.etl.tasks.ingestion.process_blog",
+                lambda blog_name, blog_url, session: fake_download(blog_name, session),
+            ),
+            patch(
+                "app.etl.tasks.ingestion.process_notebook",
+                lambda notebook_name, github_url, session: fake_download(
+                    notebook_name, session
+                ),
+            ),
+        ):
+            results = await run_ingestion_pipeline(max_concurrent=4)
+
+        assert peak == 4
+        # Blogs and notebooks download through one shared session
+        assert len(sessions) == 4
+        assert all(session is sessions[0] for session in sessions)
+        assert isinstance(sessions[0], aiohttp.ClientSession)
+        assert sessions[0].closed
+        assert [r["name"] for r in results["repos"]] == ["repo0", "repo1", "repo2"]
+        assert [r["name"] for r in results["blogs"]] == ["blog0", "blog1", "blog2"]
+        assert [r["name"] for r in results["notebooks"]] == ["nb"]
+        assert results["summary"] == {
+            "total_items": 7,
+            "successful_items": 7,
+            "failed_items": 0,
+        }
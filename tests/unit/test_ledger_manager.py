@@ -4,36 +4,100 @@ Tests for ETL ledger manager.
 This module tests the ledger management functionality including:
 - Getting and setting ledger data
 - Adding/removing content items
-- JSON storage in Redis
+- Hash-per-item storage in Redis
 - CRUD operations for repos, blogs, and notebooks
 """
 
-from unittest.mock import AsyncMock, Mock
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from app.etl import ledger_manager as ledger_module
 from app.etl.ledger_manager import ETLedgerManager, get_etl_ledger_manager
 
+PIPELINED_COMMANDS = (
+    "sismember",
+    "smembers",
+    "sadd",
+    "srem",
+    "hset",
+    "hgetall",
+    "delete",
+    "publish",
+)
+
+
+async def _aiter(values):
+    """Async iterator standing in for sscan_iter."""
+    for value in values:
+        yield value
+
 
 class TestETLedgerManager:
     """Test cases for ETL ledger manager."""
 
+    @pytest.fixture(autouse=True)
+    def legacy_migrated(self, monkeypatch):
+        """Skip the one-off legacy JSON migration unless a test opts in."""
+        monkeypatch.setattr(ledger_module, "_legacy_migrated", True)
+
+    @pytest.fixture(autouse=True)
+    def ledger_cache(self):
+        """Start every test with a cold cache."""
+        ledger_module._set_ledger_cache(None)
+        yield
+        ledger_module._set_ledger_cache(None)
+
+    @pytest.fixture
+    def redis_data(self):
+        """Name SETs and item hashes visible to the mocked Redis client."""
+        return {"sets": {}, "hashes": {}}
+
     @pytest.fixture
-    def mock_redis_client(self):
+    def mock_redis_client(self, redis_data):
         """Mock Redis client."""
         client = AsyncMock()
         json_mock = Mock()
         json_mock.get = AsyncMock()
-        json_mock.set = AsyncMock()
         client.json = Mock(return_value=json_mock)
+        client.sscan_iter = Mock(
+            side_effect=lambda key: _aiter(redis_data["sets"].get(key, []))
+        )
+
+        # Pipelined commands are buffered and answered from redis_data when
+        # execute() is called
+        pipeline = AsyncMock()
+        pipeline.__aenter__.return_value = pipeline
+        for command in PIPELINED_COMMANDS:
+            setattr(pipeline, command, Mock())
+        sent = {"count": 0}
+
+        def execute():
+            calls = [
+                call for call in pipeline.method_calls if call[0] in PIPELINED_COMMANDS
+            ]
+            pending, sent["count"] = calls[sent["count"] :], len(calls)
+            replies = []
+            for command, args, _ in pending:
+                if command == "sismember":
+                    replies.append(args[1] in redis_data["sets"].get(args[0], []))
+                elif command == "smembers":
+                    replies.append(set(redis_data["sets"].get(args[0], [])))
+                elif command == "hgetall":
+                    replies.append(redis_data["hashes"].get(args[0], {}))
+                else:
+                    replies.append(1)
+            return replies
+
+        pipeline.execute.side_effect = execute
+        client.pipeline = Mock(return_value=pipeline)
         return client
 
     @pytest.fixture
     def ledger_manager(self, mock_redis_client):
         """ETL ledger manager with mocked Redis client."""
-        manager = ETLedgerManager()
-        manager.redis_client = mock_redis_client
-        return manager
+        return ETLedgerManager(mock_redis_client)
 
     @pytest.fixture
     def sample_ledger_data(self):
@@ -53,6 +117,22 @@ class TestETLedgerManager:
             ],
         }
 
+    @pytest.fixture
+    def stored_sample_ledger(self, redis_data, sample_ledger_data):
+        """Store the sample ledger the way Redis returns it (undecoded)."""
+        kinds = {"repos": "repo", "blogs": "blog", "notebooks": "notebook"}
+        for section, items in sample_ledger_data.items():
+            names_key = f"etl:ledger:{section}:names"
+            for item in items:
+                item_key = f"etl:ledger:{kinds[section]}:{item['name']}"
+                redis_data["sets"].setdefault(names_key, []).append(
+                    item["name"].encode()
+                )
+                redis_data["hashes"][item_key] = {
+                    k.encode(): v.encode() for k, v in item.items()
+                }
+        return sample_ledger_data
+
     @pytest.fixture
     def empty_ledger_data(self):
         """Empty ledger data for testing."""
@@ -60,60 +140,209 @@ class TestETLedgerManager:
 
     def test_get_etl_ledger_manager(self):
         """Test getting ETL ledger manager instance."""
-        manager = get_etl_ledger_manager()
+        with patch("app.etl.ledger_manager.get_redis_client") as mock_get_client:
+            manager = get_etl_ledger_manager()
+
         assert isinstance(manager, ETLedgerManager)
+        # The client is resolved once, when the manager is created
+        assert manager.redis_client is mock_get_client.return_value
+        mock_get_client.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_get_ledger_success(
-        self, ledger_manager, sample_ledger_data, mock_redis_client
+        self, ledger_manager, stored_sample_ledger, mock_redis_client
     ):
         """Test successful ledger retrieval."""
-        mock_redis_client.json.return_value.get.return_value = sample_ledger_data
+        pipeline = mock_redis_client.pipeline.return_value
 
         result = await ledger_manager.get_ledger()
 
-        assert result == sample_ledger_data
-        mock_redis_client.json.return_value.get.assert_called_once_with(
-            "etl:content_ledger"
-        )
+        assert result == stored_sample_ledger
+        scanned = [call.args[0] for call in mock_redis_client.sscan_iter.call_args_list]
+        assert scanned == [
+            "etl:ledger:repos:names",
+            "etl:ledger:blogs:names",
+            "etl:ledger:notebooks:names",
+        ]
+        # Every item hash is fetched in a single round trip
+        assert pipeline.hgetall.call_count == 3
+        pipeline.execute.assert_awaited_once()
+        mock_redis_client.json.return_value.get.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_ledger_empty(
         self, ledger_manager, empty_ledger_data, mock_redis_client
     ):
         """Test getting empty ledger."""
-        mock_redis_client.json.return_value.get.return_value = None
-
         result = await ledger_manager.get_ledger()
 
         assert result == empty_ledger_data
 
+    @pytest.mark.asyncio
+    async def test_get_ledger_skips_missing_items(
+        self, ledger_manager, stored_sample_ledger, redis_data
+    ):
+        """Test that names without a hash are left out of the ledger."""
+        del redis_data["hashes"]["etl:ledger:blog:test-blog"]
+
+        result = await ledger_manager.get_ledger()
+
+        assert result["blogs"] == []
+        assert result["repos"] == stored_sample_ledger["repos"]
+
+    @pytest.mark.asyncio
+    async def test_get_ledger_is_cached(
+        self, ledger_manager, stored_sample_ledger, mock_redis_client
+    ):
+        """Test that repeated reads within the TTL are served from memory."""
+        first = await ledger_manager.get_ledger()
+        first["repos"].clear()  # Callers can't corrupt the cached copy
+        second = await ledger_manager.get_ledger()
+
+        assert second == stored_sample_ledger
+        assert mock_redis_client.sscan_iter.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_ledger_cache_expires(
+        self, ledger_manager, stored_sample_ledger, mock_redis_client, monkeypatch
+    ):
+        """Test that the cache is refreshed once the TTL has passed."""
+        await ledger_manager.get_ledger()
+        monkeypatch.setattr(ledger_module, "_ledger_cache_expires_at", 0.0)
+        await ledger_manager.get_ledger()
+
+        assert mock_redis_client.sscan_iter.call_count == 6
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_cache_and_publish(
+        self, ledger_manager, stored_sample_ledger, mock_redis_client
+    ):
+        """Test that ledger writes drop the cache and notify other processes."""
+        pipeline = mock_redis_client.pipeline.return_value
+
+        await ledger_manager.get_ledger()
+        await ledger_manager.add_blog_to_ledger("new-blog", "https://example.com")
+        await ledger_manager.get_ledger()
+
+        assert mock_redis_client.sscan_iter.call_count == 6
+        pipeline.publish.assert_called_with("etl:ledger:invalidate", "1")
+
+    @pytest.mark.asyncio
+    async def test_invalidation_message_drops_cache(self, sample_ledger_data):
+        """Test that the subscriber clears the cache when a write is announced."""
+        ledger_module._set_ledger_cache(sample_ledger_data)
+
+        async def messages():
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": "1"}
+
+        pubsub = AsyncMock()
+        pubsub.listen = Mock(return_value=messages())
+        client = Mock()
+        client.pubsub.return_value = pubsub
+
+        await ledger_module._listen_for_invalidations(client)
+
+        pubsub.subscribe.assert_awaited_once_with("etl:ledger:invalidate")
+        assert ledger_module._ledger_cache is None
+
+    @pytest.mark.asyncio
+    async def test_get_ledger_does_not_start_listener(
+        self, ledger_manager, stored_sample_ledger, mock_redis_client
+    ):
+        """Test that reading the ledger leaves the subscriber to the lifespan."""
+        await ledger_manager.get_ledger()
+
+        mock_redis_client.pubsub.assert_not_called()
+        assert ledger_module._invalidation_task is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_listener_start_and_stop(self, sample_ledger_data):
+        """Test that the listener runs until stopped and stop drops the cache."""
+        subscribed = asyncio.Event()
+
+        async def messages():
+            subscribed.set()
+            await asyncio.Event().wait()  # Block like a quiet channel
+            yield {}
+
+        pubsub = AsyncMock()
+        pubsub.listen = Mock(return_value=messages())
+        client = Mock()
+        client.pubsub.return_value = pubsub
+
+        await ledger_module.start_invalidation_listener(client)
+        task = ledger_module._invalidation_task
+        await ledger_module.start_invalidation_listener(client)  # Already running
+        await asyncio.wait_for(subscribed.wait(), 1)
+        ledger_module._set_ledger_cache(sample_ledger_data)
+
+        await ledger_module.stop_invalidation_listener()
+
+        client.pubsub.assert_called_once()
+        assert task.cancelled()
+        pubsub.reset.assert_awaited_once()
+        assert ledger_module._invalidation_task is None
+        assert ledger_module._ledger_cache is None
+
+    def test_ledger_usable_from_successive_event_loops(
+        self, ledger_manager, stored_sample_ledger
+    ):
+        """Test that the cache lock is not tied to the first event loop."""
+
+        async def contended_reads():
+            ledger_module._set_ledger_cache(None)
+            # Concurrent readers make the second wait on the lock
+            return await asyncio.gather(
+                ledger_manager.get_ledger(), ledger_manager.get_ledger()
+            )
+
+        for _ in range(2):
+            first, second = asyncio.run(contended_reads())
+            assert first == second == stored_sample_ledger
+
     @pytest.mark.asyncio
     async def test_get_ledger_error(self, ledger_manager, mock_redis_client):
         """Test ledger retrieval error."""
-        mock_redis_client.json.return_value.get.side_effect = Exception("Redis error")
+        mock_redis_client.sscan_iter.side_effect = Exception("Redis error")
 
         with pytest.raises(Exception, match="Redis error"):
             await ledger_manager.get_ledger()
 
     @pytest.mark.asyncio
     async def test_update_ledger_success(
-        self, ledger_manager, sample_ledger_data, mock_redis_client
+        self, ledger_manager, sample_ledger_data, mock_redis_client, redis_data
     ):
         """Test successful ledger update."""
+        redis_data["sets"]["etl:ledger:repos:names"] = [b"old-repo"]
+        pipeline = mock_redis_client.pipeline.return_value
+
         result = await ledger_manager.update_ledger(sample_ledger_data)
 
         assert result is True
-        mock_redis_client.json.return_value.set.assert_called_once_with(
-            "etl:content_ledger", "$", sample_ledger_data
+        mock_redis_client.pipeline.assert_called_with(transaction=True)
+        # Items no longer in the ledger are deleted with the old name SET
+        pipeline.delete.assert_any_call(
+            "etl:ledger:repos:names", "etl:ledger:repo:old-repo"
+        )
+        pipeline.hset.assert_any_call(
+            "etl:ledger:repo:test-repo",
+            mapping={
+                "name": "test-repo",
+                "github_url": "https://github.com/user/test-repo",
+            },
         )
+        pipeline.sadd.assert_any_call("etl:ledger:repos:names", "test-repo")
+        pipeline.sadd.assert_any_call("etl:ledger:blogs:names", "test-blog")
+        pipeline.sadd.assert_any_call("etl:ledger:notebooks:names", "test-notebook")
 
     @pytest.mark.asyncio
     async def test_update_ledger_error(
         self, ledger_manager, sample_ledger_data, mock_redis_client
     ):
         """Test ledger update error."""
-        mock_redis_client.json.return_value.set.side_effect = Exception("Redis error")
+        pipeline = mock_redis_client.pipeline.return_value
+        pipeline.execute.side_effect = Exception("Redis error")
 
         with pytest.raises(Exception, match="Redis error"):
             await ledger_manager.update_ledger(sample_ledger_data)
@@ -121,100 +350,78 @@ class TestETLedgerManager:
     @pytest.mark.asyncio
     async def test_add_repo_to_ledger_success(self, ledger_manager, mock_redis_client):
         """Test successful repo addition."""
-        mock_redis_client.json.return_value.get.return_value = {
-            "repos": [],
-            "blogs": [],
-            "notebooks": [],
-        }
+        pipeline = mock_redis_client.pipeline.return_value
 
         result = await ledger_manager.add_repo_to_ledger(
             "new-repo", "https://github.com/user/new-repo"
         )
 
         assert result is True
-        mock_redis_client.json.return_value.set.assert_called_once()
-
-        # Check the updated ledger data
-        call_args = mock_redis_client.json.return_value.set.call_args
-        ledger_data = call_args[0][2]
-        assert len(ledger_data["repos"]) == 1
-        assert ledger_data["repos"][0]["name"] == "new-repo"
-        assert (
-            ledger_data["repos"][0]["github_url"] == "https://github.com/user/new-repo"
+        # Duplicate check is a set membership test
+        pipeline.sismember.assert_called_once_with("etl:ledger:repos:names", "new-repo")
+        # The hash and the name SET update commit together
+        mock_redis_client.pipeline.assert_called_with(transaction=True)
+        pipeline.sadd.assert_called_once_with("etl:ledger:repos:names", "new-repo")
+        pipeline.hset.assert_called_once_with(
+            "etl:ledger:repo:new-repo",
+            mapping={
+                "name": "new-repo",
+                "github_url": "https://github.com/user/new-repo",
+            },
         )
+        mock_redis_client.json.return_value.get.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_add_repo_to_ledger_duplicate(
-        self, ledger_manager, mock_redis_client
+        self, ledger_manager, mock_redis_client, redis_data
     ):
         """Test adding duplicate repo."""
-        existing_ledger = {
-            "repos": [
-                {
-                    "name": "existing-repo",
-                    "github_url": "https://github.com/user/existing-repo",
-                }
-            ],
-            "blogs": [],
-            "notebooks": [],
-        }
-        mock_redis_client.json.return_value.get.return_value = existing_ledger
+        redis_data["sets"]["etl:ledger:repos:names"] = ["existing-repo"]
+        pipeline = mock_redis_client.pipeline.return_value
 
         result = await ledger_manager.add_repo_to_ledger(
             "existing-repo", "https://github.com/user/existing-repo"
         )
 
         assert result is True  # Current implementation returns True for duplicate
+        pipeline.hset.assert_not_called()
+        pipeline.sadd.assert_not_called()
+        # Nothing to add, so no second round trip
+        assert pipeline.execute.call_count == 1
 
     @pytest.mark.asyncio
     async def test_add_blog_to_ledger_success(self, ledger_manager, mock_redis_client):
         """Test successful blog addition."""
-        mock_redis_client.json.return_value.get.return_value = {
-            "repos": [],
-            "blogs": [],
-            "notebooks": [],
-        }
+        pipeline = mock_redis_client.pipeline.return_value
 
         result = await ledger_manager.add_blog_to_ledger(
             "new-blog", "https://example.com/new-blog"
         )
 
         assert result is True
-        mock_redis_client.json.return_value.set.assert_called_once()
-
-        # Check the updated ledger data
-        call_args = mock_redis_client.json.return_value.set.call_args
-        ledger_data = call_args[0][2]
-        assert len(ledger_data["blogs"]) == 1
-        assert ledger_data["blogs"][0]["name"] == "new-blog"
-        assert ledger_data["blogs"][0]["blog_url"] == "https://example.com/new-blog"
+        pipeline.hset.assert_called_once_with(
+            "etl:ledger:blog:new-blog",
+            mapping={"name": "new-blog", "blog_url": "https://example.com/new-blog"},
+        )
 
     @pytest.mark.asyncio
     async def test_add_notebook_to_ledger_success(
         self, ledger_manager, mock_redis_client
     ):
         """Test successful notebook addition."""
-        mock_redis_client.json.return_value.get.return_value = {
-            "repos": [],
-            "blogs": [],
-            "notebooks": [],
-        }
+        pipeline = mock_redis_client.pipeline.return_value
 
         result = await ledger_manager.add_notebook_to_ledger(
             "new-notebook", "https://github.com/user/repo/blob/main/new-notebook.ipynb"
         )
 
         assert result is True
-        mock_redis_client.json.return_value.set.assert_called_once()
-
-        # Check the updated ledger data
-        call_args = mock_redis_client.json.return_value.set.call_args
-        ledger_data = call_args[0][2]
-        assert len(ledger_data["notebooks"]) == 1
-        assert ledger_data["notebooks"][0]["name"] == "new-notebook"
-        assert (
-            ledger_data["notebooks"][0]["github_url"]
-            == "https://github.com/user/repo/blob/main/new-notebook.ipynb"
+        pipeline.hset.assert_called_once_with(
+            "etl:ledger:notebook:new-notebook",
+            mapping={
+                "name": "new-notebook",
+                "github_url": "https://github.com/user/repo/blob/main/new-notebook.ipynb",
+            },
         )
 
     @pytest.mark.asyncio
@@ -222,126 +429,114 @@ class TestETLedgerManager:
         self, ledger_manager, mock_redis_client
     ):
         """Test successful repo removal."""
-        existing_ledger = {
-            "repos": [
-                {
-                    "name": "repo-to-remove",
-                    "github_url": "https://github.com/user/repo-to-remove",
-                }
-            ],
-            "blogs": [],
-            "notebooks": [],
-        }
-        mock_redis_client.json.return_value.get.return_value = existing_ledger
+        pipeline = mock_redis_client.pipeline.return_value
 
         result = await ledger_manager.remove_repo_from_ledger("repo-to-remove")
 
         assert result is True
-        mock_redis_client.json.return_value.set.assert_called_once()
-
-        # Check the updated ledger data
-        call_args = mock_redis_client.json.return_value.set.call_args
-        ledger_data = call_args[0][2]
-        assert len(ledger_data["repos"]) == 0
+        mock_redis_client.pipeline.assert_called_once_with(transaction=True)
+        pipeline.srem.assert_called_once_with(
+            "etl:ledger:repos:names", "repo-to-remove"
+        )
+        pipeline.delete.assert_called_once_with("etl:ledger:repo:repo-to-remove")
+        # No other item is touched
+        pipeline.hset.assert_not_called()
+        mock_redis_client.publish.assert_awaited_once_with("etl:ledger:invalidate", "1")
 
     @pytest.mark.asyncio
     async def test_remove_repo_from_ledger_not_found(
         self, ledger_manager, mock_redis_client
     ):
         """Test removing non-existent repo."""
-        existing_ledger = {
-            "repos": [
-                {
-                    "name": "existing-repo",
-                    "github_url": "https://github.com/user/existing-repo",
-                }
-            ],
-            "blogs": [],
-            "notebooks": [],
-        }
-        mock_redis_client.json.return_value.get.return_value = existing_ledger
+        mock_redis_client.pipeline.return_value.execute.side_effect = None
+        mock_redis_client.pipeline.return_value.execute.return_value = [0, 0]
+        ledger_module._set_ledger_cache({"repos": [], "blogs": [], "notebooks": []})
 
         result = await ledger_manager.remove_repo_from_ledger("non-existent-repo")
 
         assert result is True  # Current implementation returns True regardless
+        # Nothing changed, so caches are left alone
+        mock_redis_client.publish.assert_not_called()
+        assert ledger_module._ledger_cache is not None
 
     @pytest.mark.asyncio
     async def test_remove_blog_from_ledger_success(
         self, ledger_manager, mock_redis_client
     ):
         """Test successful blog removal."""
-        existing_ledger = {
-            "repos": [],
-            "blogs": [
-                {
-                    "name": "blog-to-remove",
-                    "blog_url": "https://example.com/blog-to-remove",
-                }
-            ],
-            "notebooks": [],
-        }
-        mock_redis_client.json.return_value.get.return_value = existing_ledger
-
         result = await ledger_manager.remove_blog_from_ledger("blog-to-remove")
 
         assert result is True
-        mock_redis_client.json.return_value.set.assert_called_once()
-
-        # Check the updated ledger data
-        call_args = mock_redis_client.json.return_value.set.call_args
-        ledger_data = call_args[0][2]
-        assert len(ledger_data["blogs"]) == 0
+        pipeline = mock_redis_client.pipeline.return_value
+        pipeline.delete.assert_called_once_with("etl:ledger:blog:blog-to-remove")
 
     @pytest.mark.asyncio
     async def test_remove_notebook_from_ledger_success(
         self, ledger_manager, mock_redis_client
     ):
         """Test successful notebook removal."""
-        existing_ledger = {
-            "repos": [],
-            "blogs": [],
-            "notebooks": [
-                {
-                    "name": "notebook-to-remove",
-                    "github_url": "https://github.com/user/repo/blob/main/notebook-to-remove.ipynb",
-                }
-            ],
-        }
-        mock_redis_client.json.return_value.get.return_value = existing_ledger
-
         result = await ledger_manager.remove_notebook_from_ledger("notebook-to-remove")
 
         assert result is True
-        mock_redis_client.json.return_value.set.assert_called_once()
+        pipeline = mock_redis_client.pipeline.return_value
+        pipeline.delete.assert_called_once_with(
+            "etl:ledger:notebook:notebook-to-remove"
+        )
 
-        # Check the updated ledger data
-        call_args = mock_redis_client.json.return_value.set.call_args
-        ledger_data = call_args[0][2]
-        assert len(ledger_data["notebooks"]) == 0
+    @pytest.mark.asyncio
+    async def test_remove_from_ledger_error(self, ledger_manager, mock_redis_client):
+        """Test ledger removal error."""
+        pipeline = mock_redis_client.pipeline.return_value
+        pipeline.execute.side_effect = Exception("Redis error")
+
+        with pytest.raises(Exception, match="Redis error"):
+            await ledger_manager.remove_blog_from_ledger("blog-to-remove")
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_ledger_is_migrated(
+        self, ledger_manager, sample_ledger_data, mock_redis_client, monkeypatch
+    ):
+        """Test that a legacy JSON ledger is moved into hashes once per process."""
+        monkeypatch.setattr(ledger_module, "_legacy_migrated", False)
+        mock_redis_client.json.return_value.get.return_value = sample_ledger_data
+        pipeline = mock_redis_client.pipeline.return_value
+
+        await ledger_manager.add_blog_to_ledger("new-blog", "https://example.com")
+        await ledger_manager.add_blog_to_ledger("other-blog", "https://example.com")
+
+        mock_redis_client.json.return_value.get.assert_called_once_with(
+            "etl:content_ledger"
+        )
+        pipeline.sadd.assert_any_call("etl:ledger:repos:names", "test-repo")
+        pipeline.hset.assert_any_call(
+            "etl:ledger:notebook:test-notebook",
+            mapping=sample_ledger_data["notebooks"][0],
+        )
+        pipeline.delete.assert_any_call("etl:content_ledger")
 
     @pytest.mark.asyncio
     async def test_seed_ledger_with_sample_content_success(
         self, ledger_manager, mock_redis_client
     ):
         """Test successful ledger seeding with sample content."""
-        mock_redis_client.json.return_value.get.return_value = {
-            "repos": [],
-            "blogs": [],
-            "notebooks": [],
-        }
+        pipeline = mock_redis_client.pipeline.return_value
 
         result = await ledger_manager.seed_ledger_with_sample_content()
 
         assert result is True
-        # Should be called multiple times: once for blog, once for notebook, and once for final update
-        assert mock_redis_client.json.return_value.set.call_count >= 2
+        # One hash for the blog and one for the notebook
+        assert pipeline.hset.call_count == 2
+        # Membership checks and writes each share a single round trip
+        assert pipeline.execute.call_count == 2
+        assert pipeline.sismember.call_count == 2
 
     @pytest.mark.asyncio
     async def test_seed_ledger_with_sample_content_error(
         self, ledger_manager, mock_redis_client
     ):
         """Test ledger seeding with error."""
-        mock_redis_client.json.return_value.get.side_effect = Exception("Redis error")
+        pipeline = mock_redis_client.pipeline.return_value
+        pipeline.execute.side_effect = Exception("Redis error")
 
         with pytest.raises(Exception, match="Redis error"):
             await ledger_manager.seed_ledger_with_sample_content()
@@ -350,13 +545,8 @@ class TestETLedgerManager:
     async def test_ledger_data_structure_consistency(
         self, ledger_manager, mock_redis_client
     ):
-        """Test that ledger data structure is consistent across operations."""
-        # Start with empty ledger
-        mock_redis_client.json.return_value.get.return_value = {
-            "repos": [],
-            "blogs": [],
-            "notebooks": [],
-        }
+        """Test that each item type is stored under its own key prefix."""
+        pipeline = mock_redis_client.pipeline.return_value
 
         # Add one item of each type
         await ledger_manager.add_repo_to_ledger(
@@ -370,19 +560,9 @@ class TestETLedgerManager:
             "https://github.com/user/repo/blob/main/test-notebook.ipynb",
         )
 
-        # Check that all operations maintained the correct structure
-        assert mock_redis_client.json.return_value.set.call_count == 3
-
-        # Verify the final ledger structure
-        final_call = mock_redis_client.json.return_value.set.call_args_list[-1]
-        final_ledger = final_call[0][2]
-
-        assert "repos" in final_ledger
-        assert "blogs" in final_ledger
-        assert "notebooks" in final_ledger
-        assert isinstance(final_ledger["repos"], list)
-        assert isinstance(final_ledger["blogs"], list)
-        assert isinstance(final_ledger["notebooks"], list)
-        assert len(final_ledger["repos"]) == 1
-        assert len(final_ledger["blogs"]) == 1
-        assert len(final_ledger["notebooks"]) == 1
+        item_keys = [call[0][0] for call in pipeline.hset.call_args_list]
+        assert item_keys == [
+            "etl:ledger:repo:test-repo",
+            "etl:ledger:blog:test-blog",
+            "etl:ledger:notebook:test-notebook",
+        ]
@@ -10,19 +10,26 @@ This module tests the vectorization functionality including:
 - Knowledge tracking updates
 """
 
-import tempfile
-from pathlib import Path
+import asyncio
+import io
+import threading
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from app.etl.tasks.vectorization import (
+    CHUNK_SIZE,
+    EMBEDDING_BATCH_SIZE,
+    _s3_client,
     chunk_text,
+    download_bytes_from_s3,
     extract_text_from_markdown,
     extract_text_from_pdf,
     get_latest_date_folder,
     list_content_files_in_folder,
     process_content_file,
+    run_vectorization_pipeline,
+    scan_s3_for_direct_uploads,
     update_tracking_index_status,
     vectorize_and_store_chunks,
 )
@@ -32,11 +39,21 @@ from app.utilities.s3_utils import get_s3_bucket_name
 class TestVectorizationTasks:
     """Test cases for vectorization tasks."""
 
+    @pytest.fixture(autouse=True)
+    def fresh_s3_client(self):
+        """Each test sees its own (patched) boto3 client."""
+        _s3_client.cache_clear()
+        yield
+        _s3_client.cache_clear()
+
     @pytest.fixture
     def mock_vectorizer(self):
         """Mock text vectorizer."""
         vectorizer = Mock()
         vectorizer.embed.return_value = b"fake_vector_data"
+        vectorizer.embed_many.side_effect = lambda texts, **kwargs: (
+            [b"fake_vector_data"] * len(texts)
+        )
         return vectorizer
 
     @pytest.fixture
@@ -72,13 +89,15 @@ class TestVectorizationTasks:
     async def test_get_latest_date_folder_success(self):
         """Test successful date folder retrieval."""
         mock_s3_client = Mock()
-        mock_s3_client.list_objects_v2.return_value = {
-            "CommonPrefixes": [
-                {"Prefix": "processed/blog_text/2025-09-08/"},
-                {"Prefix": "processed/blog_text/2025-09-09/"},
-                {"Prefix": "processed/blog_text/2025-09-10/"},
-            ]
-        }
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "CommonPrefixes": [
+                    {"Prefix": "processed/blog_text/2025-09-08/"},
+                    {"Prefix": "processed/blog_text/2025-09-09/"},
+                    {"Prefix": "processed/blog_text/2025-09-10/"},
+                ]
+            }
+        ]
 
         with patch("boto3.client", return_value=mock_s3_client):
             result = await get_latest_date_folder("test-bucket", "blog")
@@ -88,12 +107,14 @@ class TestVectorizationTasks:
     async def test_get_latest_date_folder_notebook(self):
         """Test date folder retrieval for notebooks."""
         mock_s3_client = Mock()
-        mock_s3_client.list_objects_v2.return_value = {
-            "CommonPrefixes": [
-                {"Prefix": "processed/notebook_text/2025-09-08/"},
-                {"Prefix": "processed/notebook_text/2025-09-09/"},
-            ]
-        }
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "CommonPrefixes": [
+                    {"Prefix": "processed/notebook_text/2025-09-08/"},
+                    {"Prefix": "processed/notebook_text/2025-09-09/"},
+                ]
+            }
+        ]
 
         with patch("boto3.client", return_value=mock_s3_client):
             result = await get_latest_date_folder("test-bucket", "notebook")
@@ -103,26 +124,63 @@ class TestVectorizationTasks:
     async def test_get_latest_date_folder_repo(self):
         """Test date folder retrieval for repositories."""
         mock_s3_client = Mock()
-        mock_s3_client.list_objects_v2.return_value = {
-            "CommonPrefixes": [
-                {"Prefix": "processed/repo/2025-09-08/"},
-            ]
-        }
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "CommonPrefixes": [
+                    {"Prefix": "processed/repo/2025-09-08/"},
+                ]
+            }
+        ]
 
         with patch("boto3.client", return_value=mock_s3_client):
             result = await get_latest_date_folder("test-bucket", "repo")
             assert result == "2025-09-08"
 
+    @pytest.mark.asyncio
+    async def test_s3_client_is_shared_across_calls(self):
+        """Listing and downloading reuse one client instead of building one each."""
+        mock_s3_client = Mock()
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {"CommonPrefixes": [{"Prefix": "processed/repo/2025-09-08/"}]}
+        ]
+        mock_s3_client.get_object.return_value = {"Body": io.BytesIO(b"data")}
+
+        with patch("boto3.client", return_value=mock_s3_client) as mock_boto:
+            await get_latest_date_folder("test-bucket", "repo")
+            await download_bytes_from_s3("test-bucket", "processed/repo/a.pdf")
+
+        mock_boto.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_s3_calls_run_off_the_event_loop(self):
+        """Blocking boto3 calls run on worker threads, not the loop thread."""
+        call_threads = []
+
+        def get_object(**kwargs):
+            call_threads.append(threading.get_ident())
+            return {"Body": io.BytesIO(b"data")}
+
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = get_object
+
+        with patch("boto3.client", return_value=mock_s3_client):
+            content = await download_bytes_from_s3("test-bucket", "processed/a.md")
+
+        assert content == b"data"
+        assert call_threads and threading.get_ident() not in call_threads
+
     @pytest.mark.asyncio
     async def test_list_content_files_in_folder_blog(self):
         """Test listing blog markdown files."""
         mock_s3_client = Mock()
-        mock_s3_client.list_objects_v2.return_value = {
-            "Contents": [
-                {"Key": "processed/blog_text/2025-09-08/test-blog.md"},
-                {"Key": "processed/blog_text/2025-09-08/another-blog.md"},
-            ]
-        }
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "Contents": [
+                    {"Key": "processed/blog_text/2025-09-08/test-blog.md"},
+                    {"Key": "processed/blog_text/2025-09-08/another-blog.md"},
+                ]
+            }
+        ]
 
         with patch("boto3.client", return_value=mock_s3_client):
             result = await list_content_files_in_folder(
@@ -138,11 +196,13 @@ class TestVectorizationTasks:
     async def test_list_content_files_in_folder_notebook(self):
         """Test listing notebook markdown files."""
         mock_s3_client = Mock()
-        mock_s3_client.list_objects_v2.return_value = {
-            "Contents": [
-                {"Key": "processed/notebook_text/2025-09-08/test-notebook.md"},
-            ]
-        }
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "Contents": [
+                    {"Key": "processed/notebook_text/2025-09-08/test-notebook.md"},
+                ]
+            }
+        ]
 
         with patch("boto3.client", return_value=mock_s3_client):
             result = await list_content_files_in_folder(
@@ -161,11 +221,13 @@ class TestVectorizationTasks:
     async def test_list_content_files_in_folder_repo(self):
         """Test listing repository PDF files."""
         mock_s3_client = Mock()
-        mock_s3_client.list_objects_v2.return_value = {
-            "Contents": [
-                {"Key": "processed/repo/2025-09-08/test-repo.pdf"},
-            ]
-        }
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "Contents": [
+                    {"Key": "processed/repo/2025-09-08/test-repo.pdf"},
+                ]
+            }
+        ]
 
         with patch("boto3.client", return_value=mock_s3_client):
             result = await list_content_files_in_folder(
@@ -178,43 +240,127 @@ class TestVectorizationTasks:
             assert result[0]["s3_key"] == "processed/repo/2025-09-08/test-repo.pdf"
 
     @pytest.mark.asyncio
-    async def test_extract_text_from_pdf(self, sample_text):
-        """Test PDF text extraction."""
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            temp_path = Path(temp_file.name)
+    async def test_list_content_files_in_folder_follows_pages(self):
+        """Files past the first 1000-key page are still listed."""
+        mock_s3_client = Mock()
+        mock_s3_client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "processed/repo/2025-09-08/a.pdf"}]},
+            {},
+            {
+                "Contents": [
+                    {"Key": "processed/repo/2025-09-08/b.pdf"},
+                    {"Key": "processed/repo/2025-09-08/notes.txt"},
+                ]
+            },
+        ]
 
-            with patch("app.etl.tasks.vectorization.PyPDFLoader") as mock_loader_class:
-                mock_loader = Mock()
-                mock_doc = Mock()
-                mock_doc.page_content = sample_text
-                mock_loader.load.return_value = [mock_doc]
-                mock_loader_class.return_value = mock_loader
+        with patch("boto3.client", return_value=mock_s3_client):
+            result = await list_content_files_in_folder(
+                "test-bucket", "repo", "2025-09-08"
+            )
+
+        assert [f["filename"] for f in result] == ["a.pdf", "b.pdf"]
+        mock_s3_client.get_paginator.assert_called_once_with("list_objects_v2")
+        mock_s3_client.get_paginator.return_value.paginate.assert_called_once_with(
+            Bucket="test-bucket", Prefix="processed/repo/2025-09-08/"
+        )
 
-                result = await extract_text_from_pdf(temp_path)
-                assert result == sample_text
+    @pytest.mark.asyncio
+    async def test_scan_s3_checks_tracking_records_in_one_pipeline(self):
+        """Tracking records are fetched in one pipeline, not one call per file."""
+
+        async def list_files(bucket_name, content_type, date_folder):
+            return [
+                {
+                    "s3_key": f"processed/{content_type}/{date_folder}/{name}",
+                    "filename": name,
+                    "content_type": content_type,
+                    "date_folder": date_folder,
+                }
+                for name in ("new.md", "ingested.md", "done.md")
+                if content_type == "blog"
+            ]
 
-            try:
-                temp_path.unlink()
-            except FileNotFoundError:
-                pass  # File already deleted
+        redis_client = Mock()
+        pipeline = redis_client.pipeline.return_value
+        pipeline.execute = AsyncMock(
+            return_value=[
+                None,
+                {"processing_status": "ingested"},
+                {"processing_status": "completed"},
+            ]
+        )
+
+        with (
+            patch(
+                "app.etl.tasks.vectorization.get_s3_bucket_name",
+                return_value="test-bucket",
+            ),
+            patch(
+                "app.etl.tasks.vectorization.get_latest_date_folder",
+                AsyncMock(return_value="2025-09-08"),
+            ),
+            patch(
+                "app.etl.tasks.vectorization.list_content_files_in_folder",
+                list_files,
+            ),
+            patch("app.utilities.database.get_redis_client", return_value=redis_client),
+            patch(
+                "app.etl.tasks.vectorization.create_tracking_record_for_direct_upload",
+                AsyncMock(return_value=True),
+            ) as mock_create,
+        ):
+            files = await scan_s3_for_direct_uploads()
+
+        assert [f["filename"] for f in files] == ["new.md", "ingested.md"]
+        redis_client.pipeline.assert_called_once_with(transaction=False)
+        assert [c.args for c in pipeline.json.return_value.get.call_args_list] == [
+            ("knowledge_tracking:new",),
+            ("knowledge_tracking:ingested",),
+            ("knowledge_tracking:done",),
+        ]
+        pipeline.execute.assert_awaited_once()
+        redis_client.json.assert_not_called()
+        mock_create.assert_awaited_once_with(
+            "new.md", "blog", "processed/blog/2025-09-08/new.md", "2025-09-08"
+        )
 
     @pytest.mark.asyncio
-    async def test_extract_text_from_markdown(self, sample_text):
-        """Test markdown text extraction."""
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".md", delete=False
-        ) as temp_file:
-            temp_file.write(sample_text)
-            temp_file.flush()
-            temp_path = Path(temp_file.name)
-
-            result = await extract_text_from_markdown(temp_path)
+    async def test_extract_text_from_pdf(self, sample_text):
+        """Test PDF text extraction from bytes."""
+        with patch("app.etl.tasks.vectorization.PyPDFParser") as mock_parser_class:
+            mock_doc = Mock()
+            mock_doc.page_content = sample_text
+            mock_parser_class.return_value.lazy_parse.return_value = iter([mock_doc])
+
+            result = await extract_text_from_pdf(b"%PDF-1.4", "test.pdf")
+
             assert result == sample_text
+            blob = mock_parser_class.return_value.lazy_parse.call_args[0][0]
+            assert blob.as_bytes() == b"%PDF-1.4"
+
+    @pytest.mark.asyncio
+    async def test_extract_text_from_pdf_reads_real_pages(self):
+        """Pages of an in-memory PDF are joined with newlines."""
+        from pypdf import PdfWriter
 
-            try:
-                temp_path.unlink()
-            except FileNotFoundError:
-                pass  # File already deleted
+        writer = PdfWriter()
+        writer.add_blank_page(width=72, height=72)
+        writer.add_blank_page(width=72, height=72)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+
+        result = await extract_text_from_pdf(buffer.getvalue(), "blank.pdf")
+
+        assert result == "\n"
+
+    @pytest.mark.asyncio
+    async def test_extract_text_from_markdown(self, sample_text):
+        """Test markdown text extraction from bytes."""
+        result = await extract_text_from_markdown(
+            sample_text.encode("utf-8"), "test.md"
+        )
+        assert result == sample_text
 
     @pytest.mark.asyncio
     async def test_chunk_text(self, sample_text):
@@ -238,14 +384,14 @@ class TestVectorizationTasks:
 
         with (
             patch(
-                "app.utilities.database.get_vectorizer", return_value=mock_vectorizer
+                "app.etl.tasks.vectorization.get_vectorizer",
+                return_value=mock_vectorizer,
             ),
             patch(
                 "app.etl.tasks.vectorization.get_document_index",
                 return_value=mock_document_index,
             ),
         ):
-
             result = await vectorize_and_store_chunks(
                 chunks, "test-file.md", "blog", "2025-09-08"
             )
@@ -273,6 +419,73 @@ class TestVectorizationTasks:
                 assert "update_date" in chunk_data
                 assert "updated_at" in chunk_data
 
+    @pytest.mark.asyncio
+    async def test_vectorize_and_store_chunks_embeds_in_batches(
+        self, mock_vectorizer, mock_document_index
+    ):
+        """Chunks are embedded a batch per request, not one request each."""
+        chunks = [f"chunk {i}" for i in range(EMBEDDING_BATCH_SIZE + 1)]
+
+        with (
+            patch(
+                "app.etl.tasks.vectorization.get_vectorizer",
+                return_value=mock_vectorizer,
+            ),
+            patch(
+                "app.etl.tasks.vectorization.get_document_index",
+                return_value=mock_document_index,
+            ),
+        ):
+            result = await vectorize_and_store_chunks(
+                chunks, "test-file.md", "blog", "2025-09-08"
+            )
+
+        assert result == len(chunks)
+        assert mock_vectorizer.embed_many.call_count == 2
+        mock_vectorizer.embed.assert_not_called()
+        keys = mock_document_index.load.call_args[1]["keys"]
+        data = mock_document_index.load.call_args[1]["data"]
+        assert keys[1] == "rag_doc:blog_post:test-file_chunk_1"
+        assert data[1] == {
+            "name": "test-file_chunk_1",
+            "description": "chunk 1",
+            "vector": b"fake_vector_data",
+            "chunk_index": 1,
+            "start_index": CHUNK_SIZE,
+            "source_file": "test-file.md",
+            "type": "blog_post",
+            "source_date": "2025-09-08",
+            "update_date": data[0]["update_date"],
+            "updated_at": data[0]["updated_at"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_vectorize_and_store_chunks_falls_back_per_chunk(
+        self, mock_vectorizer, mock_document_index
+    ):
+        """A failed batch is embedded chunk by chunk, skipping chunks that fail."""
+        mock_vectorizer.embed_many.side_effect = Exception("batch too large")
+        mock_vectorizer.embed.side_effect = [b"v0", Exception("bad chunk"), b"v2"]
+
+        with (
+            patch(
+                "app.etl.tasks.vectorization.get_vectorizer",
+                return_value=mock_vectorizer,
+            ),
+            patch(
+                "app.etl.tasks.vectorization.get_document_index",
+                return_value=mock_document_index,
+            ),
+        ):
+            result = await vectorize_and_store_chunks(
+                ["a", "b", "c"], "test-file.md", "blog", "2025-09-08"
+            )
+
+        assert result == 2
+        data = mock_document_index.load.call_args[1]["data"]
+        assert [d["chunk_index"] for d in data] == [0, 2]
+        assert [d["vector"] for d in data] == [b"v0", b"v2"]
+
     @pytest.mark.asyncio
     async def test_vectorize_and_store_chunks_empty(
         self, mock_vectorizer, mock_document_index
@@ -280,14 +493,14 @@ class TestVectorizationTasks:
         """Test vectorization with empty chunks."""
         with (
             patch(
-                "app.utilities.database.get_vectorizer", return_value=mock_vectorizer
+                "app.etl.tasks.vectorization.get_vectorizer",
+                return_value=mock_vectorizer,
             ),
             patch(
                 "app.etl.tasks.vectorization.get_document_index",
                 return_value=mock_document_index,
             ),
         ):
-
             result = await vectorize_and_store_chunks(
                 [], "test-file.md", "blog", "2025-09-08"
             )
@@ -369,17 +582,21 @@ class TestVectorizationTasks:
 
         with (
             patch(
-                "app.utilities.database.get_vectorizer", return_value=mock_vectorizer
+                "app.etl.tasks.vectorization.get_vectorizer",
+                return_value=mock_vectorizer,
             ),
             patch(
                 "app.etl.tasks.vectorization.get_document_index",
                 return_value=mock_document_index,
             ),
-            patch("app.etl.tasks.vectorization.download_file_from_s3") as mock_download,
+            patch(
+                "app.etl.tasks.vectorization.download_bytes_from_s3",
+                return_value=b"# Test blog",
+            ),
             patch(
                 "app.etl.tasks.vectorization.extract_text_from_markdown",
                 return_value=sample_text,
-            ),
+            ) as mock_extract,
             patch("app.etl.tasks.vectorization.chunk_text", return_value=[sample_text]),
             patch(
                 "app.etl.tasks.vectorization.update_tracking_index_status",
@@ -387,24 +604,14 @@ class TestVectorizationTasks:
             ),
             patch("boto3.client") as mock_boto,
         ):
+            result = await process_content_file("test-bucket", file_info)
 
-            # Mock S3 download
-            with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
-                mock_download.return_value = temp_path
-
-                result = await process_content_file("test-bucket", file_info)
-
-                assert result["status"] == "success"
-                assert result["filename"] == "test-blog.md"
-                assert result["content_type"] == "blog"
-                assert result["chunk_count"] == 1
-                assert result["tracking_updated"] is True
-
-                try:
-                    temp_path.unlink()
-                except FileNotFoundError:
-                    pass  # File already deleted
+            assert result["status"] == "success"
+            assert result["filename"] == "test-blog.md"
+            assert result["content_type"] == "blog"
+            assert result["chunk_count"] == 1
+            assert result["tracking_updated"] is True
+            mock_extract.assert_called_once_with(b"# Test blog", "test-blog.md")
 
     @pytest.mark.asyncio
     async def test_process_content_file_pdf_success(
@@ -420,13 +627,17 @@ class TestVectorizationTasks:
 
         with (
             patch(
-                "app.utilities.database.get_vectorizer", return_value=mock_vectorizer
+                "app.etl.tasks.vectorization.get_vectorizer",
+                return_value=mock_vectorizer,
             ),
             patch(
                 "app.etl.tasks.vectorization.get_document_index",
                 return_value=mock_document_index,
             ),
-            patch("app.etl.tasks.vectorization.download_file_from_s3") as mock_download,
+            patch(
+                "app.etl.tasks.vectorization.download_bytes_from_s3",
+                return_value=b"%PDF-1.4",
+            ),
             patch(
                 "app.etl.tasks.vectorization.extract_text_from_pdf",
                 return_value=sample_text,
@@ -438,24 +649,13 @@ class TestVectorizationTasks:
             ),
             patch("boto3.client") as mock_boto,
         ):
+            result = await process_content_file("test-bucket", file_info)
 
-            # Mock S3 download
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
-                mock_download.return_value = temp_path
-
-                result = await process_content_file("test-bucket", file_info)
-
-                assert result["status"] == "success"
-                assert result["filename"] == "test-repo.pdf"
-                assert result["content_type"] == "repo"
-                assert result["chunk_count"] == 1
-                assert result["tracking_updated"] is True
-
-                try:
-                    temp_path.unlink()
-                except FileNotFoundError:
-                    pass  # File already deleted
+            assert result["status"] == "success"
+            assert result["filename"] == "test-repo.pdf"
+            assert result["content_type"] == "repo"
+            assert result["chunk_count"] == 1
+            assert result["tracking_updated"] is True
 
     @pytest.mark.asyncio
     async def test_process_content_file_unsupported_type(self):
@@ -468,24 +668,17 @@ class TestVectorizationTasks:
         }
 
         with (
-            patch("app.etl.tasks.vectorization.download_file_from_s3") as mock_download,
+            patch(
+                "app.etl.tasks.vectorization.download_bytes_from_s3",
+                return_value=b"text",
+            ) as mock_download,
             patch("boto3.client") as mock_boto,
         ):
+            result = await process_content_file("test-bucket", file_info)
 
-            # Mock S3 download
-            with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
-                mock_download.return_value = temp_path
-
-                result = await process_content_file("test-bucket", file_info)
-
-                assert result["status"] == "failed"
-                assert "Unsupported file type" in result["error"]
-
-                try:
-                    temp_path.unlink()
-                except FileNotFoundError:
-                    pass  # File already deleted
+            assert result["status"] == "failed"
+            assert "Unsupported file type" in result["error"]
+            mock_download.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_process_content_file_no_chunks(
@@ -501,13 +694,17 @@ class TestVectorizationTasks:
 
         with (
             patch(
-                "app.utilities.database.get_vectorizer", return_value=mock_vectorizer
+                "app.etl.tasks.vectorization.get_vectorizer",
+                return_value=mock_vectorizer,
             ),
             patch(
                 "app.etl.tasks.vectorization.get_document_index",
                 return_value=mock_document_index,
             ),
-            patch("app.etl.tasks.vectorization.download_file_from_s3") as mock_download,
+            patch(
+                "app.etl.tasks.vectorization.download_bytes_from_s3",
+                return_value=b"",
+            ),
             patch(
                 "app.etl.tasks.vectorization.extract_text_from_markdown",
                 return_value="",
@@ -515,19 +712,67 @@ class TestVectorizationTasks:
             patch("app.etl.tasks.vectorization.chunk_text", return_value=[]),
             patch("boto3.client") as mock_boto,
         ):
+            result = await process_content_file("test-bucket", file_info)
+
+            assert result["status"] == "failed"
+            assert result["chunk_count"] == 0
+            assert result["tracking_updated"] is False
 
-            # Mock S3 download
-            with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
-                mock_download.return_value = temp_path
 
-                result = await process_content_file("test-bucket", file_info)
+class TestRunVectorizationPipeline:
+    """Test the tracking-index-driven vectorization pipeline."""
 
-                assert result["status"] == "failed"
-                assert result["chunk_count"] == 0
-                assert result["tracking_updated"] is False
+    @pytest.mark.asyncio
+    async def test_files_run_concurrently_up_to_limit(self):
+        """Files overlap, bounded by max_concurrent, with results in record order."""
+        records = [
+            {
+                "name": f"doc{i}",
+                "content_type": "blog",
+                "source_date": "2025-09-08",
+                "bucket_url": f"s3://bucket/processed/blog_text/2025-09-08/doc{i}.md",
+            }
+            for i in range(5)
+        ]
+        records.append({"name": "bad", "bucket_url": "https://example.com/bad.md"})
+        in_flight = 0
+        peak = 0
+
+        async def fake_process(bucket_name, file_info):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if file_info["filename"] == "doc3.md":
+                raise RuntimeError("boom")
+            return {"status": "success", "filename": file_info["filename"]}
 
-                try:
-                    temp_path.unlink()
-                except FileNotFoundError:
-                    pass  # File already deleted
+        with (
+            patch(
+                "app.etl.tasks.vectorization.get_s3_bucket_name",
+                return_value="test-bucket",
+            ),
+            patch(
+                "app.etl.tasks.vectorization.scan_s3_for_direct_uploads",
+                AsyncMock(return_value=[]),
+            ),
+            patch(
+                "app.etl.tasks.vectorization.query_content_for_vectorization",
+                AsyncMock(return_value=records),
+            ),
+            patch("app.etl.tasks.vectorization.process_content_file", fake_process),
+        ):
+            results = await run_vectorization_pipeline(max_concurrent=2)
+
+        assert peak == 2
+        assert [d.get("filename") or d["content_name"] for d in results["details"]] == [
+            "doc0.md",
+            "doc1.md",
+            "doc2.md",
+            "doc3",
+            "doc4.md",
+        ]
+        assert results["summary"]["total_items"] == 4
+        assert results["successful_items"] == 4
+        assert results["failed_items"] == 1